@@ -0,0 +1,21 @@
+"""
+Performance benchmarks for endplay.
+
+Each ``bench_*`` module contains classes whose ``time_*`` methods are timed,
+following the conventions of airspeed velocity (asv): a class may define
+``params`` (a list of parameter lists) and ``param_names``, and a ``setup``
+method which is called with each combination of parameters before timing.
+
+Run the suite with ``python -m benchmarks`` (see ``python -m benchmarks --help``),
+which can save the results as a JSON baseline and compare against a previous one.
+"""
+
+import os
+
+# The data files used by the benchmarks are shared with the test suite
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests")
+
+
+def data_path(*parts: str) -> str:
+    "The path of a file in the test data directory"
+    return os.path.join(DATA_DIR, *parts)
@@ -0,0 +1,193 @@
+"""
+Runner for the benchmark suite. Results can be saved as a JSON baseline and
+compared against an earlier baseline from the same machine, e.g.
+
+    python -m benchmarks --save .benchmarks/before.json
+    git checkout my-branch
+    python -m benchmarks --compare .benchmarks/before.json
+"""
+
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+import endplay
+
+
+def discover(pattern: Optional[str]) -> Iterator[tuple[str, Callable[[], Any]]]:
+    """
+    Yield the name and a zero-argument callable which prepares the benchmark for
+    every benchmark whose name matches the pattern. Preparing a benchmark returns
+    the function to time and the number of repeats requested by its class, if any
+    """
+    regex = re.compile(pattern or "")
+    for path in sorted(Path(__file__).parent.glob("bench_*.py")):
+        module = importlib.import_module(f"benchmarks.{path.stem}")
+        for clsname, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            params = getattr(cls, "params", [])
+            for methname, _ in inspect.getmembers(cls, inspect.isfunction):
+                if not methname.startswith("time_"):
+                    continue
+                for args in itertools.product(*params):
+                    name = f"{path.stem}.{clsname}.{methname}"
+                    if args:
+                        name += "(" + ", ".join(repr(arg) for arg in args) + ")"
+                    if regex.search(name):
+                        yield name, _prepare(cls, methname, args)
+
+
+def _prepare(
+    cls: type, methname: str, args: tuple
+) -> Callable[[], tuple[Callable[[], Any], Optional[int]]]:
+    def prepare():
+        obj = cls()
+        if hasattr(obj, "setup"):
+            obj.setup(*args)
+        meth = getattr(obj, methname)
+        return lambda: meth(*args), getattr(cls, "repeat", None)
+
+    return prepare
+
+
+def measure(fn: Callable[[], Any], repeat: int, min_time: float) -> dict[str, Any]:
+    "Time a function, returning the best and median time of a single call in seconds"
+    timer = timeit.Timer(fn)
+    number, total = timer.autorange()
+    # autorange stops at 0.2s, scale up to the requested time per repeat
+    if total < min_time:
+        number = max(number, int(number * min_time / max(total, 1e-9)))
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def metadata() -> dict[str, Any]:
+    "Information about the environment the benchmarks were run in"
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "endplay": endplay.__version__,
+    }
+
+
+def format_time(t: float) -> str:
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if t >= scale:
+            return f"{t / scale:.3g}{unit}"
+    return f"{t / 1e-9:.3g}ns"
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    "Print the change in each result relative to the baseline, returning the regressions"
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["min"] / baseline[name]["min"]
+        if ratio > threshold:
+            flag = "slower"
+            regressions.append(name)
+        elif ratio < 1 / threshold:
+            flag = "faster"
+        else:
+            flag = ""
+        print(
+            f"{format_time(baseline[name]['min']):>10} {format_time(result['min']):>10}"
+            f" {ratio:>7.2f}x  {name} {flag}".rstrip()
+        )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Run the endplay benchmark suite"
+    )
+    parser.add_argument(
+        "-k", "--filter", help="Only run the benchmarks whose names match this regex"
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Number of times to repeat timing"
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum total time in seconds of each repeat",
+    )
+    parser.add_argument("--save", type=Path, help="Write the results to a JSON file")
+    parser.add_argument(
+        "--compare", type=Path, help="Compare the results to a JSON baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Slowdown factor relative to the baseline counted as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    results: dict[str, dict] = {}
+    start = time.perf_counter()
+    for name, prepare in discover(args.filter):
+        try:
+            fn, repeat = prepare()
+        except NotImplementedError:
+            # asv convention for skipping a benchmark in setup
+            print(f"{'skipped':>10}  {name}")
+            continue
+        results[name] = measure(
+            fn, min(args.repeat, repeat or args.repeat), args.min_time
+        )
+        print(f"{format_time(results[name]['min']):>10}  {name}", flush=True)
+    print(f"Ran {len(results)} benchmarks in {time.perf_counter() - start:.1f}s")
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump({**metadata(), "results": results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nComparing with {baseline.get('commit')} ({baseline.get('date')})")
+        if baseline.get("machine") != platform.node():
+            print("Warning: baseline was recorded on a different machine")
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(
+                f"{len(regressions)} benchmarks regressed by more than {args.threshold}x"
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+from endplay.dds import analyse_play, calc_all_tables, calc_dd_table
+from endplay.dealer import generate_deals
+from endplay.types import Deal, Denom, Player
+
+
+class TimeDDTable:
+    # calc_all_tables accepts at most 40 deals when solving every denomination
+    params = [[1, 4, 16]]
+    param_names = ["deals"]
+    # Solving is slow, so fewer repeats are needed for stable timings
+    repeat = 3
+
+    def setup(self, n):
+        self.deals = list(generate_deals(produce=n, seed=1))
+
+    def time_calc_dd_table(self, n):
+        for deal in self.deals:
+            calc_dd_table(deal)
+
+    def time_calc_all_tables(self, n):
+        calc_all_tables(self.deals)
+
+
+class TimeAnalysePlay:
+    def setup(self):
+        self.deal = Deal(
+            "N:T32.AKQ7.T3.AQJT A9864.83.AK4.987 J.JT9542.72.K653 KQ75.6.QJ9865.42",
+            first=Player.west,
+            trump=Denom.hearts,
+        )
+        self.play = "DQ D3 D4 D2 SK S2 S4 SJ DJ DT DK D7".split()
+
+    def time_analyse_play(self):
+        analyse_play(self.deal, self.play)
@@ -0,0 +1,60 @@
+from endplay.dealer import generate_deal, generate_deals
+from endplay.dealer.constraint import ConstraintInterpreter
+from endplay.types import Deal
+
+
+class TimeGenerate:
+    params = [
+        [
+            "",
+            "hcp(north) >= 15 && hcp(north) <= 17 && shape(north, any 4333 + any 4432)",
+            "spades(south) >= 6 && hcp(south) >= 6 && hcp(south) <= 10",
+        ]
+    ]
+    param_names = ["constraint"]
+
+    def time_generate_deals(self, constraint):
+        constraints = [constraint] if constraint else []
+        for _ in generate_deals(*constraints, produce=100, seed=1):
+            pass
+
+    def time_generate_deal(self, constraint):
+        # A single deal at a time, as a web service would generate them
+        constraints = [constraint] if constraint else []
+        for seed in range(10):
+            generate_deal(*constraints, seed=seed)
+
+
+class TimeGeneratePredeal:
+    def setup(self):
+        self.predeal = Deal("N:AKQ2.KJ3.Q52.A74 - - -")
+
+    def time_generate_deals(self):
+        for _ in generate_deals(
+            "hcp(south) >= 8", predeal=self.predeal, produce=100, seed=1
+        ):
+            pass
+
+
+class TimeConstraintInterpreter:
+    params = [
+        [
+            "hcp(north) + hcp(south) >= 25",
+            "shape(east, any 5xxx + any 6xxx) && losers(east) <= 7",
+            "controls(west) >= 4 || (cccc(west) > 1400 && quality(west, spades) > 800)",
+        ]
+    ]
+    param_names = ["constraint"]
+
+    def setup(self, constraint):
+        self.interp = ConstraintInterpreter()
+        self.deals = list(generate_deals(produce=100, seed=1))
+        self.fn = self.interp.lambdify(constraint)
+
+    def time_parse(self, constraint):
+        self.interp.parser.cache_clear()
+        self.interp.parse(constraint)
+
+    def time_evaluate(self, constraint):
+        for deal in self.deals:
+            self.fn(deal)
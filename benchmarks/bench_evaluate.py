@@ -0,0 +1,21 @@
+from endplay.dealer import generate_deals
+from endplay.evaluate import hcp, losers, shape
+
+
+class TimeEvaluate:
+    def setup(self):
+        self.hands = [
+            hand for deal in generate_deals(produce=250, seed=1) for _, hand in deal
+        ]
+
+    def time_hcp(self):
+        for hand in self.hands:
+            hcp(hand)
+
+    def time_losers(self):
+        for hand in self.hands:
+            losers(hand)
+
+    def time_shape(self):
+        for hand in self.hands:
+            shape(hand)
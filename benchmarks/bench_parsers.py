@@ -0,0 +1,56 @@
+import io
+
+from benchmarks import data_path
+from endplay.parsers import json, lin, pbn
+
+
+class TimePBN:
+    params = [["example1.pbn", "example2.pbn"]]
+    param_names = ["file"]
+
+    def setup(self, file):
+        with open(data_path("pbn", file)) as f:
+            self.text = f.read()
+        self.boards = pbn.loads(self.text)
+
+    def time_load(self, file):
+        pbn.loads(self.text)
+
+    def time_dump(self, file):
+        pbn.dumps(self.boards)
+
+
+class TimeLIN:
+    def setup(self):
+        with open(data_path("lin", "example1.lin")) as f:
+            self.text = f.read()
+        self.boards = lin.loads(self.text)
+
+    def time_load(self):
+        lin.loads(self.text)
+
+    def time_dump(self):
+        lin.dumps(self.boards)
+
+
+class TimeJSON:
+    def setup(self):
+        with open(data_path("pbn", "example2.pbn")) as f:
+            self.boards = pbn.load(f)
+        self.text = json.dumps(self.boards)
+        buf = io.StringIO()
+        json.iterdump(self.boards, buf)
+        self.lines = buf.getvalue()
+
+    def time_load(self):
+        json.loads(self.text)
+
+    def time_dump(self):
+        json.dumps(self.boards)
+
+    def time_iterload(self):
+        for _ in json.iterload(io.StringIO(self.lines)):
+            pass
+
+    def time_iterdump(self):
+        json.iterdump(self.boards, io.StringIO())
@@ -0,0 +1,44 @@
+from endplay.dealer import generate_deals
+from endplay.types import Contract, Deal, Hand, Vul
+
+pbn = "N:T32.AKQ7.T3.AQJT A9864.83.AK4.987 J.JT9542.72.K653 KQ75.6.QJ9865.42"
+
+
+class TimeDeal:
+    def setup(self):
+        self.pbns = [deal.to_pbn() for deal in generate_deals(produce=100, seed=1)]
+
+    def time_from_pbn(self):
+        for s in self.pbns:
+            Deal(s)
+
+    def time_to_pbn(self):
+        deal = Deal(pbn)
+        for _ in range(100):
+            deal.to_pbn()
+
+    def time_hand_from_pbn(self):
+        for s in self.pbns:
+            Hand(s[2:].split(" ")[0])
+
+
+class TimeContract:
+    def setup(self):
+        self.strings = [
+            f"{level}{denom}{player}{penalty}{result}"
+            for level in range(1, 8)
+            for denom in "CDHSN"
+            for player in "NE"
+            for penalty in ["", "x", "xx"]
+            for result in ["=", "+1", "-2"]
+            if not (level == 7 and result == "+1")
+        ]
+        self.contracts = [Contract(s) for s in self.strings]
+
+    def time_score(self):
+        for contract in self.contracts:
+            contract.score(Vul.both)
+
+    def time_parse(self):
+        for s in self.strings:
+            Contract(s)
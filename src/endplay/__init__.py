@@ -4,12 +4,113 @@ Released under the MIT licence (see the LICENCE file provided with this
 distribution)
 """
 
-from endplay import _dds as _dds
+import importlib
+from typing import TYPE_CHECKING
+
 from endplay.config import __author__, __version__, __version_info__
 from endplay.config import suppress_unicode as suppress_unicode
-from endplay.dds import *
-from endplay.dealer import *
-from endplay.evaluate import *
-from endplay.interact import *
-from endplay.parsers import *
-from endplay.types import *
+
+if TYPE_CHECKING:
+    from endplay import _dds as _dds
+    from endplay.dds import *
+    from endplay.dealer import *
+    from endplay.evaluate import *
+    from endplay.types import *
+
+# The names re-exported from each submodule. These are loaded on first access
+# (see PEP 562) so that importing endplay does not import the dds library,
+# numpy, pyparsing, etc until they are needed
+_lazy_names = {
+    "endplay.dds": [
+        "solve_board",
+        "solve_all_boards",
+        "calc_dd_table",
+        "calc_all_tables",
+        "analyse_play",
+        "analyse_all_plays",
+        "par",
+        "analyse_start",
+        "analyse_all_starts",
+    ],
+    "endplay.dealer": ["run_script", "generate_deal", "generate_deals"],
+    "endplay.evaluate": [
+        "standard_hcp_scale",
+        "bergen_hcp_scale",
+        "hcp",
+        "shortage_nofit_dist_scale",
+        "shortage_fit_dist_scale",
+        "length_dist_scale",
+        "mixed_fit_dist_scale",
+        "mixed_nofit_dist_scale",
+        "dist_points",
+        "total_points",
+        "top_honours",
+        "losers",
+        "cccc",
+        "quality",
+        "controls",
+        "rule_of_n",
+        "exact_shape",
+        "shape",
+        "major_shape",
+        "minor_shape",
+        "is_balanced",
+        "is_semibalanced",
+        "is_minor_semibalanced",
+        "is_single_suited",
+        "is_two_suited",
+        "is_three_suited",
+    ],
+    "endplay.types": [
+        "Bid",
+        "Board",
+        "Card",
+        "Contract",
+        "ContractBid",
+        "Deal",
+        "Denom",
+        "Hand",
+        "Penalty",
+        "PenaltyBid",
+        "Player",
+        "Rank",
+        "AlternateRank",
+        "SuitHolding",
+        "Vul",
+    ],
+}
+_lazy_attrs = {name: module for module, names in _lazy_names.items() for name in names}
+_submodules = [
+    "_dds",
+    "dds",
+    "dealer",
+    "evaluate",
+    "interact",
+    "parsers",
+    "scoring",
+    "simulate",
+    "stats",
+    "types",
+    "utils",
+]
+
+__all__ = [
+    "suppress_unicode",
+    *_lazy_attrs,
+    *[module for module in _submodules if not module.startswith("_")],
+]
+
+
+def __getattr__(name: str):
+    if name in _submodules:
+        return importlib.import_module(f"endplay.{name}")
+    if name in _lazy_attrs:
+        value = getattr(importlib.import_module(_lazy_attrs[name]), name)
+        # Cache the value so that __getattr__ is only called once per name
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'endplay' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attrs) | set(_submodules))
@@ -14,6 +14,12 @@ __all__ = [
     "par",
     "analyse_start",
     "analyse_all_starts",
+    "AnalysisSession",
+    "CallRecord",
+    "enable_stats",
+    "disable_stats",
+    "reset_stats",
+    "stats",
 ]
 
 import endplay._dds as _dds
@@ -24,5 +30,13 @@ from endplay.dds.analyse import (
     analyse_start,
 )
 from endplay.dds.ddtable import calc_all_tables, calc_dd_table
+from endplay.dds.instrumentation import (
+    CallRecord,
+    disable_stats,
+    enable_stats,
+    reset_stats,
+    stats,
+)
 from endplay.dds.parscore import par
+from endplay.dds.session import AnalysisSession
 from endplay.dds.solve import solve_all_boards, solve_board
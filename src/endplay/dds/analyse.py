@@ -18,6 +18,7 @@ from collections.abc import Iterable, Sequence
 from typing import Union, overload
 
 import endplay._dds as _dds
+from endplay.dds.instrumentation import _instrumented
 from endplay.types import Card, Deal
 
 
@@ -87,6 +88,7 @@ class SolvedPlayList(Sequence):
         return "[" + ", ".join(str(s) for s in self) + "]"
 
 
+@_instrumented
 def analyse_start(deal: Deal, declarer_is_first: bool = False) -> int:
     """
     Calculate the most tricks declarer can make.
@@ -109,6 +111,7 @@ def analyse_start(deal: Deal, declarer_is_first: bool = False) -> int:
         return solvedp.tricks[0]
 
 
+@_instrumented
 def analyse_play(
     deal: Deal,
     play: Iterable[Union[Card, str]],
@@ -139,6 +142,7 @@ def analyse_play(
     return SolvedPlay(solvedp)
 
 
+@_instrumented
 def analyse_all_starts(
     deals: Iterable[Deal],
     declarer_is_first: bool = False,
@@ -179,6 +183,7 @@ def analyse_all_starts(
         return [solvedp.solved[i].tricks[0] for i in range(plp.noOfBoards)]
 
 
+@_instrumented
 def analyse_all_plays(
     deals: Iterable[Deal],
     plays: Iterable[Iterable[Union[Card, str]]],
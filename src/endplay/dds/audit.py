@@ -0,0 +1,217 @@
+"""
+Double dummy analysis of the play records in an archive of hand records,
+finding which cards gave up tricks and how many. Boards are analysed in
+batches of up to `MAXNOOFBOARDS` with `AnalyseAllPlaysBin`, and only one
+batch is held in memory at a time so that archives of any size can be
+processed.
+
+This module is not imported by `endplay.dds`, as it depends on numpy.
+"""
+
+from __future__ import annotations
+
+__all__ = ["BoardAudit", "audit_boards", "audit_file"]
+
+from collections.abc import Iterable, Iterator
+from typing import Optional
+
+import numpy as np
+
+import endplay._dds as _dds
+from endplay.dds.analyse import analyse_all_plays
+from endplay.types import Board, Card, Deal, Denom, Player
+from endplay.utils.play import trick_winner
+
+# A board to be analysed, with its deal, play and the player who played each card
+_BatchItem = tuple["BoardAudit", Deal, list[Card], np.ndarray]
+
+
+class BoardAudit:
+    """
+    The double dummy analysis of the play of a single board. The arrays are empty
+    if the board could not be analysed, in which case `error` says why.
+
+    :ivar index: The position of the board in the boards which were audited
+    :ivar board: The board which was analysed
+    :ivar declarer: The declarer of the contract the board was played in
+    :ivar tricks: The number of tricks declarer can make double dummy before the
+            opening lead and after each card is played
+    :ivar seats: The player who played each card, as an array of `Player` values
+    :ivar cost: The number of tricks given up by each card, from the point of view
+            of the side which played it
+    :ivar error: The reason the board could not be analysed, or None
+    """
+
+    def __init__(self, index: int, board: Board):
+        self.index = index
+        self.board = board
+        self.declarer: Optional[Player] = None
+        self.tricks = np.zeros(0, dtype=np.int8)
+        self.seats = np.zeros(0, dtype=np.int8)
+        self.cost = np.zeros(0, dtype=np.int8)
+        self.error: Optional[str] = None
+
+    @property
+    def play(self) -> list[Card]:
+        "The cards which were analysed"
+        return self.board.play[: len(self.cost)]
+
+    def errors(self) -> list[tuple[int, Player, Card, int]]:
+        """
+        The cards which gave up tricks, as tuples of the position of the card in
+        the play, the player who played it, the card and the number of tricks lost
+        """
+        return [
+            (int(i), Player(int(self.seats[i])), self.board.play[i], int(self.cost[i]))
+            for i in np.flatnonzero(self.cost)
+        ]
+
+    def seat_totals(self) -> np.ndarray:
+        "The total number of tricks given up by each player, indexed by `Player`"
+        return np.bincount(self.seats, weights=self.cost, minlength=4).astype(np.int64)
+
+    def __repr__(self) -> str:
+        if self.error is not None:
+            return f"<BoardAudit index={self.index} error={self.error!r}>"
+        return (
+            f"<BoardAudit index={self.index} cards={len(self.cost)} "
+            f"cost={int(self.cost.sum())}>"
+        )
+
+
+def audit_boards(
+    boards: Iterable[Board], batch_size: int = _dds.MAXNOOFBOARDS
+) -> Iterator[BoardAudit]:
+    """
+    Analyse the play records of a sequence of boards, yielding a
+    :class:`BoardAudit` for each board in the same order. Boards without a contract
+    or play record are yielded with `error` set. The play record is analysed up to
+    the first unknown card, and if a card could not have been played (e.g. it is
+    not in the player's hand, or is a revoke) then the board is yielded with
+    `error` set.
+
+    :param boards: The boards to analyse, which can be a lazily loaded file such
+            as that returned by :func:`endplay.parsers.pbn.iterload`
+    :param batch_size: The number of boards to pass to DDS at once, at most
+            `MAXNOOFBOARDS`
+    """
+    if not 0 < batch_size <= _dds.MAXNOOFBOARDS:
+        raise ValueError(f"batch_size must be between 1 and {_dds.MAXNOOFBOARDS}")
+    # The audits waiting to be yielded, and those in the batch to be analysed
+    pending: list[BoardAudit] = []
+    batch: list[_BatchItem] = []
+    for index, board in enumerate(boards):
+        audit = BoardAudit(index, board)
+        pending.append(audit)
+        item = _prepare(audit)
+        if item is not None:
+            batch.append(item)
+        if len(batch) == batch_size:
+            _analyse_batch(batch)
+            yield from pending
+            pending, batch = [], []
+    if batch:
+        _analyse_batch(batch)
+    yield from pending
+
+
+def audit_file(
+    fname: str, batch_size: int = _dds.MAXNOOFBOARDS
+) -> Iterator[BoardAudit]:
+    """
+    Analyse the play records in a PBN or LIN file, which is read lazily. See
+    :func:`audit_boards`
+
+    :param fname: The name of the file, the format being chosen by its extension
+    :param batch_size: The number of boards to pass to DDS at once
+    """
+    if fname.lower().endswith(".lin"):
+        from endplay.parsers.lin import iterload
+    else:
+        from endplay.parsers.pbn import iterload  # type: ignore[assignment]
+    with open(fname) as f:
+        yield from audit_boards(iterload(f), batch_size)
+
+
+def _prepare(audit: BoardAudit) -> Optional[_BatchItem]:
+    "Return the deal and play to analyse for a board, or set its error"
+    board = audit.board
+    contract = board.contract
+    if contract is None or contract.declarer is None or contract.denom is None:
+        audit.error = "no contract"
+        return None
+    play = board.play
+    # Unknown cards are represented by cards with a notrump suit
+    for i, card in enumerate(play):
+        if card.suit == Denom.nt:
+            play = play[:i]
+            break
+    if not play:
+        audit.error = "no play record"
+        return None
+    audit.declarer = contract.declarer
+    deal = board.deal.copy()
+    deal.first = contract.declarer.lho
+    deal.trump = contract.denom
+    seats = _seats(audit, deal, play)
+    if seats is None:
+        return None
+    return audit, deal, play, seats
+
+
+def _seats(audit: BoardAudit, deal: Deal, play: list[Card]) -> Optional[np.ndarray]:
+    """
+    Return the player who played each card, or set the error of the audit if a
+    card could not have been played. This is checked before calling DDS, as a
+    single bad board would make DDS reject the whole batch
+    """
+    hands = {player: set(hand) for player, hand in deal}
+    if not any(hands.values()):
+        audit.error = "no deal"
+        return None
+    seats = np.empty(len(play), dtype=np.int8)
+    leader = deal.first
+    for start in range(0, len(play), 4):
+        trick = play[start : start + 4]
+        for i, card in enumerate(trick):
+            player = leader.next(i)
+            hand = hands[player]
+            if card not in hand:
+                audit.error = f"card {start + i} ({card}) is not held by {player.name}"
+                return None
+            if i > 0 and card.suit != trick[0].suit:
+                if any(c.suit == trick[0].suit for c in hand):
+                    audit.error = f"card {start + i} ({card}) is a revoke"
+                    return None
+            hand.remove(card)
+            seats[start + i] = player
+        if len(trick) == 4:
+            leader = trick_winner(trick, leader, deal.trump)
+    return seats
+
+
+def _analyse_batch(batch: list[_BatchItem]) -> None:
+    try:
+        solved = analyse_all_plays(
+            [deal for _, deal, _, _ in batch], [play for _, _, play, _ in batch]
+        )
+    except _dds.DDSError as e:
+        # Any board DDS rejects fails the whole batch, so split it to find which
+        if len(batch) == 1:
+            batch[0][0].error = str(e)
+        else:
+            _analyse_batch(batch[: len(batch) // 2])
+            _analyse_batch(batch[len(batch) // 2 :])
+        return
+    for (audit, deal, play, seats), result in zip(batch, solved):
+        tricks = result._data.tricks[: result._data.number]
+        # DDS does not analyse the cards in the last trick, which are forced
+        tricks += [tricks[-1]] * (len(play) + 1 - len(tricks))
+        audit.tricks = np.array(tricks, dtype=np.int8)
+        audit.seats = seats
+        # A card played by declarer's side loses tricks if declarer's total goes
+        # down, and a card played by the defence if it goes up
+        change = np.diff(audit.tricks)
+        declarer = deal.first.rho
+        defending = (seats != declarer) & (seats != declarer.partner)
+        audit.cost = np.where(defending, change, -change).astype(np.int8)
@@ -12,6 +12,7 @@ from collections.abc import Iterable, Sequence
 from typing import Union, overload
 
 import endplay._dds as _dds
+from endplay.dds.instrumentation import _instrumented
 from endplay.types import Deal, Denom, Player
 
 
@@ -135,6 +136,7 @@ class DDTableList(abc.Sequence):
         return "[(" + "), (".join(str(t) for t in self) + ")]"
 
 
+@_instrumented
 def calc_dd_table(deal: Deal) -> DDTable:
     """
     Calculates the double dummy results for all 20 possible combinations of
@@ -152,6 +154,7 @@ def calc_dd_table(deal: Deal) -> DDTable:
     return DDTable(table)
 
 
+@_instrumented
 def calc_all_tables(
     deals: Iterable[Deal], exclude: Iterable[Denom] = []
 ) -> DDTableList:
@@ -0,0 +1,192 @@
+"""
+Opt-in instrumentation of the functions in `endplay.dds`. When enabled, the
+time spent in each call is split into packing the arguments into the DDS
+structures, solving in the DDS library and unpacking the results, and the
+totals are accumulated for each function.
+"""
+
+from __future__ import annotations
+
+__all__ = ["CallRecord", "enable_stats", "disable_stats", "reset_stats", "stats"]
+
+import threading
+from collections.abc import Callable
+from functools import wraps
+from time import perf_counter
+from typing import Any, Optional, TypeVar
+
+import endplay._dds as _dds
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = False
+_callback: Optional[Callable[[CallRecord], None]] = None
+_lock = threading.Lock()
+_totals: dict[str, dict[str, float]] = {}
+# The record of the instrumented function currently running on each thread
+_local = threading.local()
+
+
+class CallRecord:
+    """
+    The timings of a single call to one of the functions in `endplay.dds`,
+    which is passed to the callback given to :func:`enable_stats`.
+
+    :ivar name: The name of the function which was called
+    :ivar batch_size: The number of boards or tables passed to DDS
+    :ivar max_threads: The maximum number of threads DDS was configured to use,
+            0 meaning that DDS chooses based on the number of cores
+    :ivar calls: The name and duration of each call made to the DDS library
+    :ivar pack_time: Seconds spent converting the arguments before the first DDS call
+    :ivar solve_time: Seconds spent in the DDS library
+    :ivar unpack_time: Seconds spent after the first DDS call outside of the library
+    :ivar failed: Whether the call raised an exception
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.batch_size = 0
+        self.max_threads = _dds._max_threads
+        self.calls: list[tuple[str, float]] = []
+        self.pack_time = 0.0
+        self.solve_time = 0.0
+        self.unpack_time = 0.0
+        self.failed = False
+        self._start = perf_counter()
+        self._first_call: Optional[float] = None
+
+    @property
+    def total_time(self) -> float:
+        "Total number of seconds taken by the call"
+        return self.pack_time + self.solve_time + self.unpack_time
+
+    def _add_call(self, name: str, args: tuple, seconds: float) -> None:
+        if self._first_call is None:
+            self._first_call = perf_counter() - seconds
+        self.calls.append((name, seconds))
+        self.solve_time += seconds
+        if args:
+            self.batch_size += getattr(
+                args[0], "noOfBoards", getattr(args[0], "noOfTables", 0)
+            )
+
+    def _finish(self) -> None:
+        end = perf_counter()
+        first_call = end if self._first_call is None else self._first_call
+        self.pack_time = first_call - self._start
+        self.unpack_time = max(end - self._start - self.pack_time - self.solve_time, 0)
+        self.batch_size = self.batch_size or 1
+
+    def __repr__(self) -> str:
+        return (
+            f"CallRecord(name={self.name!r}, batch_size={self.batch_size}, "
+            f"pack_time={self.pack_time:.6f}, solve_time={self.solve_time:.6f}, "
+            f"unpack_time={self.unpack_time:.6f})"
+        )
+
+
+def enable_stats(callback: Optional[Callable[[CallRecord], None]] = None) -> None:
+    """
+    Start recording statistics for calls to `endplay.dds` functions
+
+    :param callback: If given, this is called with a :class:`CallRecord` after
+            each call completes, e.g. to send the timings to a monitoring system
+    """
+    global _enabled, _callback
+    _callback = callback
+    _enabled = True
+    _dds._call_hook = _on_dds_call
+
+
+def disable_stats() -> None:
+    "Stop recording statistics. The statistics recorded so far are kept"
+    global _enabled, _callback
+    _enabled = False
+    _callback = None
+    _dds._call_hook = None
+
+
+def reset_stats() -> None:
+    "Discard all the statistics recorded so far"
+    with _lock:
+        _totals.clear()
+
+
+def stats() -> dict[str, Any]:
+    """
+    A snapshot of the statistics recorded since they were last reset. The
+    ``functions`` key maps the name of each function called to its number of
+    ``calls``, ``failures`` and ``dds_calls``, the total and maximum
+    ``batch_size``, and the total ``pack_time``, ``solve_time`` and
+    ``unpack_time`` in seconds. Direct calls to the functions in `endplay._dds`
+    are recorded under the name of the DDS function.
+    """
+    with _lock:
+        functions = {name: dict(totals) for name, totals in _totals.items()}
+    return {
+        "enabled": _enabled,
+        "max_threads": _dds._max_threads,
+        "functions": functions,
+    }
+
+
+def _instrumented(func: F) -> F:
+    "Decorator which records statistics for a function when they are enabled"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        # Nested calls (e.g. par calling calc_dd_table) count towards the outer call
+        if not _enabled or getattr(_local, "record", None) is not None:
+            return func(*args, **kwargs)
+        record = _local.record = CallRecord(func.__name__)
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            record.failed = True
+            raise
+        finally:
+            _local.record = None
+            record._finish()
+            _submit(record)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _on_dds_call(name: str, args: tuple, seconds: float) -> None:
+    record = getattr(_local, "record", None)
+    if record is not None:
+        record._add_call(name, args, seconds)
+    else:
+        record = CallRecord(name)
+        record._add_call(name, args, seconds)
+        record._finish()
+        record.pack_time = record.unpack_time = 0.0
+        _submit(record)
+
+
+def _submit(record: CallRecord) -> None:
+    with _lock:
+        totals = _totals.setdefault(
+            record.name,
+            {
+                "calls": 0,
+                "failures": 0,
+                "dds_calls": 0,
+                "batch_size": 0,
+                "max_batch_size": 0,
+                "pack_time": 0.0,
+                "solve_time": 0.0,
+                "unpack_time": 0.0,
+            },
+        )
+        totals["calls"] += 1
+        totals["failures"] += record.failed
+        totals["dds_calls"] += len(record.calls)
+        totals["batch_size"] += record.batch_size
+        totals["max_batch_size"] = max(totals["max_batch_size"], record.batch_size)
+        totals["pack_time"] += record.pack_time
+        totals["solve_time"] += record.solve_time
+        totals["unpack_time"] += record.unpack_time
+    callback = _callback
+    if callback is not None:
+        callback(record)
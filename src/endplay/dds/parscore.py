@@ -12,6 +12,7 @@ from typing import Union
 
 import endplay._dds as _dds
 from endplay.dds.ddtable import DDTable, calc_dd_table
+from endplay.dds.instrumentation import _instrumented
 from endplay.types import Contract, Deal, Player, Vul
 
 
@@ -51,6 +52,7 @@ class ParList(Iterable):
         return "<ParList object>"
 
 
+@_instrumented
 def par(deal: Union[Deal, DDTable], vul: Union[Vul, int], dealer: Player) -> ParList:
     """
     Calculate the par contract result for the given deal.
@@ -0,0 +1,197 @@
+"""
+Incremental double dummy analysis of a deal as it is played through, for
+interactive use where successive positions differ by a single card.
+"""
+
+from __future__ import annotations
+
+__all__ = ["AnalysisSession"]
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
+
+import endplay._dds as _dds
+from endplay.dds.ddtable import DDTable, calc_dd_table
+from endplay.dds.solve import SolvedBoard, SolveMode
+from endplay.types import Card, Deal
+
+
+class AnalysisSession:
+    """
+    Analyses the positions reached while playing through a deal. The results for
+    each position are remembered, so returning to a position (e.g. after unplaying
+    a card) is instant, and the positions after the best cards in the current
+    position are solved in the background so that they are usually ready by the
+    time one of them is played.
+
+    Every call to the solver is made with the same DDS thread index, so DDS keeps
+    its transposition table between calls on similar positions rather than starting
+    from scratch each time.
+
+    :param deal: The deal to analyse, which is copied
+    :param thread_index: The DDS thread to solve on. Sessions which are used at the
+            same time should use different indices, and as :func:`solve_board` solves
+            on thread 0 it should not be called while a session on thread 0 is in use
+    :param maxsize: The maximum number of positions to remember the results for
+    :param prefetch: The number of the best cards in each position to solve the
+            resulting positions for in the background, 0 to disable
+    """
+
+    def __init__(
+        self,
+        deal: Optional[Deal] = None,
+        thread_index: int = 0,
+        maxsize: int = 4096,
+        prefetch: int = 4,
+    ):
+        self.deal = deal.copy() if deal is not None else Deal()
+        self.thread_index = thread_index
+        self.maxsize = maxsize
+        self.prefetch = prefetch
+        self._solutions: OrderedDict[tuple, SolvedBoard] = OrderedDict()
+        self._tables: OrderedDict[bytes, DDTable] = OrderedDict()
+        self._lock = threading.Lock()
+        # Held while calling DDS, as a DDS thread can only solve one board at a time
+        self._dds_lock = threading.Lock()
+        # Incremented whenever a new position is analysed, so that prefetching for
+        # positions which are no longer current can be abandoned
+        self._generation = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # The position before each card played with play, and the card
+        self._history: list[tuple[Deal, Card]] = []
+
+    def __enter__(self) -> AnalysisSession:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        "Stop solving positions in the background"
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def play(self, card: Union[Card, str]) -> None:
+        "Play a card in the session's deal"
+        before = self.deal.copy()
+        self.deal.play(card)
+        self._history.append((before, Card(card) if isinstance(card, str) else card))
+
+    def unplay(self) -> Card:
+        """
+        Unplay the last card played in the session's deal with :meth:`play`,
+        returning it. Unlike :meth:`Deal.unplay`, this can go back past the start
+        of the current trick
+        """
+        if not self._history:
+            raise RuntimeError("No cards to unplay")
+        self.deal, card = self._history.pop()
+        return card
+
+    def solve(self, deal: Optional[Deal] = None) -> SolvedBoard:
+        """
+        Calculate the double dummy score for all the cards which can be played in a
+        position, as with :func:`solve_board`
+
+        :param deal: The position to solve, if None then the session's deal
+        """
+        deal = self.deal if deal is None else deal
+        key = self._key(deal)
+        with self._lock:
+            self._generation += 1
+            solved = self._lookup(self._solutions, key)
+        if solved is None:
+            solved = self._solve(key, deal)
+        if self.prefetch > 0:
+            self._prefetch(deal, solved)
+        return solved
+
+    def dd_table(self, deal: Optional[Deal] = None) -> DDTable:
+        """
+        Calculate the double dummy table of the remaining cards in a position, as
+        with :func:`calc_dd_table`
+
+        :param deal: The position to calculate the table for, if None then the
+                session's deal
+        """
+        deal = self.deal if deal is None else deal
+        key = bytes(deal._data.remainCards)
+        with self._lock:
+            table = self._lookup(self._tables, key)
+        if table is None:
+            # DDS solves tables on its own threads, which include the session's
+            with self._dds_lock:
+                table = calc_dd_table(deal)
+            with self._lock:
+                self._store(self._tables, key, table)
+        return table
+
+    def cache_clear(self) -> None:
+        "Forget the results for all the positions analysed so far"
+        with self._lock:
+            self._solutions.clear()
+            self._tables.clear()
+
+    @staticmethod
+    def _key(deal: Deal) -> tuple:
+        return (
+            bytes(deal._data.remainCards),
+            deal._data.first,
+            deal._data.trump,
+            tuple(deal.curtrick),
+        )
+
+    def _lookup(self, cache: OrderedDict, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    def _store(self, cache: OrderedDict, key, value) -> None:
+        cache[key] = value
+        while len(cache) > self.maxsize:
+            cache.popitem(last=False)
+
+    def _solve(self, key: tuple, deal: Deal) -> SolvedBoard:
+        with self._dds_lock:
+            # The position may have been solved while waiting for the lock
+            with self._lock:
+                solved = self._lookup(self._solutions, key)
+            if solved is not None:
+                return solved
+            fut = _dds.futureTricks()
+            target, solutions = SolveMode.Default.target_solutions()
+            _dds.SolveBoard(deal._data, target, solutions, 1, fut, self.thread_index)
+            solved = SolvedBoard(fut)
+        with self._lock:
+            self._store(self._solutions, key, solved)
+        return solved
+
+    def _prefetch(self, deal: Deal, solved: SolvedBoard) -> None:
+        cards = sorted(solved, key=lambda sol: sol[1], reverse=True)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="endplay-prefetch"
+            )
+        generation = self._generation
+        for card, _ in cards[: self.prefetch]:
+            child = deal.copy()
+            child.play(card)
+            if all(len(hand) == 0 for _, hand in child):
+                continue
+            self._executor.submit(self._prefetch_one, generation, child)
+
+    def _prefetch_one(self, generation: int, deal: Deal) -> None:
+        if generation != self._generation:
+            return
+        key = self._key(deal)
+        with self._lock:
+            if key in self._solutions:
+                return
+        try:
+            self._solve(key, deal)
+        except _dds.DDSError:
+            pass
@@ -13,6 +13,7 @@ from collections.abc import Iterable, Iterator, Sequence
 from typing import Optional, Union, overload
 
 import endplay._dds as _dds
+from endplay.dds.instrumentation import _instrumented
 from endplay.types import Card, Deal, Denom, Rank
 
 
@@ -80,7 +81,7 @@ class SolvedBoard(Iterable):
             holding = (1 << self._data.rank[i]) | self._data.equals[i]
             for rank in Rank:
                 if holding & rank.value:
-                    card = Card(suit=Denom(self._data.suit[i]), rank=rank)
+                    card = Card.from_bits(self._data.suit[i], rank)
                     yield (card, self._data.score[i])
 
     def __repr__(self) -> str:
@@ -126,6 +127,7 @@ class SolvedBoardList(Sequence):
         return "[(" + ", ".join(str(b) for b in self) + ")]"
 
 
+@_instrumented
 def solve_board(
     deal: Deal,
     mode: SolveMode = SolveMode.Default,
@@ -145,6 +147,7 @@ def solve_board(
     return SolvedBoard(fut)
 
 
+@_instrumented
 def solve_all_boards(
     deals: Iterable[Deal],
     mode: SolveMode = SolveMode.Default,
@@ -7,6 +7,31 @@ Hans van Staveren's original dealer program
 
 __all__ = ["run_script", "generate_deal", "generate_deals"]
 
-from endplay.dealer.constraint import ConstraintInterpreter
-from endplay.dealer.generate import generate_deal, generate_deals
-from endplay.dealer.runscript import run_script
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from endplay.dealer.constraint import ConstraintInterpreter
+    from endplay.dealer.generate import generate_deal, generate_deals
+    from endplay.dealer.runscript import run_script
+
+# Loaded on first access, so that generating deals does not import the
+# machinery for running scripts and producing output
+_lazy_attrs = {
+    "ConstraintInterpreter": "endplay.dealer.constraint",
+    "generate_deal": "endplay.dealer.generate",
+    "generate_deals": "endplay.dealer.generate",
+    "run_script": "endplay.dealer.runscript",
+}
+
+
+def __getattr__(name: str):
+    if name in _lazy_attrs:
+        value = getattr(importlib.import_module(_lazy_attrs[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'endplay.dealer' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attrs))
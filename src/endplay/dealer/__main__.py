@@ -115,6 +115,26 @@ def main():
         "-b", action="store_true", help="Assign board numbers to each generated deal"
     )
     parser.add_argument("-d", help='Cards to predeal, e.g. "west S975,H64 east DA,C64"')
+    parser.add_argument(
+        "--precision",
+        type=float,
+        help="Stop producing hands once the results of the average and frequency actions are known to within this amount (the half-width of their confidence intervals), treating -p as an upper limit.",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level used with --precision (default 0.95).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time spent parsing, shuffling, swapping, evaluating each condition (with how often it rejects a deal), in double dummy calls and running each action.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Also profile the run with cProfile and write the statistics to this file, which can be read with pstats or snakeviz. Implies --profile.",
+    )
     parser.add_argument(
         "script", nargs="?", help="input file containing hand-descriptions and action"
     )
@@ -154,6 +174,11 @@ def main():
             actions=args.a,
             predeal=args.d,
             board_numbers=args.b,
+            precision=args.precision,
+            confidence=args.confidence,
+            profile=args.profile,
+            profile_output=args.profile_output,
+            collect=False,
         )
     except Exception as e:
         print("dealer had to exit prematurely because of the following error:", e)
@@ -7,8 +7,33 @@ methods is called to format it correctly.
 
 __all__ = ["BaseActions", "TerminalActions", "LaTeXActions", "HTMLActions"]
 
-from endplay.dealer.actions.base import BaseActions
-from endplay.dealer.actions.html import HTMLActions
-from endplay.dealer.actions.latex import LaTeXActions
-from endplay.dealer.actions.pdf import PDFActions
-from endplay.dealer.actions.terminal import TerminalActions
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from endplay.dealer.actions.base import BaseActions
+    from endplay.dealer.actions.html import HTMLActions
+    from endplay.dealer.actions.latex import LaTeXActions
+    from endplay.dealer.actions.pdf import PDFActions
+    from endplay.dealer.actions.terminal import TerminalActions
+
+# Each backend is only imported when it is first used
+_lazy_attrs = {
+    "BaseActions": "endplay.dealer.actions.base",
+    "HTMLActions": "endplay.dealer.actions.html",
+    "LaTeXActions": "endplay.dealer.actions.latex",
+    "PDFActions": "endplay.dealer.actions.pdf",
+    "TerminalActions": "endplay.dealer.actions.terminal",
+}
+
+
+def __getattr__(name: str):
+    if name in _lazy_attrs:
+        value = getattr(importlib.import_module(_lazy_attrs[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'endplay.dealer.actions' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attrs))
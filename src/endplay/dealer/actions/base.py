@@ -2,16 +2,26 @@
 Base actions class to provide the interface.
 """
 
-__all__ = ["BaseActions"]
+__all__ = [
+    "BaseActions",
+    "ListActionsWriter",
+    "StreamedAction",
+    "StreamingActionsWriter",
+]
 
 import sys
 from abc import ABC, abstractmethod
-from typing import List, Optional, TextIO, Union
+from collections.abc import Callable, Iterable
+from time import perf_counter
+from typing import TYPE_CHECKING, List, Optional, TextIO, Union
 
 from endplay.dealer.constraint import ConstraintInterpreter, Expr
 from endplay.parsers.dealer import Node
 from endplay.types import Deal, Player, Vul
 
+if TYPE_CHECKING:
+    from endplay.dealer.profiler import Profiler
+
 
 class BaseActions(ABC):
     def __init__(
@@ -25,15 +35,46 @@ class BaseActions(ABC):
         self.vul = vul
         self.dealer = dealer
         self.interp = interp
+        # The confidence level to report the precision of statistics at, if the
+        # deals were produced until a target precision was reached
+        self.confidence: Optional[float] = None
 
     @abstractmethod
-    def open(self, fname: Optional[str], deals: List[Deal]) -> "BaseActionsWriter": ...
+    def open(
+        self, fname: Optional[str], deals: Optional[List[Deal]] = None
+    ) -> "BaseActionsWriter": ...
+
+
+class StreamedAction:
+    """
+    An action which is run on each deal as it is produced, rather than on a list
+    of all the deals. Any of the callbacks may be None.
+
+    :param start: Called before the first deal, e.g. to print a header
+    :param add: Called with the board number and deal of each deal produced
+    :param finish: Called after the last deal, e.g. to print a statistic
+    """
+
+    def __init__(
+        self,
+        start: Optional[Callable[[], None]] = None,
+        add: Optional[Callable[[int, Deal], None]] = None,
+        finish: Optional[Callable[[], None]] = None,
+    ):
+        self.start = start
+        self.add = add
+        self.finish = finish
 
 
 class BaseActionsWriter(ABC):
-    def __init__(self, actions: BaseActions, fname: Optional[str], deals: List[Deal]):
+    def __init__(
+        self,
+        actions: BaseActions,
+        fname: Optional[str],
+        deals: Optional[List[Deal]] = None,
+    ):
         self.actions = actions
-        self.deals = deals
+        self.deals = deals if deals is not None else []
         self.fname = fname
         self.f: Optional[TextIO] = None
 
@@ -63,71 +104,89 @@ class BaseActionsWriter(ABC):
             )
         print(*objs, **kwargs, file=self.f)
 
-    def run_action(self, node: Node):
-        if node.value == "printall":
-            self.printall()
-        elif node.value == "print":
-            self.print(*[child.value for child in node.children])
-        elif node.value == "printew":
-            self.printew()
-        elif node.value == "printpbn":
-            self.printpbn()
-        elif node.value == "printcompact":
-            if len(node.children) == 0:
-                expr = None
+    def run(
+        self,
+        nodes: List[Node],
+        deals: Iterable[Deal],
+        profiler: Optional["Profiler"] = None,
+    ) -> int:
+        """
+        Run a list of actions over a sequence of deals, returning the number of
+        deals. The deals are collected into a list first, and each action is then
+        run over the whole list. If a profiler is given, the time spent in each
+        action is recorded.
+        """
+        self.deals = list(deals)
+        for i, node in enumerate(nodes, 1):
+            if profiler is None:
+                self.run_action(node)
             else:
-                expr = self.actions.interp.lambdify(node.first_child)
-            self.printcompact(expr)
-        elif node.value == "printoneline":
+                with profiler.phase(f"action {i} ({node.value})"):
+                    self.run_action(node)
+        return len(self.deals)
+
+    def _parse_action(self, node: Node) -> tuple[str, list]:
+        """
+        Return the name of the method which implements an action and the arguments
+        to call it with
+        """
+        interp = self.actions.interp
+        if node.value in ("printall", "printew", "printpbn"):
+            return node.value, []
+        elif node.value == "print":
+            return "print", [child.value for child in node.children]
+        elif node.value in ("printcompact", "printoneline"):
             if len(node.children) == 0:
-                expr = None
-            else:
-                expr = self.actions.interp.lambdify(node.first_child)
-            self.printoneline(expr)
+                return node.value, [None]
+            return node.value, [interp.lambdify(node.first_child)]
         elif node.value == "printes":
             objs = []
             for child in node.children:
                 if child.dtype == Node.VALUE:
                     objs.append(child.value)
                 else:
-                    objs.append(self.actions.interp.lambdify(child))
-            self.printes(*objs)
+                    objs.append(interp.lambdify(child))
+            return "printes", objs
         elif node.value == "average":
             if len(node.children) == 2:
-                s, expr = node.first_child.value, self.actions.interp.lambdify(
-                    node.last_child
-                )
+                s = node.first_child.value
             else:
-                s, expr = None, self.actions.interp.lambdify(node.last_child)
-            self.average(expr, s)
+                s = None
+            return "average", [interp.lambdify(node.last_child), s]
         elif node.value == "frequency":
             if node.first_child.dtype == Node.VALUE:
                 s, args = node.children[0].value, node.children[1:]
             else:
                 s, args = None, node.children
-            ex1, lb1, ub1 = (
-                self.actions.interp.lambdify(args[0]),
-                args[1].value,
-                args[2].value,
-            )
+            ex1, lb1, ub1 = interp.lambdify(args[0]), args[1].value, args[2].value
             if len(args) > 3:
-                ex2, lb2, ub2 = (
-                    self.actions.interp.lambdify(args[3]),
-                    args[4].value,
-                    args[5].value,
-                )
-                self.frequency2d(ex1, lb1, ub1, ex2, lb2, ub2, s)
-            else:
-                self.frequency1d(ex1, lb1, ub1, s)
+                ex2, lb2, ub2 = interp.lambdify(args[3]), args[4].value, args[5].value
+                return "frequency2d", [ex1, lb1, ub1, ex2, lb2, ub2, s]
+            return "frequency1d", [ex1, lb1, ub1, s]
         else:
             raise ValueError(f"Unknown action {node.value}")
 
+    @abstractmethod
+    def run_action(self, node: Node):
+        "Run a single action over all the deals in `deals`"
+
     @abstractmethod
     def on_enter(self): ...
 
     @abstractmethod
     def on_exit(self): ...
 
+
+class ListActionsWriter(BaseActionsWriter):
+    """
+    A writer which implements each action as a method which is run over the list
+    of all the deals
+    """
+
+    def run_action(self, node: Node):
+        method, args = self._parse_action(node)
+        getattr(self, method)(*args)
+
     @abstractmethod
     def print(self, *players: Player): ...
 
@@ -172,3 +231,60 @@ class BaseActionsWriter(ABC):
         hb2: float,
         s: Optional[str] = None,
     ): ...
+
+
+class StreamingActionsWriter(BaseActionsWriter):
+    """
+    A writer which runs every action in a single pass as the deals are produced,
+    so that they do not need to be kept in memory
+    """
+
+    def run(
+        self,
+        nodes: List[Node],
+        deals: Iterable[Deal],
+        profiler: Optional["Profiler"] = None,
+    ) -> int:
+        names = [f"action {i} ({node.value})" for i, node in enumerate(nodes, 1)]
+        streamed = [self.stream_action(node) for node in nodes]
+        starts = [(name, s.start) for name, s in zip(names, streamed) if s.start]
+        adds = [(name, s.add) for name, s in zip(names, streamed) if s.add]
+        finishes = [(name, s.finish) for name, s in zip(names, streamed) if s.finish]
+        for name, start in starts:
+            self._timed(profiler, name, start)
+        n = 0
+        for n, deal in enumerate(deals, 1):
+            if profiler is None:
+                for _, add in adds:
+                    add(n, deal)
+            else:
+                for name, add in adds:
+                    self._timed(profiler, name, add, n, deal)
+        for name, finish in finishes:
+            self._timed(profiler, name, finish)
+        return n
+
+    def run_action(self, node: Node):
+        streamed = self.stream_action(node)
+        if streamed.start:
+            streamed.start()
+        if streamed.add:
+            for i, deal in enumerate(self.deals, 1):
+                streamed.add(i, deal)
+        if streamed.finish:
+            streamed.finish()
+
+    @staticmethod
+    def _timed(profiler: Optional["Profiler"], name: str, fn: Callable, *args):
+        if profiler is None:
+            fn(*args)
+        else:
+            start = perf_counter()
+            fn(*args)
+            profiler.add(name, perf_counter() - start)
+
+    @abstractmethod
+    def stream_action(self, node: Node) -> StreamedAction:
+        """
+        Convert an action into a :class:`StreamedAction`
+        """
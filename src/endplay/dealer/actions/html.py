@@ -6,19 +6,17 @@ __all__ = ["HTMLActions"]
 
 from io import StringIO
 
-import matplotlib.pyplot as plt  # type: ignore
-
 import endplay.stats as stats
-from endplay.dealer.actions.base import BaseActions, BaseActionsWriter
+from endplay.dealer.actions.base import BaseActions, ListActionsWriter
 from endplay.types import Denom, Player, Vul
 
 
 class HTMLActions(BaseActions):
-    def open(self, fname, deals) -> "HTMLActionsWriter":
+    def open(self, fname, deals=None) -> "HTMLActionsWriter":
         return HTMLActionsWriter(self, fname, deals)
 
 
-class HTMLActionsWriter(BaseActionsWriter):
+class HTMLActionsWriter(ListActionsWriter):
     def on_enter(self):
         self.write(preamble)
 
@@ -157,6 +155,8 @@ class HTMLActionsWriter(BaseActionsWriter):
 
     def frequency1d(self, expr, lb, ub, s=None):
         hist = stats.frequency(self.deals, expr, lb, ub)
+        import matplotlib.pyplot as plt  # type: ignore
+
         fig, ax = plt.subplots()
         ax.bar(list(range(lb, ub + 1)), hist)
         if s:
@@ -167,6 +167,8 @@ class HTMLActionsWriter(BaseActionsWriter):
 
     def frequency2d(self, ex1, lb1, ub1, ex2, lb2, ub2, s=None):
         hist = stats.cofrequency(self.deals, ex1, ex2, lb1, ub1, lb2, ub2)
+        import matplotlib.pyplot as plt  # type: ignore
+
         fig, ax = plt.subplots()
         m = ax.matshow(hist)
         fig.colorbar(m)
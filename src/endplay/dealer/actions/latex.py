@@ -6,19 +6,17 @@ __all__ = ["LaTeXActions"]
 
 from io import StringIO
 
-import matplotlib.pyplot as plt  # type: ignore
-
 import endplay.stats as stats
-from endplay.dealer.actions.base import BaseActions, BaseActionsWriter
+from endplay.dealer.actions.base import BaseActions, ListActionsWriter
 from endplay.types import Denom, Player
 
 
 class LaTeXActions(BaseActions):
-    def open(self, fname, deals):
+    def open(self, fname, deals=None):
         return LaTeXActionsWriter(self, fname, deals)
 
 
-class LaTeXActionsWriter(BaseActionsWriter):
+class LaTeXActionsWriter(ListActionsWriter):
     def on_enter(self):
         self.write(preamble)
 
@@ -111,6 +109,8 @@ class LaTeXActionsWriter(BaseActionsWriter):
     def frequency1d(self, expr, lb, ub, s=None):
         LaTeXActionsWriter.mpl_init_pgf()
         hist = stats.frequency(self.deals, expr, lb, ub)
+        import matplotlib.pyplot as plt  # type: ignore
+
         fig, ax = plt.subplots()
         ax.bar(list(range(lb, ub + 1)), hist)
         if s:
@@ -122,6 +122,8 @@ class LaTeXActionsWriter(BaseActionsWriter):
     def frequency2d(self, ex1, lb1, ub1, ex2, lb2, ub2, s=None):
         LaTeXActionsWriter.mpl_init_pgf()
         hist = stats.cofrequency(self.deals, ex1, ex2, lb1, ub1, lb2, ub2)
+        import matplotlib.pyplot as plt  # type: ignore
+
         fig, ax = plt.subplots()
         m = ax.matshow(hist)
         fig.colorbar(m)
@@ -8,7 +8,7 @@ from endplay.dealer.actions.latex import LaTeXActions, LaTeXActionsWriter
 
 
 class PDFActions(LaTeXActions):
-    def open(self, fname, deals):
+    def open(self, fname, deals=None):
         return PDFActionsWriter(self, fname, deals)
 
 
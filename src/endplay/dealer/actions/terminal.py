@@ -4,103 +4,176 @@ Actions class for producing plaintext output.
 
 __all__ = ["TerminalActions"]
 
+import math
+from functools import partial
 from io import StringIO
 
 import endplay.stats as stats
-from endplay.dealer.actions.base import BaseActions, BaseActionsWriter
-from endplay.dealer.constraint import Expr
+from endplay.dealer.actions.base import (
+    BaseActions,
+    StreamedAction,
+    StreamingActionsWriter,
+)
 from endplay.types import Player
 
 
 class TerminalActions(BaseActions):
-    def open(self, fname, deals):
+    def open(self, fname, deals=None):
         return TerminalActionsWriter(self, fname, deals)
 
 
-class TerminalActionsWriter(BaseActionsWriter):
+class TerminalActionsWriter(StreamingActionsWriter):
     def on_enter(self):
         pass
 
     def on_exit(self):
         pass
 
-    def print(self, *players):
-        if self.f is None:
-            raise RuntimeError("stream is not open for writing")
-        exclude = [p for p in Player if p not in players]
-        for i, deal in enumerate(self.deals, 1):
-            deal.pprint(
-                board_no=i if self.actions.board_numbers else None,
-                exclude=exclude,
-                stream=self.f,
-            )
-            self.write()
+    def stream_action(self, node):
+        method, args = self._parse_action(node)
+        return getattr(self, "_stream_" + method)(*args)
+
+    def _stream_print(self, *players):
+        return StreamedAction(add=partial(self._print_deal, players))
 
-    def printpbn(self):
-        for i, deal in enumerate(self.deals, 1):
-            if self.actions.board_numbers:
-                self.write(str(i).rjust(3), end=" ")
-            self.write(str(deal))
+    def _stream_printew(self):
+        return self._stream_print(Player.east, Player.west)
 
-    def printcompact(self, expr=None):
+    def _stream_printall(self):
+        return self._stream_print(*Player)
+
+    def _print_deal(self, players, i, deal):
+        if self.f is None:
+            raise RuntimeError("stream is not open for writing")
+        deal.pprint(
+            board_no=i if self.actions.board_numbers else None,
+            exclude=[p for p in Player if p not in players],
+            stream=self.f,
+        )
+        self.write()
+
+    def _stream_printpbn(self):
+        return StreamedAction(add=self._printpbn)
+
+    def _printpbn(self, i, deal):
+        if self.actions.board_numbers:
+            self.write(str(i).rjust(3), end=" ")
+        self.write(str(deal))
+
+    def _stream_printcompact(self, expr=None):
+        return StreamedAction(
+            start=self._printcompact_header, add=partial(self._printcompact, expr)
+        )
+
+    def _printcompact_header(self):
         self.write(*[p.name.ljust(13) for p in Player], end="\n\n")
-        for i, deal in enumerate(self.deals, 1):
-            hands = []
-            for player in Player:
-                buf = StringIO()
-                deal[player].pprint(stream=buf)
-                hands.append(buf.getvalue().split("\n"))
-            if expr is not None:
-                hands.append([str(expr(deal)), "", "", ""])
-            if self.actions.board_numbers:
-                self.write(str(i) + ")")
-            for line in zip(*hands):
-                self.write(*[s.ljust(13) for s in line])
+
+    def _printcompact(self, expr, i, deal):
+        hands = []
+        for player in Player:
+            buf = StringIO()
+            deal[player].pprint(stream=buf)
+            hands.append(buf.getvalue().split("\n"))
+        if expr is not None:
+            hands.append([str(expr(deal)), "", "", ""])
+        if self.actions.board_numbers:
+            self.write(str(i) + ")")
+        for line in zip(*hands):
+            self.write(*[s.ljust(13) for s in line])
+        self.write()
+
+    def _stream_printoneline(self, expr=None):
+        return StreamedAction(add=partial(self._printoneline, expr))
+
+    def _printoneline(self, expr, i, deal):
+        if self.actions.board_numbers:
+            self.write(str(i).rjust(3), end=" ")
+        self.write(deal.to_pbn()[2:], end=" ")
+        if expr is not None:
+            self.write(expr(deal))
+        else:
             self.write()
 
-    def printoneline(self, expr=None):
-        for i, deal in enumerate(self.deals, 1):
-            if self.actions.board_numbers:
-                self.write(str(i).rjust(3), end=" ")
-            self.write(deal.to_pbn()[2:], end=" ")
-            if expr is not None:
-                self.write(expr(deal))
+    def _stream_printes(self, *objs):
+        return StreamedAction(add=partial(self._printes, objs))
+
+    def _printes(self, objs, i, deal):
+        if self.actions.board_numbers:
+            self.write(str(i).rjust(3), end=" ")
+        for obj in objs:
+            if isinstance(obj, str):
+                self.write(obj, end="")
             else:
-                self.write()
-
-    def printes(self, *objs):
-        for i, deal in enumerate(self.deals, 1):
-            if self.actions.board_numbers:
-                self.write(str(i).rjust(3), end=" ")
-            for obj in objs:
-                if isinstance(obj, str):
-                    self.write(obj, end="")
-                else:
-                    self.write(obj(deal), end="")
-            self.write()
+                self.write(obj(deal), end="")
+        self.write()
+
+    def _stream_average(self, expr, s=None):
+        # The sum is kept as well as the summary so that the mean is the same as
+        # that calculated by stats.average
+        summary = stats.Summary()
+        total = 0
+
+        def add(i, deal):
+            nonlocal total
+            value = expr(deal)
+            total += value
+            summary.add(value)
+
+        def finish():
+            mean = total / summary.count if summary.count else math.nan
+            self._write_average(mean, summary, s)
+
+        return StreamedAction(add=add, finish=finish)
 
-    def average(self, expr, s=None):
+    def _write_average(self, mean, summary, s):
         if s:
             self.write(s, end="")
-        self.write(stats.average(self.deals, expr))
+        confidence = self.actions.confidence
+        if confidence is None:
+            self.write(mean)
+        else:
+            self.write(
+                mean,
+                f"± {summary.halfwidth(confidence, resolution=1):.4g}",
+                f"({100*confidence:g}% confidence)",
+            )
+
+    def _stream_frequency1d(self, expr, lb, ub, s=None):
+        hist = stats.Histogram(lb, ub)
+        return StreamedAction(
+            add=lambda i, deal: hist.add(expr(deal)),
+            finish=lambda: self._write_frequency1d(hist, s),
+        )
 
-    def frequency1d(self, expr, lb, ub, s=None):
-        hist = stats.frequency(self.deals, expr, lb, ub)
+    def _write_frequency1d(self, hist, s):
         if s:
             self.write(s)
             self.write("=" * len(s))
-        rows = [(str(start), str(val)) for start, val in enumerate(hist, lb)]
+        rows = [
+            (str(start), str(val)) for start, val in enumerate(hist.counts, hist.lb)
+        ]
         lhs_size = max(len(row[0]) for row in rows)
         for row in rows:
             self.write(row[0].rjust(lhs_size), row[1])
+        if self.actions.confidence is not None:
+            self.write(
+                f"Proportions ± {hist.halfwidth(self.actions.confidence):.4g}",
+                f"({100*self.actions.confidence:g}% confidence)",
+            )
+
+    def _stream_frequency2d(self, ex1, lb1, ub1, ex2, lb2, ub2, s=None):
+        hist = stats.Histogram2D(lb1, ub1, lb2, ub2)
+        return StreamedAction(
+            add=lambda i, deal: hist.add((ex1(deal), ex2(deal))),
+            finish=lambda: self._write_frequency2d(hist, s),
+        )
 
-    def frequency2d(self, ex1, lb1, ub1, ex2, lb2, ub2, s=None):
-        hist = stats.cofrequency(self.deals, ex1, ex2, lb1, ub1, lb2, ub2)
+    def _write_frequency2d(self, hist, s):
         if s:
             self.write(s)
             self.write("=" * len(s))
-        rows = [[""] + [str(i) for i in range(lb2, ub2 + 1)]]
-        for j, row in enumerate(hist, lb1):
+        rows = [[""] + [str(i) for i in range(hist.lb2, hist.ub2 + 1)]]
+        for j, row in enumerate(hist.counts, hist.lb1):
             rows += [[str(j) + " |"] + [str(r) for r in row]]
         width = max(max(len(cell) for cell in row) for row in rows)
         self.write(" ".join(c.rjust(width) for c in rows[0]))
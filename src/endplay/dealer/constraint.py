@@ -9,6 +9,8 @@ the machinery in this module.
 __all__ = ["ConstraintInterpreter"]
 
 import re
+import threading
+from collections import OrderedDict
 from typing import Any, Callable, Union
 
 from endplay.dds import analyse_play
@@ -40,8 +42,13 @@ class ConstraintInterpreter:
         r"(?:tens?)|(?:jacks?)|(?:queens?)|(?:kings?)|(?:aces?)|(?:top[2-5])|(?:c13)"
     )
 
+    # The maximum number of compiled string constraints to keep
+    _cache_size = 256
+
     def __init__(self):
         self.parser = DealerParser()
+        self._compiled: OrderedDict[str, Expr] = OrderedDict()
+        self._compiled_lock = threading.Lock()
         self.reset_env()
 
     def set_env(self, name: str, value: Any):
@@ -123,7 +130,19 @@ class ConstraintInterpreter:
         :param node: The root of the expression tree, or a string containing an expression
         """
         if isinstance(node, str):
-            node = self.parse(node)
+            # The compiled function looks up the environment when it is called, so
+            # it can be reused for the lifetime of the interpreter. The default
+            # interpreter is shared between threads, so the cache is locked
+            s = node
+            with self._compiled_lock:
+                if s in self._compiled:
+                    self._compiled.move_to_end(s)
+                    return self._compiled[s]
+                tree = self.parse(s)
+                fn = self._compiled[s] = lambda deal: self.evaluate(tree, deal)
+                if len(self._compiled) > self._cache_size:
+                    self._compiled.popitem(last=False)
+                return fn
         return lambda deal: self.evaluate(node, deal)
 
     def _evaluate_shape(self, node, shape):
@@ -247,12 +266,22 @@ class ConstraintInterpreter:
     def _fn_score(self, node, deal):
         vul = node.first_child.value
         contract = node.middle_child.value
-        result = node.last_child.value
-        contract.result = result
-        return contract.score(vul)
+        tricks = self.evaluate(node.last_child, deal)
+        # endplay.scoring depends on numpy, so is only imported when needed
+        from endplay.scoring import contract_score
+
+        return contract_score(
+            contract.level,
+            contract.denom,
+            contract.penalty,
+            contract.declarer.is_vul(vul),
+            tricks - contract.level - 6,
+        )
 
     def _fn_imps(self, node, deal):
-        raise NotImplementedError
+        from endplay.scoring import imps
+
+        return imps(self.evaluate(node.first_child, deal))
 
     def _fn_shape(self, node, deal):
         hand = deal[node.first_child.value]
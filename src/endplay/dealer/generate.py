@@ -7,14 +7,24 @@ from __future__ import annotations
 __all__ = ["generate_deal", "generate_deals"]
 
 import warnings
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
+from functools import lru_cache
+from time import perf_counter
 from typing import Optional, Union
 
-from numpy.random import RandomState  # guaranteed to be stable for numpy>=1.16
-from tqdm import trange  # type: ignore
-
 from endplay.dealer.constraint import ConstraintInterpreter, Expr
+from endplay.dealer.profiler import Profiler
 from endplay.types import Card, Deal, Denom, Player, Rank
+from endplay.types.hand import _card_bits
+
+
+@lru_cache(maxsize=None)
+def _default_interpreter() -> ConstraintInterpreter:
+    """
+    The interpreter used when no environment is given, which is shared so that
+    constraints passed as strings are only compiled once
+    """
+    return ConstraintInterpreter()
 
 
 class DealNotGeneratedError(RuntimeError):
@@ -138,6 +148,8 @@ def generate_deals(
     max_attempts: int = 1000000,
     env: dict = {},
     strict: bool = False,
+    until: Optional[Callable[[Deal], bool]] = None,
+    profiler: Optional[Profiler] = None,
 ) -> Iterator[Deal]:
     """
     Generates `produce` random deals satisfying the constraints which should
@@ -159,6 +171,11 @@ def generate_deals(
     :param env: A dictionary of the environment used when evaluating constraints
     :param strict: If True, a `RuntimeError` is raised if `max_attempts` is reached before
             `produce` hands are produced. Otherwise, a warning is generated
+    :param until: A function which is called with each deal after it is produced. If it
+            returns True then no more deals are produced, so `produce` becomes an upper
+            limit. See :func:`endplay.stats.stopping_rule`
+    :param profiler: If provided, the time spent shuffling and swapping is recorded
+            in this :class:`endplay.dealer.profiler.Profiler`
     """
     if swapping == 2 and (len(predeal.west) > 0 or len(predeal.east) > 0):
         warnings.warn(
@@ -173,18 +190,27 @@ def generate_deals(
             InconsistentSwappingAlgorithmWarning,
         )
 
+    # numpy and tqdm are imported here to keep importing endplay.dealer fast
+    from numpy.random import RandomState  # guaranteed to be stable for numpy>=1.16
+    from tqdm import trange  # type: ignore
+
     rs = RandomState(seed)
 
-    ci = ConstraintInterpreter()
-    for name, val in env.items():
-        ci.set_env(name, val)
+    if env:
+        ci = ConstraintInterpreter()
+        for name, val in env.items():
+            ci.set_env(name, val)
+    else:
+        ci = _default_interpreter()
     compiled_constraints = tuple(
         ci.lambdify(c) if not callable(c) else c for c in constraints
     )
     all_cards = set(
         Card(suit=denom, rank=rank) for denom in Denom.suits() for rank in Rank
     )
-    cards = list(all_cards.difference(predeal.to_hand()))
+    # The undealt cards are shuffled as hand bitmasks, so that dealing a slice
+    # of them to a player is a sum rather than a card-by-card insertion
+    cards = [_card_bits(card) for card in all_cards.difference(predeal.to_hand())]
     split = [sum([13 - len(hand) for _, hand in predeal][:i]) for i in range(5)]
     generated = 0
     prange = trange(produce, desc="Produced", unit="deals", disable=not show_progress)
@@ -202,15 +228,25 @@ def generate_deals(
                     warnings.warn(message, DealNotGeneratedWarning)
                     return
             generated += 1
+            if profiler is not None:
+                start = perf_counter()
             rs.shuffle(cards)  # type: ignore
             deal = predeal.copy()
             for i, player in enumerate(Player):
-                deal[player].extend(cards[split[i] : split[i + 1]])
-            for perm in _generate_swaps(deal, swapping):
+                deal.add_mask(player, sum(cards[split[i] : split[i + 1]]))
+            swaps = _generate_swaps(deal, swapping)
+            if profiler is not None:
+                profiler.add("shuffle", perf_counter() - start)
+                if swapping != 0:
+                    swaps = profiler.wrap_iter("swap", swaps)
+            for perm in swaps:
                 if all(c(perm) for c in compiled_constraints):
                     yield perm
                     produced = True
                     break
+            if produced and until is not None and until(deal):
+                prange.close()
+                return
     return
 
 
@@ -0,0 +1,162 @@
+"""
+Timing of the phases of a dealer run, used by the ``--profile`` option of the
+dealer program to report where the time goes when a script is slow.
+"""
+
+from __future__ import annotations
+
+__all__ = ["Profiler"]
+
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Any, ContextManager, Optional, TextIO, TypeVar
+
+T = TypeVar("T")
+
+
+class Phase:
+    "The accumulated time spent in one phase of a run"
+
+    def __init__(self, name: str, parent: Optional[str]):
+        self.name = name
+        self.parent = parent
+        self.time = 0.0
+        self.calls = 0
+        # Only counted for constraints
+        self.rejected: Optional[int] = None
+
+
+class Profiler:
+    """
+    Records the wall time spent in named phases of a dealer run. A phase which
+    is first recorded while another phase is running is reported as part of the
+    breakdown of that phase. A disabled profiler records nothing and returns
+    wrapped functions unchanged, so it adds no overhead.
+
+    :param enabled: Whether to record timings
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.phases: dict[str, Phase] = {}
+        # The number of calls to and time spent in the DDS library, if known
+        self.dds_calls: Optional[int] = None
+        self.dds_time = 0.0
+        self._running: list[str] = []
+        self._start = perf_counter()
+
+    def _phase(self, name: str) -> Phase:
+        if name not in self.phases:
+            parent = self._running[-1] if self._running else None
+            self.phases[name] = Phase(name, parent)
+        return self.phases[name]
+
+    def add(self, name: str, seconds: float) -> None:
+        "Add the time taken by a single call to a phase"
+        phase = self._phase(name)
+        phase.time += seconds
+        phase.calls += 1
+
+    def phase(self, name: str) -> ContextManager:
+        "Context manager which times the code it contains as the named phase"
+        if not self.enabled:
+            return nullcontext()
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        phase = self._phase(name)
+        self._running.append(name)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            phase.time += perf_counter() - start
+            phase.calls += 1
+            self._running.pop()
+
+    def wrap_constraint(self, name: str, fn: Callable[[T], Any]) -> Callable[[T], Any]:
+        """
+        Wrap a constraint so that the time spent evaluating it and the number of
+        deals it rejects are recorded as the named phase
+        """
+        if not self.enabled:
+            return fn
+
+        def wrapper(deal: T) -> Any:
+            start = perf_counter()
+            res = fn(deal)
+            phase = self._phase(name)
+            phase.time += perf_counter() - start
+            phase.calls += 1
+            phase.rejected = (phase.rejected or 0) + (not res)
+            return res
+
+        return wrapper
+
+    def wrap_iter(self, name: str, it: Iterable[T]) -> Iterator[T]:
+        """
+        Wrap an iterable so that the time spent producing its items is recorded,
+        with any phases recorded while an item is produced as part of its breakdown
+        """
+        it = iter(it)
+        phase = self._phase(name)
+        while True:
+            self._running.append(name)
+            start = perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                phase.time += perf_counter() - start
+                phase.calls += 1
+                self._running.pop()
+            yield item
+
+    def report(self, file: Optional[TextIO] = None) -> None:
+        """
+        Print the time spent in each phase, and the time spent in DDS calls
+
+        :param file: The file to print to, if None then sys.stdout
+        """
+        total = perf_counter() - self._start
+        print(f"Profile (total {total:.3f}s)", file=file)
+        accounted = 0.0
+        for phase in self.phases.values():
+            if phase.parent is not None:
+                continue
+            accounted += phase.time
+            self._print_phase(phase, total, 1, file)
+            children = [p for p in self.phases.values() if p.parent == phase.name]
+            for child in children:
+                self._print_phase(child, total, 2, file)
+            if children:
+                other = phase.time - sum(child.time for child in children)
+                self._print_line("other", other, total, 2, "", file)
+        self._print_line("other", total - accounted, total, 1, "", file)
+        if self.dds_calls is not None:
+            info = f"{self.dds_calls} calls"
+            self._print_line("of which DDS calls", self.dds_time, total, 1, info, file)
+
+    def _print_phase(
+        self, phase: Phase, total: float, depth: int, file: Optional[TextIO]
+    ):
+        info = f"{phase.calls} calls"
+        if phase.rejected is not None:
+            info += f", {100 * phase.rejected / phase.calls:.2f}% rejected"
+        self._print_line(phase.name, phase.time, total, depth, info, file)
+
+    @staticmethod
+    def _print_line(
+        name: str,
+        time: float,
+        total: float,
+        depth: int,
+        info: str,
+        file: Optional[TextIO],
+    ):
+        pct = 100 * time / total if total > 0 else 0
+        name = "  " * depth + name
+        print(f"{name:<40} {time:>9.3f}s {pct:>6.1f}%  {info}".rstrip(), file=file)
@@ -9,18 +9,15 @@ from __future__ import annotations
 
 import random
 import time
-from typing import Optional
-
-from endplay.dealer.actions import (
-    HTMLActions,
-    LaTeXActions,
-    PDFActions,
-    TerminalActions,
-)
+from collections.abc import Iterator
+from typing import Optional, Union
+
 from endplay.dealer.actions.base import BaseActions
-from endplay.dealer.constraint import ConstraintInterpreter
+from endplay.dealer.constraint import ConstraintInterpreter, Expr
 from endplay.dealer.generate import generate_deals
+from endplay.dealer.profiler import Profiler
 from endplay.parsers.dealer import DealerParser, Node, ParseException
+from endplay.stats import Histogram, Summary, stopping_rule
 from endplay.types import Deal, Player, Vul
 
 
@@ -38,6 +35,11 @@ def run_script(
     actions: list[str] = [],
     predeal: str = "",
     board_numbers: bool = False,
+    precision: Optional[float] = None,
+    confidence: float = 0.95,
+    profile: bool = False,
+    profile_output: Optional[str] = None,
+    collect: bool = True,
 ) -> list[Deal]:
     """
     Execute a dealer script file
@@ -55,11 +57,24 @@ def run_script(
     :param actions: A list of extra actions to apply
     :param predeal: A list of players and the suit holdings to deal to them
     :param board_numbers: If True, print board numbers along with the generated deals
-    :return: The generated deals in a list
+    :param precision: If provided, stop producing hands as soon as the results of the
+            average and frequency actions are known to within this amount, with `produce`
+            becoming an upper limit. This is the half-width of the confidence interval of
+            an average, or of the proportions of a frequency. Averages are assumed to be
+            of whole numbers, so that an average of a rare event does not converge
+            before the event has occurred (see :func:`endplay.stats.stopping_rule`)
+    :param confidence: The confidence level used with `precision`
+    :param profile: Print the time spent parsing, shuffling, swapping, evaluating each
+            condition (and how often it rejects a deal), in DDS calls and running each
+            action at the end of the run
+    :param profile_output: If provided, the run is also profiled with cProfile and
+            the statistics are written to this file, which can be read with `pstats`.
+            This implies `profile`
+    :param collect: If False, the deals are only passed to the actions as they are
+            produced and are not kept, so that memory use does not grow with `produce`
+    :return: The generated deals in a list, which is empty if `collect` is False
     """
 
-    start_time = time.time()
-
     # If we are asked to produce more hands than we generate, we will always fail so let's not
     # waste any time trying
     if produce > generate:
@@ -67,135 +82,253 @@ def run_script(
             f"Asked to produce {produce} hands by generating {generate} hands"
         )
 
-    if seed is None:
-        # Generate a seed between 0 and 2**32-1 (required by numpy.random.RandomState)
-        # so that if the verbose option is passed we can print out the value of the initial
-        # seed at the end of the run
-        seed = random.randrange((1 << 32) - 1)
-
-    # Interpret constraints and actions
-    parser = DealerParser()
-    parsed_constraints = [parser.parse_expr(c) for c in constraints]
-    parsed_actions: list[Node] = []
-    for a in actions:
-        action_tree = parser.parse_string("action " + a).first_child
-        parsed_actions += action_tree.children
-    if predeal:
-        predeal_node = parser.parse_string("predeal " + predeal)
-        deal = predeal_node.first_child.first_child.value
-    else:
-        deal = Deal()
-
-    # Parse script into document tree
-    if script is None:
-        doctree = Node("root", Node.ROOT)
-    else:
+    start_time = time.time()
+    profile = profile or profile_output is not None
+    profiler = Profiler(enabled=profile)
+    if profile:
+        # DDS calls are timed using the instrumentation in endplay.dds
+        import endplay.dds as dds
+
+        dds_enabled = dds.stats()["enabled"]
+        dds.enable_stats()
+        dds_before = _dds_totals(dds.stats())
+    if profile_output is not None:
+        import cProfile
+
+        cprofiler = cProfile.Profile()
+        cprofiler.enable()
+
+    # The profiling hooks are global, so they are always removed even if the
+    # script fails
+    try:
+        if seed is None:
+            # Generate a seed between 0 and 2**32-1 (required by numpy.random.RandomState)
+            # so that if the verbose option is passed we can print out the value of the initial
+            # seed at the end of the run
+            seed = random.randrange((1 << 32) - 1)
+
+        # Interpret constraints and actions
+        parse_start = time.perf_counter()
+        parser = DealerParser()
+        parsed_constraints = [parser.parse_expr(c) for c in constraints]
+        condition_names = [f"condition {i}: {c}" for i, c in enumerate(constraints, 1)]
+        parsed_actions: list[Node] = []
+        for a in actions:
+            action_tree = parser.parse_string("action " + a).first_child
+            parsed_actions += action_tree.children
+        if predeal:
+            predeal_node = parser.parse_string("predeal " + predeal)
+            deal = predeal_node.first_child.first_child.value
+        else:
+            deal = Deal()
+
+        # Parse script into document tree
+        if script is None:
+            doctree = Node("root", Node.ROOT)
+        else:
+            try:
+                with open(script) as f:
+                    doctree = parser.parse_file(f)
+            except FileNotFoundError:
+                raise RuntimeError(f"{script}: no such file")
+            except OSError as e:
+                raise RuntimeError(f"Could not load script: {e}")
+            except ParseException as e:
+                raise RuntimeError(f"Syntax error: {e}")
+            except Exception as e:
+                raise RuntimeError(f"Unknown exception occurred: {e}")
+
+        # Initialise remaining variables from script
+        interp = ConstraintInterpreter()
+        vul: Optional[Vul] = None
+        dealer: Optional[Player] = None
         try:
-            with open(script) as f:
-                doctree = parser.parse_file(f)
-        except FileNotFoundError:
-            raise RuntimeError(f"{script}: no such file")
-        except OSError as e:
-            raise RuntimeError(f"Could not load script: {e}")
-        except ParseException as e:
-            raise RuntimeError(f"Syntax error: {e}")
+            for node in doctree.children:
+                if node.value == "generate":
+                    generate = node.first_child.value
+                elif node.value == "produce":
+                    produce = node.first_child.value
+                elif node.value == "vulnerable":
+                    vul = node.first_child.value
+                elif node.value == "dealer":
+                    dealer = node.first_child.value
+                elif node.value == "predeal":
+                    deal = node.first_child.value
+                elif node.value == "pointcount":
+                    pointcount = [child.value for child in node.children]
+                    interp.set_env("hcpscale", pointcount)
+                elif node.value == "altcount":
+                    pointcount = [child.value for child in node.children[1:]]
+                    interp.set_env(f"pt{node.first_child.value}", pointcount)
+                elif node.value == "condition":
+                    parsed_constraints += [node.first_child]
+                    condition_names.append(f"condition {len(condition_names) + 1}")
+                elif node.value == "action":
+                    parsed_actions += [child for child in node.children]
+                elif node.value == "define":
+                    interp.set_env(node.first_child.value, node.last_child)
+                else:
+                    raise RuntimeError("Unknown dealer input:", node.value)
+        except NotImplementedError as e:
+            exit(f"One of the features you are trying to use is unimplemented: {e}")
         except Exception as e:
-            raise RuntimeError(f"Unknown exception occurred: {e}")
+            exit(
+                f"Unknown exception occurred: {e}",
+            )
+        profiler.add("parse", time.perf_counter() - parse_start)
 
-    # Initialise remaining variables from script
-    interp = ConstraintInterpreter()
-    vul: Optional[Vul] = None
-    dealer: Optional[Player] = None
-    try:
-        for node in doctree.children:
-            if node.value == "generate":
-                generate = node.first_child.value
-            elif node.value == "produce":
-                produce = node.first_child.value
-            elif node.value == "vulnerable":
-                vul = node.first_child.value
-            elif node.value == "dealer":
-                dealer = node.first_child.value
-            elif node.value == "predeal":
-                deal = node.first_child.value
-            elif node.value == "pointcount":
-                pointcount = [child.value for child in node.children]
-                interp.set_env("hcpscale", pointcount)
-            elif node.value == "altcount":
-                pointcount = [child.value for child in node.children[1:]]
-                interp.set_env(f"pt{node.first_child.value}", pointcount)
-            elif node.value == "condition":
-                parsed_constraints += [node.first_child]
-            elif node.value == "action":
-                parsed_actions += [child for child in node.children]
-            elif node.value == "define":
-                interp.set_env(node.first_child.value, node.last_child)
-            else:
-                raise RuntimeError("Unknown dealer input:", node.value)
-    except NotImplementedError as e:
-        exit(f"One of the features you are trying to use is unimplemented: {e}")
-    except Exception as e:
-        exit(
-            f"Unknown exception occurred: {e}",
-        )
+        # Produce hands
+        compiled_constraints = [
+            profiler.wrap_constraint(name, interp.lambdify(c))
+            for name, c in zip(condition_names, parsed_constraints)
+        ]
+        estimates: list[tuple[str, Expr, Union[Summary, Histogram]]] = []
+        until = None
+        if precision is not None:
+            estimates = _estimates(parsed_actions, interp)
+            if not estimates:
+                raise ValueError("precision requires an average or frequency action")
+            until = stopping_rule(
+                *[(expr, acc) for _, expr, acc in estimates],
+                precision=precision,
+                level=confidence,
+            )
 
-    # Produce hands
-    compiled_constraints = [interp.lambdify(c) for c in parsed_constraints]
-    deals = []
-    generator = generate_deals(
-        *compiled_constraints,
-        predeal=deal,
-        swapping=swapping,
-        show_progress=show_progress,
-        produce=produce,
-        seed=seed,
-        max_attempts=generate,
-    )
-    try:
-        while True:
-            deals.append(next(generator))
-    except StopIteration as e:
-        actual_generated = e.value
-
-    # Try and guess the output format
-    if outformat is None:
-        if isinstance(outfile, str):
-            if outfile.endswith(".html") or outfile.endswith(".htm"):
-                outformat = "html"
-            elif outfile.endswith(".tex"):
-                outformat = "latex"
-            elif outfile.endswith(".pdf"):
-                outformat = "pdf"
+        # Try and guess the output format
+        if outformat is None:
+            if isinstance(outfile, str):
+                if outfile.endswith(".html") or outfile.endswith(".htm"):
+                    outformat = "html"
+                elif outfile.endswith(".tex"):
+                    outformat = "latex"
+                elif outfile.endswith(".pdf"):
+                    outformat = "pdf"
+                else:
+                    outformat = "plain"
             else:
                 outformat = "plain"
+
+        # Set up the output engine
+        # Only the backend which is used is imported, as some depend on matplotlib
+        actioner: BaseActions
+        if outformat == "plain":
+            from endplay.dealer.actions import TerminalActions
+
+            actioner = TerminalActions(board_numbers, vul, dealer, interp)
+        elif outformat == "latex":
+            from endplay.dealer.actions import LaTeXActions
+
+            actioner = LaTeXActions(board_numbers, vul, dealer, interp)
+        elif outformat == "pdf":
+            from endplay.dealer.actions import PDFActions
+
+            actioner = PDFActions(board_numbers, vul, dealer, interp)
+        elif outformat == "html":
+            from endplay.dealer.actions import HTMLActions
+
+            actioner = HTMLActions(board_numbers, vul, dealer, interp)
         else:
-            outformat = "plain"
-
-    # Set up the output engine
-    actioner: BaseActions
-    if outformat == "plain":
-        actioner = TerminalActions(board_numbers, vul, dealer, interp)
-    elif outformat == "latex":
-        actioner = LaTeXActions(board_numbers, vul, dealer, interp)
-    elif outformat == "pdf":
-        actioner = PDFActions(board_numbers, vul, dealer, interp)
-    elif outformat == "html":
-        actioner = HTMLActions(board_numbers, vul, dealer, interp)
-    else:
-        raise RuntimeError(f"Unknown file format {outformat} specified")
-
-    # Run actions
-    with actioner.open(outfile, deals) as writer:
-        if parsed_actions:
-            for action in parsed_actions:
-                writer.run_action(action)
-        else:
-            writer.printall()
+            raise RuntimeError(f"Unknown file format {outformat} specified")
+        if precision is not None:
+            actioner.confidence = confidence
+
+        # Produce hands, keeping them only if they are to be returned
+        generator = generate_deals(
+            *compiled_constraints,
+            predeal=deal,
+            swapping=swapping,
+            show_progress=show_progress,
+            produce=produce,
+            seed=seed,
+            max_attempts=generate,
+            until=until,
+            profiler=profiler if profile else None,
+        )
+        deals: list[Deal] = []
+        actual_generated = 0
+
+        def produced() -> Iterator[Deal]:
+            nonlocal actual_generated
+            while True:
+                try:
+                    board = next(generator)
+                except StopIteration as e:
+                    actual_generated = e.value
+                    return
+                if collect:
+                    deals.append(board)
+                yield board
+
+        stream = profiler.wrap_iter("generate", produced()) if profile else produced()
+
+        # Run actions, each deal being passed to the actions as soon as it is produced
+        if not parsed_actions:
+            parsed_actions = [Node("printall", Node.ACTION)]
+        with actioner.open(outfile) as writer:
+            n_produced = writer.run(
+                parsed_actions, stream, profiler=profiler if profile else None
+            )
 
-    if verbose:
-        print("Generated", actual_generated, "hands")
-        print("Produced", len(deals), "hands")
-        print("Initial random seed", seed)
-        print(f"Time needed {time.time()-start_time:.3f}s")
+        if verbose:
+            print("Generated", actual_generated, "hands")
+            print("Produced", n_produced, "hands")
+            print("Initial random seed", seed)
+            for desc, _, acc in estimates:
+                if isinstance(acc, Summary):
+                    halfwidth = acc.halfwidth(confidence, resolution=1)
+                else:
+                    halfwidth = acc.halfwidth(confidence)
+                print(
+                    f"Precision of {desc}: ±{halfwidth:.4g}",
+                    f"({100*confidence:g}% confidence)",
+                )
+            print(f"Time needed {time.time()-start_time:.3f}s")
+    finally:
+        if profile_output is not None:
+            cprofiler.disable()
+        if profile:
+            dds_after = _dds_totals(dds.stats())
+            if not dds_enabled:
+                dds.disable_stats()
+
+    if profile_output is not None:
+        cprofiler.dump_stats(profile_output)
+    if profile:
+        profiler.dds_calls = dds_after[0] - dds_before[0]
+        profiler.dds_time = dds_after[1] - dds_before[1]
+        profiler.report()
 
     return deals
+
+
+def _dds_totals(stats: dict) -> tuple[int, float]:
+    "The total number of DDS calls and time spent in them from endplay.dds.stats"
+    functions = stats["functions"].values()
+    return sum(f["dds_calls"] for f in functions), sum(
+        f["solve_time"] for f in functions
+    )
+
+
+def _estimates(
+    actions: list[Node], interp: ConstraintInterpreter
+) -> list[tuple[str, Expr, Union[Summary, Histogram]]]:
+    """
+    Create an accumulator for each average and one-dimensional frequency action,
+    returning tuples of a description of the action, its expression and the accumulator
+    """
+    estimates: list[tuple[str, Expr, Union[Summary, Histogram]]] = []
+    for node in actions:
+        # The arguments are parsed in the same way as in BaseActionsWriter.run_action
+        if node.value == "average":
+            desc = node.first_child.value if len(node.children) == 2 else "average"
+            expr = interp.lambdify(node.last_child)
+            estimates.append((desc, expr, Summary()))
+        elif node.value == "frequency":
+            if node.first_child.dtype == Node.VALUE:
+                desc, args = node.first_child.value, node.children[1:]
+            else:
+                desc, args = "frequency", node.children
+            if len(args) == 3:
+                expr = interp.lambdify(args[0])
+                estimates.append((desc, expr, Histogram(args[1].value, args[2].value)))
+    return estimates
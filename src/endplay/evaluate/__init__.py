@@ -324,7 +324,7 @@ def rule_of_n(hand: Hand) -> float:
 
 def exact_shape(hand: Hand) -> list[int]:
     "Return the shape of a hand as a list starting from spades, e.g. (5, 2, 3, 3)"
-    return [len(hand[suit]) for suit in Denom.suits()]
+    return list(hand.lengths())
 
 
 def shape(hand: Hand) -> list[int]:
@@ -337,14 +337,16 @@ def shape(hand: Hand) -> list[int]:
 
 def major_shape(hand: Hand) -> list[int]:
     "Return the shape of a hand's major holding from longest to shortest"
-    return sorted((len(hand[Denom.spades]), len(hand[Denom.hearts])), reverse=True)
+    s, h, _, _ = hand.lengths()
+    return [s, h] if s >= h else [h, s]
 
 
 def minor_shape(hand: Hand) -> list[int]:
     """
     Return the shape of a hand's minor holding from longest to shortest
     """
-    return sorted((len(hand[Denom.diamonds]), len(hand[Denom.clubs])), reverse=True)
+    _, _, d, c = hand.lengths()
+    return [d, c] if d >= c else [c, d]
 
 
 def is_balanced(hand: Hand) -> bool:
@@ -12,8 +12,7 @@ import textwrap
 from curses.textpad import Textbox
 from typing import Optional
 
-from endplay.dds.ddtable import calc_dd_table
-from endplay.dds.solve import solve_board
+from endplay.dds.session import AnalysisSession
 from endplay.evaluate import hcp
 from endplay.interact.commandobject import CommandObject
 from endplay.interact.frontends.base import BaseFrontend
@@ -49,6 +48,8 @@ class CursesFrontend(BaseFrontend):
         self.command = ""
         self._ps1 = "{onlead}> "
         self.console_lines: list[tuple[str, Optional[str], bool]] = []
+        # Remembers the analysis of each position, so undoing is instant
+        self.analysis = AnalysisSession()
 
     @property
     def ps1(self):
@@ -109,7 +110,7 @@ class CursesFrontend(BaseFrontend):
         # update tricks
         self.trickswin.addstr(1, 2, "Tricks:")
         try:
-            sols = solve_board(self.cmdobj.deal)
+            sols = self.analysis.solve(self.cmdobj.deal)
             cards = "".join([str(sol[0]).ljust(3) for sol in sols])
             tricks = "".join([str(sol[1]).ljust(3) for sol in sols])
             addcstr(self.trickswin, 2, 2, cards)
@@ -122,7 +123,7 @@ class CursesFrontend(BaseFrontend):
         try:
             if len(self.cmdobj.deal[Player.north]) == 0:
                 raise RuntimeError("Zero cards")
-            table = calc_dd_table(self.cmdobj.deal)
+            table = self.analysis.dd_table(self.cmdobj.deal)
             stream = io.StringIO()
             table.pprint(stream=stream)
             for i, line in enumerate(stream.getvalue().splitlines()):
@@ -197,7 +198,10 @@ class CursesFrontend(BaseFrontend):
             self.process_input()
 
     def interact(self):
-        curses.wrapper(self.main)
+        try:
+            curses.wrapper(self.main)
+        finally:
+            self.analysis.close()
 
     def dispatch_command(self):
         if self.command.strip() == "":
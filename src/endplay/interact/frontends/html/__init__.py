@@ -6,31 +6,128 @@ dealing hands and performing double-dummy analysis.
 import json
 import os
 import shlex
+import threading
 import webbrowser
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from typing import Optional, Union
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Union
 
-from endplay.dds.ddtable import calc_dd_table
-from endplay.dds.solve import solve_board
+from endplay.dds.session import AnalysisSession
 from endplay.interact.commandobject import CommandObject
 from endplay.interact.frontends.base import BaseFrontend
+from endplay.types.deal import Deal
 from endplay.types.denom import Denom
 from endplay.types.player import Player
 from endplay.types.vul import Vul
 
-g_cmdobj = CommandObject(None)
 script_dir = os.path.dirname(os.path.realpath(__file__))
 
 
+class AnalysisCache:
+    """
+    Cache of the double dummy analysis of the states a deal has been in, so that
+    returning to a state (e.g. with undo or redo) does not solve it again. The
+    analysis is computed on a background thread, and the least recently used
+    results are discarded once there are more than `maxsize`.
+
+    :param maxsize: The maximum number of results to keep
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._results: OrderedDict[tuple, Future] = OrderedDict()
+        # A single worker, as the DDS library manages its own threads
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="endplay-dds"
+        )
+        # Solves the positions which are likely to be reached next in advance
+        self.session = AnalysisSession()
+
+    def get(self, key: tuple, fn: Callable[[Deal], Any], deal: Deal) -> Future:
+        """
+        Return a future for the result of `fn(deal)`, starting the calculation
+        in the background if `key` has not been seen before
+        """
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+            # The deal is copied as the caller may go on to modify it
+            future = self._executor.submit(fn, deal.copy())
+            self._results[key] = future
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+            return future
+
+    def solutions(self, deal: Deal) -> Future:
+        "Future for the number of tricks taken by each legal card to play"
+        key = ("solutions", deal.to_pbn(), deal.first, deal.trump, *deal.curtrick)
+        return self.get(key, partial(_solutions, self.session), deal)
+
+    def ddtable(self, deal: Deal) -> Future:
+        "Future for the double dummy table of the remaining cards"
+        return self.get(
+            ("ddtable", deal.to_pbn()), partial(_ddtable, self.session), deal
+        )
+
+    def shutdown(self) -> None:
+        "Stop the background thread, abandoning any calculations not yet started"
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+def _solutions(session: AnalysisSession, deal: Deal) -> Optional[list[dict[str, Any]]]:
+    try:
+        s = session.solve(deal)
+    except Exception:
+        return None
+    return [{"suit": c.suit.name, "rank": c.rank.abbr, "tricks": t} for c, t in s]
+
+
+def _ddtable(
+    session: AnalysisSession, deal: Deal
+) -> Optional[dict[str, dict[str, int]]]:
+    if len(deal[Player.north]) == 0:
+        return None
+    try:
+        t = session.dd_table(deal)
+    except Exception:
+        return None
+    return {
+        player.name: {denom.name: t[player, denom] for denom in Denom}
+        for player in Player
+    }
+
+
+class EndplayHTTPServer(ThreadingHTTPServer):
+    """
+    Server which handles each request on its own thread. The command object is
+    shared between all the clients, so `lock` must be held while using it.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], cmdobj: CommandObject):
+        super().__init__(address, EndplayServer)
+        self.cmdobj = cmdobj
+        self.lock = threading.Lock()
+        self.analysis = AnalysisCache()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.analysis.shutdown()
+
+
 class HTMLFrontend(BaseFrontend):
     def __init__(self, cmdobj: CommandObject):
-        global g_cmdobj
-        g_cmdobj = cmdobj
-
         self.host = "localhost"
         self.port = 4928
 
-        self.server = HTTPServer((self.host, self.port), EndplayServer)
+        self.server = EndplayHTTPServer((self.host, self.port), cmdobj)
 
     def interact(self):
         addr = f"http://{self.host}:{self.port}"
@@ -45,6 +142,8 @@ class HTMLFrontend(BaseFrontend):
 
 
 class EndplayServer(BaseHTTPRequestHandler):
+    server: EndplayHTTPServer
+
     def write(self, s: Union[str, dict]):
         if isinstance(s, str):
             self.wfile.write(s.encode("utf-8"))
@@ -64,6 +163,8 @@ class EndplayServer(BaseHTTPRequestHandler):
     def do_POST(self):
         if self.path == "/command":
             self.post_command()
+        elif self.path == "/analysis":
+            self.post_analysis()
         else:
             self.get_notfound()
 
@@ -107,79 +208,78 @@ class EndplayServer(BaseHTTPRequestHandler):
             self.send_header("Content-Type", "application/json")
             self.end_headers()
             self.write({"error": "request body is empty"})
-
-        try:
-            output = g_cmdobj.dispatch(shlex.split(cmd))
-        except Exception as e:
-            self.send_response(500)
-            self.end_headers()
-            self.write({"error": str(e)})
             return
 
-        history = [""] + [a.name for a in g_cmdobj.history]
-        history.extend(a.name for a in reversed(g_cmdobj.future))
-        history_idx = len(g_cmdobj.history)
-        try:
-            s = solve_board(g_cmdobj.deal)
-            solutions = [
-                {"suit": c.suit.name, "rank": c.rank.abbr, "tricks": t} for c, t in s
-            ]
-        except Exception:
-            solutions = None
-
-        table: Optional[dict[str, dict[str, int]]]
-        try:
-            if len(g_cmdobj.deal[Player.north]) == 0:
-                raise RuntimeError
-            t = calc_dd_table(g_cmdobj.deal)
-            table = {}
-            for player in Player:
-                table[player.name] = {}
-                for denom in Denom:
-                    table[player.name][denom.name] = t[player, denom]
-        except Exception:
-            table = None
-
-        hcp = {
-            player.name: CommandObject.cmd_hcp(g_cmdobj, player) for player in Player
-        }
+        cmdobj = self.server.cmdobj
+        with self.server.lock:
+            try:
+                output = cmdobj.dispatch(shlex.split(cmd))
+            except Exception as e:
+                self.send_response(500)
+                self.end_headers()
+                self.write({"error": str(e)})
+                return
+            state = self.state(cmdobj)
 
         self.send_response(200)
         self.send_header("Content-Type", "application/json")
         self.end_headers()
-        self.write(
-            {
-                "deal": {
-                    "north": g_cmdobj.deal.north.to_pbn(),
-                    "east": g_cmdobj.deal.east.to_pbn(),
-                    "south": g_cmdobj.deal.south.to_pbn(),
-                    "west": g_cmdobj.deal.west.to_pbn(),
-                    "first": g_cmdobj.deal.first.name,
-                    "trump": g_cmdobj.deal.trump.name,
-                    "board_no": g_cmdobj.board,
-                    "vul": Vul.from_board(g_cmdobj.board).abbr,
-                    "dealer": Player.from_board(g_cmdobj.board).abbr,
-                    "curtrick": {
-                        player.name: {"suit": c.suit.name, "rank": c.rank.abbr}
-                        for player, c in zip(
-                            Player.iter_from(g_cmdobj.deal.first),
-                            g_cmdobj.deal.curtrick,
-                        )
-                    },
-                    "onlead": g_cmdobj.deal.curplayer.name,
-                    "legal_moves": [
-                        {"suit": c.suit.name, "rank": c.rank.abbr}
-                        for c in g_cmdobj.deal.legal_moves()
-                    ],
+        self.write({"output": output, **state})
+
+    def post_analysis(self):
+        "Return the analysis of the current state, once it has been calculated"
+        with self.server.lock:
+            state = self.state(self.server.cmdobj)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.write(state)
+
+    def state(self, cmdobj: CommandObject) -> dict[str, Any]:
+        """
+        The current state of the deal and any analysis of it which is available,
+        `pending` being true if the analysis is still being calculated
+        """
+        deal = cmdobj.deal
+        history = [""] + [a.name for a in cmdobj.history]
+        history.extend(a.name for a in reversed(cmdobj.future))
+        history_idx = len(cmdobj.history)
+
+        solutions = self.server.analysis.solutions(deal)
+        table = self.server.analysis.ddtable(deal)
+        pending = not (solutions.done() and table.done())
+
+        hcp = {player.name: CommandObject.cmd_hcp(cmdobj, player) for player in Player}
+
+        return {
+            "deal": {
+                "north": deal.north.to_pbn(),
+                "east": deal.east.to_pbn(),
+                "south": deal.south.to_pbn(),
+                "west": deal.west.to_pbn(),
+                "first": deal.first.name,
+                "trump": deal.trump.name,
+                "board_no": cmdobj.board,
+                "vul": Vul.from_board(cmdobj.board).abbr,
+                "dealer": Player.from_board(cmdobj.board).abbr,
+                "curtrick": {
+                    player.name: {"suit": c.suit.name, "rank": c.rank.abbr}
+                    for player, c in zip(Player.iter_from(deal.first), deal.curtrick)
                 },
-                "output": output,
-                "history": history,
-                "history_idx": history_idx,
-                "solutions": solutions,
-                "ddtable": table,
-                "hcp": hcp,
-            }
-        )
+                "onlead": deal.curplayer.name,
+                "legal_moves": [
+                    {"suit": c.suit.name, "rank": c.rank.abbr}
+                    for c in deal.legal_moves()
+                ],
+            },
+            "history": history,
+            "history_idx": history_idx,
+            "solutions": solutions.result() if solutions.done() else None,
+            "ddtable": table.result() if table.done() else None,
+            "pending": pending,
+            "hcp": hcp,
+        }
 
     def get_notfound(self):
         self.send_response(404)
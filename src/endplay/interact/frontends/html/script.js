@@ -87,7 +87,8 @@ function update({
     history,
     history_idx,
     ddtable,
-    solutions
+    solutions,
+    pending
 }) {
     for (const player of players) {
         // update hand
@@ -160,9 +161,11 @@ function update({
     active.classList.add("active");
     active.scrollIntoView();
 
-    // update output
-    e.sidebar.output.classList.remove("error");
-    e.sidebar.output.innerText = output || "No message";
+    // update output, which is not sent when polling for the analysis
+    if (output !== undefined) {
+        e.sidebar.output.classList.remove("error");
+        e.sidebar.output.innerText = output || "No message";
+    }
 
     // update dd table
     if (ddtable) {
@@ -191,6 +194,25 @@ function update({
             e.solutions.appendChild(n);
         }
     }
+
+    // the analysis is calculated in the background, so poll until it is ready
+    clearTimeout(pollTimer);
+    if (pending)
+        pollTimer = setTimeout(poll, 250);
+}
+
+let pollTimer = null;
+
+async function poll() {
+    try {
+        const response = await fetch("/analysis", {
+            method: "POST"
+        });
+        if (response.ok)
+            update(await response.json());
+    } catch (e) {
+        // the next command will poll again
+    }
 }
 
 function displayError({
@@ -0,0 +1,208 @@
+"""
+Reader and writer for columnar board files, which store a list of boards as
+one NumPy array per attribute for fast loading into analytics tools.
+
+The columns are stored either in a single ``.npz`` archive or in a directory
+containing one ``.npy`` file per column. Columns in an archive are only read
+when they are accessed, and columns in a directory can also be memory-mapped.
+Each board occupies one row of every column, with the following encodings:
+
+* ``deal``: The hand of each player as a packed bitmask (see :attr:`Hand.mask`),
+  with shape (n, 4) in the order north, east, south, west
+* ``board_num``, ``dealer``, ``vul``: The board number, and the :class:`Player`
+  and :class:`Vul` values of the dealer and vulnerability
+* ``level``, ``denom``, ``declarer``, ``penalty``, ``result``: The fields of the
+  contract, using the :class:`Denom`, :class:`Player` and :class:`Penalty` values.
+  A level of 0 is a passout
+* ``dd_table``: If provided, the double dummy table with shape (n, 5, 4) indexed
+  by denomination and then player as in :meth:`DDTable.to_list`
+* ``par``: If provided, the par score as given by :attr:`ParList.score`
+
+Missing values (for example the contract of a board which was not played)
+are stored as -1. As -1 is also a valid ``result`` (down one), a missing
+result is stored as -128 instead, the minimum value of its dtype; whether a
+board has a contract should be decided by ``level``, which is -1 if it does not.
+"""
+
+from __future__ import annotations
+
+__all__ = ["dump", "load", "iterboards"]
+
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import IO, Any, Optional, Union
+
+import numpy as np
+
+from endplay.dds.ddtable import DDTable
+from endplay.dds.parscore import ParList
+from endplay.types import Board, Contract, Deal, Denom, Penalty, Player, Vul
+
+_dtypes = {
+    "deal": np.uint64,
+    "board_num": np.int32,
+    "dealer": np.int8,
+    "vul": np.int8,
+    "level": np.int8,
+    "denom": np.int8,
+    "declarer": np.int8,
+    "penalty": np.int8,
+    "result": np.int8,
+    "dd_table": np.int8,
+    "par": np.int32,
+}
+
+# Stored as the result of boards without a contract
+_no_result = np.iinfo(np.int8).min
+
+
+def dump(
+    boards: Iterable[Board],
+    file: Union[str, os.PathLike, IO[bytes]],
+    *,
+    dd_tables: Optional[Iterable[DDTable]] = None,
+    par: Optional[Iterable[Union[ParList, int]]] = None,
+    compressed: bool = False,
+) -> None:
+    """
+    Write boards to a columnar file
+
+    :param boards: The boards to write
+    :param file: A path ending in ``.npz`` or a binary file object to write a
+            single archive to, or otherwise the path of a directory to write one
+            ``.npy`` file per column to
+    :param dd_tables: The double dummy table of each board, as returned by
+            :func:`endplay.dds.calc_all_tables`
+    :param par: The par result or par score of each board
+    :param compressed: If True, compress the columns of a ``.npz`` archive
+    """
+    boards = list(boards)
+    columns: dict[str, list] = {
+        name: [] for name in _dtypes if name not in ("dd_table", "par")
+    }
+    for board in boards:
+        columns["deal"].append([hand.mask for _, hand in board.deal])
+        columns["board_num"].append(_encode(board.board_num))
+        columns["dealer"].append(_encode(board.dealer))
+        columns["vul"].append(_encode(board.vul))
+        contract = board.contract
+        if contract is None:
+            fields = [-1, -1, -1, -1, _no_result]
+        else:
+            fields = [
+                contract.level,
+                contract.denom,
+                contract.declarer,
+                contract.penalty,
+                contract.result,
+            ]
+        for name, field in zip(
+            ("level", "denom", "declarer", "penalty", "result"), fields
+        ):
+            columns[name].append(field)
+    if dd_tables is not None:
+        columns["dd_table"] = [table.to_list() for table in dd_tables]
+    if par is not None:
+        columns["par"] = [p.score if isinstance(p, ParList) else p for p in par]
+
+    arrays: dict[str, Any] = {}
+    for name, values in columns.items():
+        if len(values) != len(boards):
+            raise ValueError(
+                f"Expected {len(boards)} values for {name}, got {len(values)}"
+            )
+        arrays[name] = np.array(values, dtype=_dtypes[name])
+        if name == "deal":
+            arrays[name] = arrays[name].reshape(len(boards), 4)
+        elif name == "dd_table":
+            arrays[name] = arrays[name].reshape(len(boards), 5, 4)
+
+    if _is_archive(file):
+        if compressed:
+            np.savez_compressed(file, **arrays)
+        else:
+            np.savez(file, **arrays)
+    else:
+        path = Path(file)  # type: ignore[arg-type]
+        path.mkdir(parents=True, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(path / f"{name}.npy", array)
+
+
+def load(
+    file: Union[str, os.PathLike, IO[bytes]],
+    columns: Optional[Iterable[str]] = None,
+    *,
+    mmap: bool = True,
+) -> dict[str, np.ndarray]:
+    """
+    Read the columns of a columnar file into a dictionary of arrays, without
+    constructing any :class:`Board` objects
+
+    :param file: The ``.npz`` archive or directory written by :func:`dump`
+    :param columns: The names of the columns to read. If None, all the columns
+            in the file are read
+    :param mmap: If True, the columns of a directory are memory-mapped rather
+            than read into memory. This has no effect on ``.npz`` archives
+    """
+    if _is_archive(file):
+        with np.load(file) as npz:
+            names = list(npz.files if columns is None else columns)
+            return {name: npz[name] for name in names}
+    path = Path(file)  # type: ignore[arg-type]
+    if columns is None:
+        names = [p.stem for p in sorted(path.glob("*.npy"))]
+    else:
+        names = list(columns)
+    return {
+        name: np.load(path / f"{name}.npy", mmap_mode="r" if mmap else None)
+        for name in names
+    }
+
+
+def iterboards(data: Mapping[str, np.ndarray]) -> Iterator[Board]:
+    """
+    Construct a :class:`Board` from each row of the columns returned by :func:`load`.
+    The ``deal`` column must be present, and any other missing columns are left unset
+    """
+    deals = data["deal"]
+    for i in range(len(deals)):
+        deal = Deal()
+        for player, mask in zip(Player, deals[i]):
+            deal.add_mask(player, int(mask))
+        level = _decode(data, "level", i, int)
+        if level is None:
+            contract = None
+        else:
+            contract = Contract(
+                level=level,
+                denom=Denom(int(data["denom"][i])),
+                declarer=Player(int(data["declarer"][i])),
+                penalty=Penalty(int(data["penalty"][i])),
+                result=int(data["result"][i]),
+            )
+        yield Board(
+            deal,
+            board_num=_decode(data, "board_num", i, int),
+            dealer=_decode(data, "dealer", i, Player),
+            vul=_decode(data, "vul", i, Vul),
+            contract=contract,
+        )
+
+
+def _is_archive(file: Union[str, os.PathLike, IO[bytes]]) -> bool:
+    "Whether a file should be read or written as a single .npz archive"
+    if isinstance(file, (str, os.PathLike)):
+        return os.fspath(file).endswith(".npz")
+    return True
+
+
+def _encode(value: Optional[int]) -> int:
+    return -1 if value is None else value
+
+
+def _decode(data: Mapping[str, np.ndarray], name: str, i: int, cls: type):
+    if name not in data or data[name][i] == -1:
+        return None
+    return cls(int(data[name][i]))
@@ -2,16 +2,24 @@
 Parser for Dealer scripts
 """
 
+from __future__ import annotations
+
 __all__ = ["DealerParser", "ParseException"]
 
+from functools import lru_cache
 from typing import Optional, TextIO
 
-import pyparsing as pp
-
 from endplay.types import Contract, Deal, Denom, Hand, Player, Vul
 
-pp.ParserElement.enable_packrat()
-ParseException = pp.ParseException
+
+# pyparsing is only imported when a parser is first constructed, as it is
+# relatively slow to import and not needed by most users of endplay.dealer
+def __getattr__(name: str):
+    if name == "ParseException":
+        import pyparsing as pp
+
+        return pp.ParseException
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 
 class Node:
@@ -147,6 +155,8 @@ class Node:
 
     @staticmethod
     def from_action(string, location, tokens):
+        import pyparsing as pp
+
         node = Node(tokens[0], Node.ACTION)
         for arg in tokens[1:]:
             if isinstance(arg, pp.ParseResults):
@@ -158,8 +168,8 @@ class Node:
 
     @staticmethod
     def from_contract(string, location, tokens):
-        level = tokens[1]
-        denom = tokens[2]
+        level = int(tokens[1])
+        denom = Denom.find(tokens[2])
         contract = Contract(level=level, denom=denom)
         return Node(contract, Node.VALUE)
 
@@ -226,6 +236,8 @@ class Node:
 
 
 def new_func(name, *args):
+    import pyparsing as pp
+
     if isinstance(name, str):
         name = pp.CaselessKeyword(name)
     name -= pp.Suppress("(")
@@ -238,259 +250,290 @@ def new_func(name, *args):
     return name
 
 
+@lru_cache(maxsize=None)
+def _build_grammar():
+    """
+    Build the grammars for dealer scripts and for single expressions. This is
+    slow, so it is only done once and the result is shared by all parsers
+    """
+    import pyparsing as pp
+
+    pp.ParserElement.enable_packrat()
+    # Initialise most of the value types
+    ppc = pp.pyparsing_common
+    number = ppc.number
+    number.set_parse_action(Node.from_number)
+    newline = pp.Keyword("\\n")
+    newline.set_parse_action(Node.from_nl)
+    string = pp.dblQuotedString
+    string.set_parse_action(Node.from_string)
+    compass = pp.oneOf("north south east west", caseless=True, asKeyword=True)
+    compass.set_parse_action(Node.from_compass)
+    suit = (
+        pp.Regex(r"spades?")
+        | pp.Regex(r"hearts?")
+        | pp.Regex(r"diamonds?")
+        | pp.Regex(r"clubs?")
+    )
+    suit.set_parse_action(Node.from_denom)
+    strain = (
+        pp.Regex(r"notrumps?")
+        | pp.Regex(r"spades?")
+        | pp.Regex(r"hearts?")
+        | pp.Regex(r"diamonds?")
+        | pp.Regex(r"clubs?")
+    )
+    strain.set_parse_action(Node.from_denom)
+    vul = pp.oneOf("none ns ew all", caseless=True, asKeyword=True)
+    vul.set_parse_action(Node.from_vul)
+    card_suit = pp.oneOf("s h d c", caseless=True)
+    card_rank = pp.Word("AKQJTakqjt98765432")
+    card = pp.Word("AKQJTakqjt98765432") + pp.Word("SHDCshdc")
+    card.set_parse_action(Node.from_card)
+    suitholding = pp.Group(card_suit + pp.OneOrMore(card_rank))
+    hand = pp.delimitedList(suitholding)
+    hand.set_parse_action(Node.from_hand)
+    pattern = pp.Word("0123456789xX", exact=4)
+    pattern.set_parse_action(Node.from_pattern)
+    shapelist = pp.infixNotation(
+        pattern,
+        [
+            (pp.oneOf("any"), 1, pp.opAssoc.RIGHT, Node.from_shape_any),
+            (pp.oneOf("+ -"), 2, pp.opAssoc.LEFT, Node.from_shape_combine),
+        ],
+    )
+    contract = pp.Literal("x") + pp.oneOf("1 2 3 4 5 6 7") + pp.oneOf("N S H D C")
+    contract.set_parse_action(Node.from_contract)
+
+    # Expressions, defined below but needed as function arguments
+    expr = pp.Forward()
+
+    # Functions in expressions. This does function name checking at parse time, which in my
+    # first attempt at implementing this was the only way to make the grammar unambiguous.
+    # This should probably be replaced with something simpler.
+    shape = new_func("shape", compass, shapelist)
+    hascard = new_func("hascard", compass, card)
+    suitlength = new_func(
+        pp.Regex(r"spades?")
+        | pp.Regex(r"hearts?")
+        | pp.Regex(r"diamonds?")
+        | pp.Regex(r"clubs?"),
+        compass,
+    )
+    hcp = new_func(pp.Regex("hcps?"), compass, suit) | new_func(
+        pp.Regex("hcps?"), compass
+    )
+    ptN = new_func(pp.Regex("pt[0-9]"), compass) | new_func(
+        pp.Regex("pt[0-9]"), compass, suit
+    )
+    for name in [
+        "tens",
+        pp.Regex("jacks?"),
+        pp.Regex("queens?"),
+        pp.Regex("kings?"),
+        pp.Regex("aces?"),
+        "top2",
+        "top3",
+        "top4",
+        "top5",
+        "c13",
+    ]:
+        ptN |= new_func(name, compass) | new_func(name, compass, suit)
+    control = new_func(pp.Regex("controls?"), compass) | new_func(
+        pp.Regex("controls?"), compass, suit
+    )
+    loser = new_func(pp.Regex("losers?"), compass) | new_func(
+        pp.Regex("losers?"), compass, suit
+    )
+    quality = new_func("cccc", compass) | new_func("quality", compass, suit)
+    trick = new_func(pp.Regex("tricks?"), compass, strain)
+    score = new_func("score", vul, contract, expr)
+    imp = new_func(pp.Regex("imps?"), expr)
+    func = (
+        shape
+        | hascard
+        | suitlength
+        | hcp
+        | ptN
+        | control
+        | loser
+        | quality
+        | trick
+        | score
+        | imp
+    )
+
+    # Expressions (for conditions and variable definitions)
+    symbol = pp.Regex(
+        r"(?!(printall)|(print)|(printew)|(printpbn)|(printcompact)|(printes)|"
+        + r"(printoneline)|(average)|(frequency))[a-zA-Z0-9_-]+"
+    )
+    symbol.set_parse_action(Node.from_symbol)
+    unary1 = pp.oneOf("! not")
+    bin1 = pp.oneOf("* / %")
+    bin2 = pp.oneOf("+ -")
+    bin3 = pp.oneOf("<= < >= >")
+    bin4 = pp.oneOf("== !=")
+    bin5 = pp.oneOf("&& and")
+    bin6 = pp.oneOf("|| or")
+    ternary = ("?", ":")
+    operator = pp.infixNotation(
+        func | number | symbol,
+        [
+            (unary1, 1, pp.opAssoc.RIGHT, Node.from_unaryop),
+            (bin1, 2, pp.opAssoc.LEFT, Node.from_binaryop),
+            (bin2, 2, pp.opAssoc.LEFT, Node.from_binaryop),
+            (bin3, 2, pp.opAssoc.LEFT, Node.from_binaryop),
+            (bin4, 2, pp.opAssoc.LEFT, Node.from_binaryop),
+            (bin5, 2, pp.opAssoc.LEFT, Node.from_binaryop),
+            (bin6, 2, pp.opAssoc.LEFT, Node.from_binaryop),
+            (ternary, 3, pp.opAssoc.RIGHT, Node.from_ternaryop),
+        ],
+    )
+    expr <<= operator
+
+    # Actions
+    printall = pp.CaselessKeyword("printall")
+    printall.set_parse_action(Node.from_action)
+    print_compass = (
+        pp.CaselessKeyword("print")
+        + pp.Suppress("(")
+        - pp.Group(pp.delimitedList(compass))
+        + pp.Suppress(")")
+    )
+    print_compass.set_parse_action(Node.from_action)
+    printew = pp.CaselessKeyword("printew")
+    printew.set_parse_action(Node.from_action)
+    printpbn = pp.CaselessKeyword("printpbn")
+    printpbn.set_parse_action(Node.from_action)
+    printcompact = pp.CaselessKeyword("printcompact") + pp.Optional(expr)
+    printcompact.set_parse_action(Node.from_action)
+    printoneline = pp.CaselessKeyword("printoneline") + pp.Optional(expr)
+    printoneline.set_parse_action(Node.from_action)
+    printes = pp.CaselessKeyword("printes") + pp.delimitedList(string | expr | newline)
+    printes.set_parse_action(Node.from_action)
+    average = pp.CaselessKeyword("average") + pp.Optional(string) + expr
+    average.set_parse_action(Node.from_action)
+    frequency = (
+        pp.CaselessKeyword("frequency")
+        + pp.Optional(string)
+        + pp.Suppress("(")
+        + expr
+        + pp.Suppress(",")
+        + ppc.number
+        + pp.Suppress(",")
+        + ppc.number
+        + pp.Suppress(")")
+    )
+    frequency.set_parse_action(Node.from_action)
+    frequency2 = (
+        pp.CaselessKeyword("frequency")
+        + pp.Optional(string)
+        + pp.Suppress("(")
+        + expr
+        + pp.Suppress(",")
+        + ppc.number
+        + pp.Suppress(",")
+        + ppc.number
+        + pp.Suppress(",")
+        + expr
+        + pp.Suppress(",")
+        + ppc.number
+        + pp.Suppress(",")
+        + ppc.number
+        + pp.Suppress(")")
+    )
+    frequency2.set_parse_action(Node.from_action)
+
+    # Inputs
+    generate = pp.CaselessKeyword("generate") + ppc.number
+    generate.set_parse_action(Node.from_input)
+    produce = pp.CaselessKeyword("produce") + ppc.number
+    produce.set_parse_action(Node.from_input)
+    vulnerable = pp.CaselessKeyword("vulnerable") + vul
+    vulnerable.set_parse_action(Node.from_input)
+    dealer = pp.CaselessKeyword("dealer") + compass
+    dealer.set_parse_action(Node.from_input)
+    predeal = pp.CaselessKeyword("predeal") + pp.OneOrMore(compass + hand)
+    predeal.set_parse_action(Node.from_predeal)
+    pointcount = pp.CaselessKeyword("pointcount") + pp.delimitedList(ppc.number)
+    pointcount.set_parse_action(Node.from_input)
+    altcount = (
+        pp.CaselessKeyword("altcount") + ppc.number + pp.delimitedList(ppc.number)
+    )
+    altcount.set_parse_action(Node.from_input)
+    condition = pp.CaselessKeyword("condition") + expr
+    condition.set_parse_action(Node.from_input)
+    action = pp.CaselessKeyword("action") + pp.delimitedList(
+        printall
+        | print_compass
+        | printew
+        | printpbn
+        | printcompact
+        | printoneline
+        | printes
+        | average
+        | frequency
+        | frequency2
+    )
+    action.set_parse_action(Node.from_input)
+    variable = ppc.identifier + pp.Literal("=") + expr
+    variable.set_parse_action(Node.from_variable)
+
+    # Combine into the grammar for the whole file
+    grammar = pp.ZeroOrMore(
+        generate
+        | produce
+        | vulnerable
+        | dealer
+        | predeal
+        | pointcount
+        | altcount
+        | condition
+        | action
+        | variable
+    )
+    grammar.ignore(pp.cppStyleComment)
+    # Note: from the docs I gather that we should only support #comment style
+    # if the hash is at the beginning of the line, so this ignore statement
+    # should be:
+    #   grammar.ignore(pp.LineStart() + pp.pythonStyleComment)
+    # but the test case fails, and as hashtags can't legally (probably?) appear
+    # anywhere else I don't think it will break anything to be looser with the
+    # requirements
+    grammar.ignore(pp.pythonStyleComment)
+
+    return grammar, expr
+
+
+# Syntax trees are cached by their source text, so that constraints which are
+# used repeatedly (e.g. by calling generate_deal in a loop) are only parsed once
+@lru_cache(maxsize=256)
+def _parse_expr(s: str) -> Node:
+    _, expr = _build_grammar()
+    res = expr.parse_string(s, parseAll=True)[0]
+    assert isinstance(res, Node)
+    return res
+
+
+@lru_cache(maxsize=64)
+def _parse_string(s: str) -> Node:
+    grammar, _ = _build_grammar()
+    root = Node("root", Node.ROOT)
+    for action in grammar.parse_string(s, parseAll=True):
+        root.append_child(action)
+    return root
+
+
 class DealerParser:
-    def __init__(self):
-        # Initialise most of the value types
-        ppc = pp.pyparsing_common
-        number = ppc.number
-        number.set_parse_action(Node.from_number)
-        newline = pp.Keyword("\\n")
-        newline.set_parse_action(Node.from_nl)
-        string = pp.dblQuotedString
-        string.set_parse_action(Node.from_string)
-        compass = pp.oneOf("north south east west", caseless=True, asKeyword=True)
-        compass.set_parse_action(Node.from_compass)
-        suit = (
-            pp.Regex(r"spades?")
-            | pp.Regex(r"hearts?")
-            | pp.Regex(r"diamonds?")
-            | pp.Regex(r"clubs?")
-        )
-        suit.set_parse_action(Node.from_denom)
-        strain = (
-            pp.Regex(r"notrumps?")
-            | pp.Regex(r"spades?")
-            | pp.Regex(r"hearts?")
-            | pp.Regex(r"diamonds?")
-            | pp.Regex(r"clubs?")
-        )
-        strain.set_parse_action(Node.from_denom)
-        vul = pp.oneOf("none ns ew all", caseless=True, asKeyword=True)
-        vul.set_parse_action(Node.from_vul)
-        card_suit = pp.oneOf("s h d c", caseless=True)
-        card_rank = pp.Word("AKQJTakqjt98765432")
-        card = pp.Word("AKQJTakqjt98765432") + pp.Word("SHDCshdc")
-        card.set_parse_action(Node.from_card)
-        suitholding = pp.Group(card_suit + pp.OneOrMore(card_rank))
-        hand = pp.delimitedList(suitholding)
-        hand.set_parse_action(Node.from_hand)
-        pattern = pp.Word("0123456789xX", exact=4)
-        pattern.set_parse_action(Node.from_pattern)
-        shapelist = pp.infixNotation(
-            pattern,
-            [
-                (pp.oneOf("any"), 1, pp.opAssoc.RIGHT, Node.from_shape_any),
-                (pp.oneOf("+ -"), 2, pp.opAssoc.LEFT, Node.from_shape_combine),
-            ],
-        )
-        contract = pp.Literal("x") + pp.oneOf("1 2 3 4 5 6 7") + pp.oneOf("N S H D C")
-        contract.set_parse_action(Node.from_contract)
-
-        # Functions in expressions. This does function name checking at parse time, which in my
-        # first attempt at implementing this was the only way to make the grammar unambiguous.
-        # This should probably be replaced with something simpler.
-        shape = new_func("shape", compass, shapelist)
-        hascard = new_func("hascard", compass, card)
-        suitlength = new_func(
-            pp.Regex(r"spades?")
-            | pp.Regex(r"hearts?")
-            | pp.Regex(r"diamonds?")
-            | pp.Regex(r"clubs?"),
-            compass,
-        )
-        hcp = new_func(pp.Regex("hcps?"), compass, suit) | new_func(
-            pp.Regex("hcps?"), compass
-        )
-        ptN = new_func(pp.Regex("pt[0-9]"), compass) | new_func(
-            pp.Regex("pt[0-9]"), compass, suit
-        )
-        for name in [
-            "tens",
-            pp.Regex("jacks?"),
-            pp.Regex("queens?"),
-            pp.Regex("kings?"),
-            pp.Regex("aces?"),
-            "top2",
-            "top3",
-            "top4",
-            "top5",
-            "c13",
-        ]:
-            ptN |= new_func(name, compass) | new_func(name, compass, suit)
-        control = new_func(pp.Regex("controls?"), compass) | new_func(
-            pp.Regex("controls?"), compass, suit
-        )
-        loser = new_func(pp.Regex("losers?"), compass) | new_func(
-            pp.Regex("losers?"), compass, suit
-        )
-        quality = new_func("cccc", compass) | new_func("quality", compass, suit)
-        trick = new_func(pp.Regex("tricks?"), compass, strain)
-        score = new_func("score", vul, contract, ppc.integer)
-        imp = new_func(pp.Regex("imps?"), ppc.integer)
-        func = (
-            shape
-            | hascard
-            | suitlength
-            | hcp
-            | ptN
-            | control
-            | loser
-            | quality
-            | trick
-            | score
-            | imp
-        )
+    """
+    Parser for dealer scripts and expressions. All parsers share a single grammar,
+    which is built when the first parser is constructed. The results of parsing are
+    cached, so the returned syntax trees should not be modified
+    """
 
-        # Expressions (for conditions and variable definitions)
-        expr = pp.Forward()
-        symbol = pp.Regex(
-            r"(?!(printall)|(print)|(printew)|(printpbn)|(printcompact)|(printes)|"
-            + r"(printoneline)|(average)|(frequency))[a-zA-Z0-9_-]+"
-        )
-        symbol.set_parse_action(Node.from_symbol)
-        unary1 = pp.oneOf("! not")
-        bin1 = pp.oneOf("* / %")
-        bin2 = pp.oneOf("+ -")
-        bin3 = pp.oneOf("<= < >= >")
-        bin4 = pp.oneOf("== !=")
-        bin5 = pp.oneOf("&& and")
-        bin6 = pp.oneOf("|| or")
-        ternary = ("?", ":")
-        operator = pp.infixNotation(
-            func | number | symbol,
-            [
-                (unary1, 1, pp.opAssoc.RIGHT, Node.from_unaryop),
-                (bin1, 2, pp.opAssoc.LEFT, Node.from_binaryop),
-                (bin2, 2, pp.opAssoc.LEFT, Node.from_binaryop),
-                (bin3, 2, pp.opAssoc.LEFT, Node.from_binaryop),
-                (bin4, 2, pp.opAssoc.LEFT, Node.from_binaryop),
-                (bin5, 2, pp.opAssoc.LEFT, Node.from_binaryop),
-                (bin6, 2, pp.opAssoc.LEFT, Node.from_binaryop),
-                (ternary, 3, pp.opAssoc.RIGHT, Node.from_ternaryop),
-            ],
-        )
-        expr <<= operator
-
-        # Actions
-        printall = pp.CaselessKeyword("printall")
-        printall.set_parse_action(Node.from_action)
-        print_compass = (
-            pp.CaselessKeyword("print")
-            + pp.Suppress("(")
-            - pp.Group(pp.delimitedList(compass))
-            + pp.Suppress(")")
-        )
-        print_compass.set_parse_action(Node.from_action)
-        printew = pp.CaselessKeyword("printew")
-        printew.set_parse_action(Node.from_action)
-        printpbn = pp.CaselessKeyword("printpbn")
-        printpbn.set_parse_action(Node.from_action)
-        printcompact = pp.CaselessKeyword("printcompact") + pp.Optional(expr)
-        printcompact.set_parse_action(Node.from_action)
-        printoneline = pp.CaselessKeyword("printoneline") + pp.Optional(expr)
-        printoneline.set_parse_action(Node.from_action)
-        printes = pp.CaselessKeyword("printes") + pp.delimitedList(
-            string | expr | newline
-        )
-        printes.set_parse_action(Node.from_action)
-        average = pp.CaselessKeyword("average") + pp.Optional(string) + expr
-        average.set_parse_action(Node.from_action)
-        frequency = (
-            pp.CaselessKeyword("frequency")
-            + pp.Optional(string)
-            + pp.Suppress("(")
-            + expr
-            + pp.Suppress(",")
-            + ppc.number
-            + pp.Suppress(",")
-            + ppc.number
-            + pp.Suppress(")")
-        )
-        frequency.set_parse_action(Node.from_action)
-        frequency2 = (
-            pp.CaselessKeyword("frequency")
-            + pp.Optional(string)
-            + pp.Suppress("(")
-            + expr
-            + pp.Suppress(",")
-            + ppc.number
-            + pp.Suppress(",")
-            + ppc.number
-            + pp.Suppress(",")
-            + expr
-            + pp.Suppress(",")
-            + ppc.number
-            + pp.Suppress(",")
-            + ppc.number
-            + pp.Suppress(")")
-        )
-        frequency2.set_parse_action(Node.from_action)
-
-        # Inputs
-        generate = pp.CaselessKeyword("generate") + ppc.number
-        generate.set_parse_action(Node.from_input)
-        produce = pp.CaselessKeyword("produce") + ppc.number
-        produce.set_parse_action(Node.from_input)
-        vulnerable = pp.CaselessKeyword("vulnerable") + vul
-        vulnerable.set_parse_action(Node.from_input)
-        dealer = pp.CaselessKeyword("dealer") + compass
-        dealer.set_parse_action(Node.from_input)
-        predeal = pp.CaselessKeyword("predeal") + pp.OneOrMore(compass + hand)
-        predeal.set_parse_action(Node.from_predeal)
-        pointcount = pp.CaselessKeyword("pointcount") + pp.delimitedList(ppc.number)
-        pointcount.set_parse_action(Node.from_input)
-        altcount = (
-            pp.CaselessKeyword("altcount") + ppc.number + pp.delimitedList(ppc.number)
-        )
-        altcount.set_parse_action(Node.from_input)
-        condition = pp.CaselessKeyword("condition") + expr
-        condition.set_parse_action(Node.from_input)
-        action = pp.CaselessKeyword("action") + pp.delimitedList(
-            printall
-            | print_compass
-            | printew
-            | printpbn
-            | printcompact
-            | printoneline
-            | printes
-            | average
-            | frequency
-            | frequency2
-        )
-        action.set_parse_action(Node.from_input)
-        variable = ppc.identifier + pp.Literal("=") + expr
-        variable.set_parse_action(Node.from_variable)
-
-        # Combine into the grammar for the whole file
-        self.grammar = pp.ZeroOrMore(
-            generate
-            | produce
-            | vulnerable
-            | dealer
-            | predeal
-            | pointcount
-            | altcount
-            | condition
-            | action
-            | variable
-        )
-        self.grammar.ignore(pp.cppStyleComment)
-        # Note: from the docs I gather that we should only support #comment style
-        # if the hash is at the beginning of the line, so this ignore statement
-        # should be:
-        #   self.grammar.ignore(pp.LineStart() + pp.pythonStyleComment)
-        # but the test case fails, and as hashtags can't legally (probably?) appear
-        # anywhere else I don't think it will break anything to be looser with the
-        # requirements
-        self.grammar.ignore(pp.pythonStyleComment)
-
-        self.expr = expr
-
-    def _build_tree(self, parseResults: pp.ParseResults) -> Node:
-        root = Node("root", Node.ROOT)
-        for action in parseResults:
-            root.append_child(action)
-        return root
+    def __init__(self):
+        self.grammar, self.expr = _build_grammar()
 
     def parse_expr(self, s: str) -> Node:
         """
@@ -500,10 +543,7 @@ class DealerParser:
         :param s: The condition string, e.g. "hcp(n) == 10 && shape(s) == 4432"
         :return: The root node of the syntax tree
         """
-        parse_results = self.expr.parse_string(s, parseAll=True)
-        res = parse_results[0]
-        assert isinstance(res, Node)
-        return res
+        return _parse_expr(s)
 
     def parse_file(self, f: TextIO) -> Node:
         """
@@ -512,8 +552,7 @@ class DealerParser:
         :param f: A handle to a file or TextIO stream to be parsed
         :return: The root node of the syntax tree
         """
-        parseResults = self.grammar.parse_file(f, parseAll=True)
-        return self._build_tree(parseResults)
+        return _parse_string(f.read())
 
     def parse_string(self, s: str) -> Node:
         """
@@ -522,5 +561,10 @@ class DealerParser:
         :param s: The string to parse
         :return: The root node of the syntax tree
         """
-        parseResults = self.grammar.parse_string(s, parseAll=True)
-        return self._build_tree(parseResults)
+        return _parse_string(s)
+
+    @staticmethod
+    def cache_clear() -> None:
+        "Clear the cache of parsed expressions and scripts"
+        _parse_expr.cache_clear()
+        _parse_string.cache_clear()
@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
-__all__ = ["JSONEncoder", "JSONDecoder", "dump", "dumps", "load", "loads"]
+__all__ = [
+    "JSONEncoder",
+    "JSONDecoder",
+    "dump",
+    "dumps",
+    "load",
+    "loads",
+    "iterdump",
+    "iterload",
+]
 
 import json as _json
+from collections.abc import Iterable, Iterator
 from enum import IntEnum
 from typing import IO, Any, Callable, Optional, Union
 
+from endplay.config import suppress_unicode
 from endplay.types import (
+    Bid,
     Board,
     Card,
     Contract,
@@ -23,6 +35,7 @@ from endplay.types import (
     SuitHolding,
     Vul,
 )
+from endplay.types.card import _cards
 
 
 def _check_keys(keys: set, mandatory: set, optional: set = set()):
@@ -66,8 +79,7 @@ def _object_hook(d: dict):
             trump=Denom.find(d.get("trump", "nt")),
         )
         for hand in ["north", "south", "east", "west"]:
-            for card in d.get(hand, []):
-                deal[Player.find(hand)].add(card)
+            deal[Player.find(hand)].extend(d.get(hand, []))
         for card in d.get("curtrick", []):
             deal.play(card)
         return deal
@@ -309,3 +321,115 @@ def loads(
         object_pairs_hook=object_pairs_hook,
         **kw,
     )
+
+
+# The JSON Lines format uses a compact schema in which deals are PBN strings
+# and cards, calls and contracts are short strings. A line encoding a deal has
+# the keys "deal" and optionally "first", "trump" and "curtrick", and a line
+# encoding a board adds "auction", "play" and its other attributes to these
+
+_compact_cards = tuple("SHDCN"[card.suit] + card.rank.abbr for card in _cards)
+_penalty_calls = {Penalty.passed: "P", Penalty.doubled: "X", Penalty.redoubled: "XX"}
+_line_encoder = _json.JSONEncoder(separators=(",", ":"), default=JSONEncoder().default)
+
+
+def _compact_deal(deal: Deal) -> dict[str, Any]:
+    res: dict[str, Any] = {"deal": deal.to_pbn()}
+    if deal.first != Player.north:
+        res["first"] = deal.first.abbr
+    if deal.trump != Denom.nt:
+        res["trump"] = deal.trump.name
+    if deal.curtrick:
+        res["curtrick"] = [_compact_cards[card.index] for card in deal.curtrick]
+    return res
+
+
+def _compact_call(bid: Bid) -> str:
+    if isinstance(bid, ContractBid):
+        call = f"{bid.level}{'SHDCN'[bid.denom]}"
+    else:
+        call = _penalty_calls[bid.penalty]  # type: ignore[attr-defined]
+    return call + "!" if bid.alertable else call
+
+
+def _compact_board(board: Board) -> dict[str, Any]:
+    res = _compact_deal(board.deal)
+    res["auction"] = [_compact_call(bid) for bid in board.auction]
+    res["play"] = [_compact_cards[card.index] for card in board.play]
+    announcements = {
+        str(i): bid.announcement
+        for i, bid in enumerate(board.auction)
+        if bid.announcement
+    }
+    if announcements:
+        res["announcements"] = announcements
+    if board.board_num is not None:
+        res["board_num"] = board.board_num
+    if board.vul is not None:
+        res["vul"] = board.vul.name
+    if board.dealer is not None:
+        res["dealer"] = board.dealer.abbr
+    if board.contract is not None:
+        with suppress_unicode():
+            res["contract"] = str(board.contract)
+    if board.claimed:
+        res["claimed"] = True
+    if board.info:
+        res["info"] = dict(board.info)
+    return res
+
+
+def _expand_deal(d: dict[str, Any]) -> Deal:
+    deal = Deal(
+        d["deal"],
+        Player.find(d.get("first", "N")),
+        Denom.find(d.get("trump", "nt")),
+    )
+    for name in d.get("curtrick", []):
+        deal.play(Card(name), False)
+    return deal
+
+
+def _expand_board(d: dict[str, Any]) -> Board:
+    auction = [Bid(call.rstrip("!"), call[-1:] == "!") for call in d["auction"]]
+    for i, announcement in d.get("announcements", {}).items():
+        auction[int(i)].announcement = announcement
+    board = Board(
+        _expand_deal(d),
+        auction,
+        [Card(name) for name in d["play"]],
+        d.get("board_num"),
+        vul=Vul.find(d["vul"]) if "vul" in d else None,
+        dealer=Player.find(d["dealer"]) if "dealer" in d else None,
+        contract=Contract(d["contract"]) if "contract" in d else None,
+        claimed=d.get("claimed", False),
+    )
+    board.info.update(d.get("info", {}))
+    return board
+
+
+def iterdump(objs: Iterable[Union[Board, Deal]], fp: IO[str]) -> None:
+    """
+    Serialize :class:`Board` or :class:`Deal` objects to a JSON Lines file, writing
+    each object on its own line using a compact schema in which deals are PBN
+    strings and cards and calls are short strings
+    """
+    for obj in objs:
+        if isinstance(obj, Board):
+            line = _line_encoder.encode(_compact_board(obj))
+        elif isinstance(obj, Deal):
+            line = _line_encoder.encode(_compact_deal(obj))
+        else:
+            raise TypeError(f"Cannot serialize object of type {type(obj).__name__}")
+        fp.write(line + "\n")
+
+
+def iterload(fp: Iterable[str]) -> Iterator[Union[Board, Deal]]:
+    """
+    Read a JSON Lines file as written by :func:`iterdump`, yielding a :class:`Board`
+    or :class:`Deal` for each line as it is read
+    """
+    for line in fp:
+        if line.strip():
+            d = _json.loads(line)
+            yield _expand_board(d) if "auction" in d else _expand_deal(d)
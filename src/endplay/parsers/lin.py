@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-__all__ = ["LINEncodeError", "dump", "dumps", "load", "loads"]
+__all__ = ["LINEncodeError", "dump", "dumps", "load", "loads", "iterload"]
 
-import re
-from typing import IO
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Optional
 
 from more_itertools import chunked
 
@@ -17,108 +17,141 @@ from endplay.types import (
     Contract,
     ContractBid,
     Deal,
+    Denom,
+    Penalty,
     PenaltyBid,
     Player,
+    Rank,
     Vul,
 )
 from endplay.utils.escape import escape_suits, unescape_suits
-from endplay.utils.play import result_to_tricks, total_tricks, tricks_to_result
+from endplay.utils.play import result_to_tricks, tricks_to_result
 
 
 class LINDecoder:
     """
     Class providing functionality for reading the LIN file format
+
+    :param auction: If False, the auction is not decoded and boards are returned
+            with an empty auction. The contract is still determined from the calls
+    :param play: If False, the play is not decoded and boards are returned with
+            an empty play history. The result of the contract is still determined
+            from the cards played
     """
 
-    def __init__(self):
+    def __init__(self, auction: bool = True, play: bool = True):
+        self.auction = auction
+        self.play = play
+        self._reset()
+
+    def _reset(self) -> None:
+        self.deal: Optional[Deal] = None
+        self.bids: list[Bid] = []
+        self.cards: list[Card] = []
+        self.calls: list[str] = []
+        self.plays: list[str] = []
+        self.board_num: Optional[int] = None
+        self.dealer: Optional[Player] = None
+        self.vul: Optional[Vul] = None
+        self.contract: Optional[Contract] = None
+        self.claimed = False
+        self.info: dict[str, str] = {}
+
+    def _parse_skip(self, value: str) -> None:
+        # Presentational keys (small text, headings, labels, etc)
         pass
 
+    def _parse_pn(self, value: str) -> None:
+        # Player names are comma separated starting from south
+        info = self.info
+        info["South"], info["West"], info["North"], info["East"] = value.split(",")
+
+    def _parse_md(self, value: str) -> None:
+        # Marks deal, starts with dealer then comma separated hands
+        self.dealer = Player.from_lin(int(value[0]))
+        self.deal = Deal.from_lin(value, complete_deal=True)
+
+    def _parse_sv(self, value: str) -> None:
+        # Marks vulnerability
+        self.vul = Vul.from_lin(value)
+
+    def _parse_ah(self, value: str) -> None:
+        # Marks board number in format 'Board N'
+        self.board_num = int(value[5:])
+
+    def _parse_mb(self, value: str) -> None:
+        # Marks a bid
+        self.calls.append(value)
+        if self.auction:
+            self.bids.append(Bid(value, value[-1:] == "!"))
+
+    def _parse_an(self, value: str) -> None:
+        # Marks an alert for the previous bid
+        if self.auction:
+            self.bids[-1].announcement = unescape_suits(value)
+
+    def _parse_pc(self, value: str) -> None:
+        # Marks a card in the play section
+        self.plays.append(value)
+        if self.play:
+            self.cards.append(Card(value))
+
+    def _parse_mc(self, value: str) -> None:
+        # Marks that tricks were claimed
+        self.claimed = True
+        if self.contract is None:
+            self.contract = self._make_contract()
+            self.contract.result = tricks_to_result(int(value), self.contract.level)
+
+    def _make_contract(self) -> Contract:
+        if self.dealer is None:
+            raise ValueError("lin contains a contract but no dealer")
+        if self.auction:
+            return Contract.from_auction(self.dealer, self.bids)
+        return _contract_from_calls(self.dealer, self.calls)
+
+    _handlers: dict[str, Callable[[LINDecoder, str], None]] = {
+        "st": _parse_skip,  # small text
+        "rh": _parse_skip,  # reset heading
+        "qx": _parse_skip,  # create label
+        "va": _parse_skip,  # vertical adjust
+        "sa": _parse_skip,  # size auction
+        "mn": _parse_skip,  # main name
+        "bt": _parse_skip,
+        "tu": _parse_skip,
+        "pg": _parse_skip,  # end of trick
+        "pn": _parse_pn,
+        "md": _parse_md,
+        "sv": _parse_sv,
+        "ah": _parse_ah,
+        "mb": _parse_mb,
+        "an": _parse_an,
+        "nt": _parse_an,
+        "pc": _parse_pc,
+        "mc": _parse_mc,
+    }
+
     def parse_line(self, line: str) -> Board:
-        deal = None
-        auction: list[Bid] = []
-        play: list[Card] = []
-        board_num = None
-        dealer = None
-        vul = None
-        contract = None
-        claimed = False
-        info = {}
-
-        elems = line.split("|")
-        pairs = [(a, b) for a, b in zip(elems[::2], elems[1::2])]
-        for key, value in pairs:
-            if key == "st":
-                # small text
-                continue
-            elif key == "rh":
-                # reset heading
-                continue
-            elif key == "qx":
-                # create label
-                continue
-            elif key == "va":
-                # vertical adjust
-                continue
-            elif key == "sa":
-                # size auction
-                continue
-            elif key == "mn":
-                # Main name
-                continue
-            elif key == "bt":
-                # Main name
-                continue
-            elif key == "tu":
-                # Main name
-                continue
-            elif key == "nt":
-                # Marks an alert for the previous bid
-                auction[-1].announcement = unescape_suits(value)
-            elif key == "pn":
-                # Player names are comma separated starting from south
-                info["South"], info["West"], info["North"], info["East"] = value.split(
-                    ","
-                )
-            elif key == "md":
-                # Marks deal, starts with dealer then comma separated hands
-                dealer = Player.from_lin(int(value[0]))
-                deal = Deal.from_lin(value, complete_deal=True)
-            elif key == "sv":
-                # Marks vulnerability
-                vul = Vul.from_lin(value)
-            elif key == "ah":
-                # Marks board number in format 'Board N'
-                board_num = int(value[5:])
-            elif key == "mb":
-                # Marks a bid
-                auction.append(Bid(value, value[-1:] == "!"))
-            elif key == "an":
-                # Marks an alert for the previous bid
-                auction[-1].announcement = unescape_suits(value)
-            elif key == "pc":
-                # Marks a card in the play section
-                play.append(Card(value))
-            elif key == "pg":
-                # Signifies end of play
-                continue
-            elif key == "mc":
-                # Marks that tricks were claimed
-                claimed = True
-                if contract is None:
-                    if dealer is None:
-                        raise ValueError("lin contains a contract but no dealer")
-                    contract = Contract.from_auction(dealer, auction)
-                    contract.result = tricks_to_result(int(value), contract.level)
+        self._reset()
+        handlers = self._handlers
+        # Pair up alternate elements as keys and values
+        elems = iter(line.split("|"))
+        for key, value in zip(elems, elems):
+            handler = handlers.get(key)
+            if handler is None:
+                self.info[key] = value
             else:
-                info[key] = value
+                handler(self, value)
         # ensure there is a contract if there was an auction
-        if contract is None and (dealer is not None and len(auction) > 0):
-            contract = Contract.from_auction(dealer, auction)
-            if play:
-                tricks = total_tricks(play, contract.denom)
-                contract.result = tricks_to_result(int(tricks), contract.level)
+        contract = self.contract
+        if contract is None and (self.dealer is not None and self.calls):
+            contract = self._make_contract()
+            if self.plays:
+                tricks = _total_tricks(self.plays, contract.denom)
+                contract.result = tricks_to_result(tricks, contract.level)
         # make sure 'first' and 'trump' in deal are set correctly if there is
         # a contract
+        deal = self.deal
         if contract is not None:
             if deal is None:
                 raise ValueError("lin contains contract but no deal")
@@ -126,36 +159,100 @@ class LINDecoder:
             deal.trump = contract.denom
         return Board(
             deal,
-            auction,
-            play,
-            board_num,
-            vul=vul,
-            dealer=dealer,
+            self.bids,
+            self.cards,
+            self.board_num,
+            vul=self.vul,
+            dealer=self.dealer,
             contract=contract,
-            claimed=claimed,
-            **info,
+            claimed=self.claimed,
+            **self.info,
         )
 
     def parse_string(self, lin: str) -> list[Board]:
-        boards = []
-        # Use regex to split on 'pn|' but keep 'pn|' in the result
-        split_content = re.split(r"(pn\|)", lin)
-        final_split_content = []
-        for i in range(1, len(split_content), 2):
-            final_split_content.append(split_content[i] + split_content[i + 1])
-        for line in final_split_content:
-            boards.append(self.parse_line(line))
-        return boards
+        return [self.parse_line(line) for line in _split_records([lin])]
+
+    def iter_file(self, f: Iterable[str]) -> Iterator[Board]:
+        """
+        Parse a LIN file, yielding each board as soon as it has been read so that
+        the whole file never needs to be held in memory
+        """
+        # Line breaks are not significant, boards are delimited by 'pn|'
+        lines = (line.replace("\r\n", "").replace("\n", "") for line in f)
+        for record in _split_records(lines):
+            yield self.parse_line(record)
 
     def parse_file(self, f: IO[str]) -> list[Board]:
-        boards = []
-        # Read the file content
-        content = f.read()
-        # Remove CRLF characters
-        cleaned_content = content.replace("\r\n", "").replace("\n", "")
+        return list(self.iter_file(f))
+
 
-        boards = self.parse_string(cleaned_content)
-        return boards
+def _split_records(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Split a stream of text into records each starting with 'pn|', discarding
+    any text before the first record
+    """
+    buf, started = "", False
+    for chunk in chunks:
+        # Only the new text (plus enough of the old to catch a 'pn|' spanning
+        # the chunks) needs to be searched
+        lo = max(len(buf) - 2, 1 if started else 0)
+        buf += chunk
+        while (pos := buf.find("pn|", lo)) != -1:
+            if started:
+                yield buf[:pos]
+            buf, started, lo = buf[pos:], True, 1
+        if not started:
+            buf = buf[-2:]
+    if started:
+        yield buf
+
+
+def _contract_from_calls(dealer: Player, calls: list[str]) -> Contract:
+    """
+    Construct a contract from a list of LIN calls, equivalent to
+    :meth:`Contract.from_auction` but without creating the intermediate
+    :class:`Bid` objects
+    """
+    c = Contract()
+    final = -1
+    for i in range(len(calls) - 1, -1, -1):
+        call = calls[i]
+        if call[:1].isdigit():
+            c.level, c.denom = int(call[0]), Denom.find(call[1])
+            final = i
+            break
+        elif c.penalty == Penalty.passed:
+            c.penalty = Penalty.find(call)
+    if final == -1:
+        return c
+    # The declarer is the first player on the declaring side to name the strain
+    for i in range(final % 2, final + 1, 2):
+        call = calls[i]
+        if call[:1].isdigit() and Denom.find(call[1]) == c.denom:
+            c.declarer = dealer.next(i)
+            break
+    return c
+
+
+def _total_tricks(plays: list[str], trump: Denom) -> int:
+    """
+    Equivalent to :func:`endplay.utils.play.total_tricks` for a list of LIN
+    cards, comparing suits and ranks without creating :class:`Card` objects
+    """
+    tricks = 0
+    for i in range(0, len(plays) - 3, 4):
+        led = Denom.find(plays[i])
+        best, topsuit, toprank = 0, led, Rank.find(plays[i][1])
+        for j in range(1, 4):
+            suit, rank = Denom.find(plays[i + j]), Rank.find(plays[i + j][1])
+            if suit == topsuit:
+                if rank > toprank:
+                    best, toprank = j, rank
+            elif suit == trump:
+                best, topsuit, toprank = j, suit, rank
+        if best % 2 == 0:
+            tricks += 1
+    return tricks
 
 
 class LINEncodeError(ValueError):
@@ -214,18 +311,30 @@ class LINEncoder:
         return lin
 
 
-def load(fp: IO[str]) -> list[Board]:
-    "Read a LIN file object into an array of :class:`Board` objects"
-    parser = LINDecoder()
+def load(fp: IO[str], auction: bool = True, play: bool = True) -> list[Board]:
+    """
+    Read a LIN file object into an array of :class:`Board` objects. If `auction`
+    or `play` are False then that part of each board is not decoded
+    """
+    parser = LINDecoder(auction, play)
     return parser.parse_file(fp)
 
 
-def loads(s: str) -> list[Board]:
+def loads(s: str, auction: bool = True, play: bool = True) -> list[Board]:
     "Read a LIN string into a n arrya of :class:`Board` objects"
-    parser = LINDecoder()
+    parser = LINDecoder(auction, play)
     return parser.parse_string(s)
 
 
+def iterload(fp: IO[str], auction: bool = True, play: bool = True) -> Iterator[Board]:
+    """
+    Read a LIN file object lazily, yielding :class:`Board` objects one at a time.
+    If `auction` or `play` are False then that part of each board is not decoded
+    """
+    parser = LINDecoder(auction, play)
+    return parser.iter_file(fp)
+
+
 def dump(boards: list[Board], fp: IO[str]) -> None:
     "Seralize a list of :class:`Board` objects to a LIN file"
     parser = LINEncoder()
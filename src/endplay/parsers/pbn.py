@@ -4,10 +4,21 @@ Parser for PBN files
 
 from __future__ import annotations
 
-__all__ = ["PBNDecoder", "load", "loads", "dump", "dumps"]
+__all__ = [
+    "PBNDecoder",
+    "load",
+    "loads",
+    "iterload",
+    "load_parallel",
+    "dump",
+    "dumps",
+]
 
 import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+from functools import partial
 from io import StringIO
 from itertools import chain
 from typing import IO, Any, Optional, Union
@@ -73,8 +84,28 @@ class PBNDecoder:
         DATA = 2
         COMMENTBLOCK = 3
 
-    def __init__(self):
+    def __init__(self, decode_only: Optional[Iterable[str]] = None):
+        """
+        Construct a PBN decoder
+
+        :param decode_only: If provided, only these tags (and the Board tag, and the
+                Declarer tag if Contract is given) are decoded into :class:`Board`
+                attributes, using a faster single-pass line scanner. Every other
+                tag is stored in `Board.info` as the raw string (or, for tags
+                followed by a section, the raw value and rows) and is never
+                decoded, so for example if Auction is not listed then
+                `Board.auction` is empty and the calls are in `Board.info.auction`.
+                Comments are skipped, as they are when all tags are decoded
+        """
         # warnings.warn("endplay.parsers.PBNDecoder is now deprecated and subject to be replaced with a different interface at any time")
+        if decode_only is None:
+            self.decode_only = None
+        else:
+            self.decode_only = {tag.lower() for tag in decode_only} | {"board"}
+            # The declarer is given in its own tag, but is part of the contract
+            if "contract" in self.decode_only:
+                self.decode_only.add("declarer")
+
         self.clear()
 
     def _get_comment(self, text: str, iscont: bool) -> tuple[Optional[str], bool]:
@@ -122,6 +153,14 @@ class PBNDecoder:
             if fields["value"] == "#":
                 fields = self.prevtags[raw_key]
             value = fields["value"]
+            if self.decode_only is not None and key not in self.decode_only:
+                if "data" not in fields:
+                    board.info[raw_key] = value
+                elif key.endswith("table") and key != "table":
+                    board.info[raw_key] = dict(headers=[value], rows=fields["data"])
+                else:
+                    board.info[raw_key] = Board.Info(value=value, data=fields["data"])
+                continue
             if key == "board":
                 board.board_num = int(value)
             elif key == "vulnerable":
@@ -259,14 +298,40 @@ class PBNDecoder:
             self.curtags[self.curtag]["data"] += [curline.split()]
         return True
 
+    def _parse_colnames(self, value: str, curline: str) -> list[Union[str, dict]]:
+        colnames: list[Union[str, dict]] = []
+        for colname in value.split(";"):
+            cm = RE.colname.match(colname)
+            if cm:
+                if (not cm.group(1)) and (not cm.group(3)) and (not cm.group(4)):
+                    colnames += [cm.group(2)]
+                else:
+                    colnames += [
+                        {
+                            "ordering": cm.group(1) or None,
+                            "name": cm.group(2),
+                            "minwidth": cm.group(3) or None,
+                            "alignment": cm.group(4) or None,
+                        }
+                    ]
+            else:
+                raise PBNDecodeError(
+                    "Could not parse column name", curline, self.lineno
+                )
+        return colnames
+
+    def _finish_board(self) -> None:
+        if self.curtags:
+            board = self._tags_to_board()
+            if board is not None:
+                self.boards.append(board)
+                self.prevtags, self.curtags = self.curtags, {}
+                self.notes = {}
+
     def _parse_none(self, curline: str) -> bool:
         # Empty line, start new game (or ignore if the current game is empty)
         if curline == "":
-            if self.curtags:
-                board = self._tags_to_board()
-                if board is not None:
-                    self.boards.append(board)
-                    self.prevtags, self.curtags = self.curtags, {}
+            self._finish_board()
             return False
         # Metadata line, ignore
         if RE.ignore.match(curline):
@@ -300,29 +365,7 @@ class PBNDecoder:
             elif (
                 self.curtag.lower().endswith("table") and self.curtag.lower() != "table"
             ):
-                colnames = []
-                for colname in m.group(2).split(";"):
-                    cm = RE.colname.match(colname)
-                    if cm:
-                        if (
-                            (not cm.group(1))
-                            and (not cm.group(3))
-                            and (not cm.group(4))
-                        ):
-                            colnames += [cm.group(2)]
-                        else:
-                            colnames += [
-                                {
-                                    "ordering": cm.group(1) or None,
-                                    "name": cm.group(2),
-                                    "minwidth": cm.group(3) or None,
-                                    "alignment": cm.group(4) or None,
-                                }
-                            ]
-                    else:
-                        raise PBNDecodeError(
-                            "Could not parse column name", curline, self.lineno
-                        )
+                colnames = self._parse_colnames(m.group(2), curline)
                 self.curtags[self.curtag] = {"value": colnames, "data": []}
                 self.state = PBNDecoder.State.DATA
             elif self.curtag.lower() == "note":
@@ -352,35 +395,107 @@ class PBNDecoder:
         self.curtag: Optional[str] = None
         self.lineno = 0
 
-    def parse_file(self, f: IO[str]) -> list[Board]:
-        "Parse a PBN file"
-        self.clear()
-
-        # Loop over lines, keeping track of what type of line we are expecting.
-        # If the line isn't consumed, change the state and fallthrough to a
-        # method which can consume the line. Always append a blank line to the
-        # end of the file input to ensure that the last board is processed
-        for curline in chain(f.readlines(), [""]):
-            self.lineno += 1
-            curline = curline.strip()
+    def parse_line(self, curline: str) -> None:
+        "Parse a single line of a PBN file, appending any completed board to `boards`"
+        # Keep track of what type of line we are expecting. If the line isn't
+        # consumed, change the state and fallthrough to a method which can
+        # consume the line.
+        self.lineno += 1
+        curline = curline.strip()
+
+        if self.decode_only is not None and self.state != PBNDecoder.State.META:
+            self._parse_fast(curline)
+            return
+
+        if curline.startswith("%") and self.state != PBNDecoder.State.META:
+            return
+
+        if self.state == PBNDecoder.State.META:
+            if not self._parse_meta(curline):
+                return
+        if self.state == PBNDecoder.State.DATA:
+            if not self._parse_conttable(curline):
+                return
+        if self.state == PBNDecoder.State.NONE:
+            if not self._parse_none(curline):
+                return
+        if self.state == PBNDecoder.State.COMMENTBLOCK:
+            if not self._parse_commentblock(curline):
+                return
+
+    def _parse_fast(self, curline: str) -> None:
+        # Single-pass alternative to the state methods, used when only some tags
+        # are decoded. Each line is classified by its first character and then
+        # matched against at most one pattern, and tag values are kept as raw
+        # strings until the board is complete
+        if self.state == PBNDecoder.State.COMMENTBLOCK:
+            if not _in_comment(curline, True):
+                self.state = PBNDecoder.State.NONE
+            return
+        if not curline:
+            self.state = PBNDecoder.State.NONE
+            self._finish_board()
+            return
+        first = curline[0]
+        if first == "[":
+            m = RE.tagpair.match(curline)
+            if not m:
+                raise PBNDecodeError("Expected a tag", curline, self.lineno)
+            self.state = PBNDecoder.State.NONE
+            tag, value, rest = m.groups()
+            self.curtag = tag
+            if tag not in self.curtags:
+                key = tag.lower()
+                if key == "note":
+                    idx, note = value.split(":", maxsplit=1)
+                    self.notes[idx] = note
+                elif key == "play" or key == "auction":
+                    self.curtags[tag] = {"value": value, "data": []}
+                    self.state = PBNDecoder.State.DATA
+                elif key.endswith("table") and key != "table":
+                    if key in self.decode_only:  # type: ignore[operator]
+                        value = self._parse_colnames(value, curline)
+                    self.curtags[tag] = {"value": value, "data": []}
+                    self.state = PBNDecoder.State.DATA
+                else:
+                    self.curtags[tag] = {"value": value}
+            if rest and _in_comment(rest, False):
+                self.state = PBNDecoder.State.COMMENTBLOCK
+        elif first == "{":
+            if _in_comment(curline, False):
+                self.state = PBNDecoder.State.COMMENTBLOCK
+        elif first == ";" or first == "%":
+            pass
+        elif self.state == PBNDecoder.State.DATA:
+            if self.curtag is None:
+                raise RuntimeError("curtag is None while parsing table")
+            self.curtags[self.curtag]["data"].append(curline.split())
+        else:
+            raise PBNDecodeError("Expected a tag", curline, self.lineno)
 
-            if curline.startswith("%") and self.state != PBNDecoder.State.META:
-                continue
+    def iter_file(self, f: Iterable[str]) -> Iterator[Board]:
+        """
+        Parse a PBN file, yielding each board as soon as it has been read. Only
+        the tags of the previous board are retained between boards, so this can
+        be used to read files too large to fit in memory
+        """
+        self.clear()
+        return self._iter_lines(f)
 
-            if self.state == PBNDecoder.State.META:
-                if not self._parse_meta(curline):
-                    continue
-            if self.state == PBNDecoder.State.DATA:
-                if not self._parse_conttable(curline):
-                    continue
-            if self.state == PBNDecoder.State.NONE:
-                if not self._parse_none(curline):
-                    continue
-            if self.state == PBNDecoder.State.COMMENTBLOCK:
-                if not self._parse_commentblock(curline):
-                    continue
+    def _iter_lines(self, f: Iterable[str]) -> Iterator[Board]:
+        # Always append a blank line to the end of the file input to ensure
+        # that the last board is processed
+        for curline in chain(f, [""]):
+            self.parse_line(curline)
+            if self.boards:
+                yield from self.boards
+                self.boards.clear()
 
-        return self.boards
+    def parse_file(self, f: IO[str]) -> list[Board]:
+        "Parse a PBN file"
+        boards = list(self.iter_file(f))
+        self.boards = boards
+        return boards
 
 
 class PBNEncoder:
@@ -569,15 +684,147 @@ class PBNEncoder:
             fp.write("\n")
 
 
-def load(fp: IO[str]) -> list[Board]:
-    "Read a PBN file object into a list of :class:`Board` objects"
-    parser = PBNDecoder()
+def load(fp: IO[str], decode_only: Optional[Iterable[str]] = None) -> list[Board]:
+    """
+    Read a PBN file object into a list of :class:`Board` objects
+
+    :param decode_only: If provided, only decode these tags. The other tags are
+            left as raw strings in `Board.info`, so e.g. `Board.auction` is empty
+            unless Auction is listed (see :class:`PBNDecoder`)
+    """
+    parser = PBNDecoder(decode_only)
     return parser.parse_file(fp)
 
 
-def loads(s: str) -> list[Board]:
-    "Read a PBN string into a list of :class:`Board` objects"
-    parser = PBNDecoder()
+def iterload(
+    fp: Iterable[str], decode_only: Optional[Iterable[str]] = None
+) -> Iterator[Board]:
+    """
+    Read a PBN file object lazily, yielding :class:`Board` objects as each one
+    is completed
+
+    :param decode_only: If provided, only decode these tags. The other tags are
+            left as raw strings in `Board.info`, so e.g. `Board.auction` is empty
+            unless Auction is listed (see :class:`PBNDecoder`)
+    """
+    parser = PBNDecoder(decode_only)
+    return parser.iter_file(fp)
+
+
+def load_parallel(
+    fp: IO[str],
+    processes: Optional[int] = None,
+    chunksize: int = 256,
+    decode_only: Optional[Iterable[str]] = None,
+) -> list[Board]:
+    """
+    Read a PBN file object into a list of :class:`Board` objects, decoding the
+    boards in parallel across a pool of processes
+
+    :param processes: The number of worker processes, defaults to the number of CPUs
+    :param chunksize: The number of boards to send to a worker process at a time
+    :param decode_only: If provided, only decode these tags. The other tags are
+            left as raw strings in `Board.info`, so e.g. `Board.auction` is empty
+            unless Auction is listed (see :class:`PBNDecoder`)
+    """
+    chunks = _split_boards(fp, chunksize)
+    decode = partial(
+        _decode_chunk,
+        decode_only=None if decode_only is None else list(decode_only),
+    )
+    with ProcessPoolExecutor(processes) as executor:
+        results = executor.map(decode, chunks)
+        return [board for boards in results for board in boards]
+
+
+def _split_boards(
+    lines: Iterable[str], chunksize: int
+) -> Iterator[tuple[list[str], list[str], int]]:
+    """
+    Split the lines of a PBN file into chunks of `chunksize` boards, yielding
+    the lines of the board preceding each chunk (so that `#` tags can be
+    resolved), the lines of the chunk and the line number it starts on
+    """
+    context: list[str] = []  # the last board with tags
+    chunk_context, chunk, board = context, [], []
+    start, nboards, has_tags, in_comment = 1, 0, False, False
+    for lineno, line in enumerate(lines, 1):
+        board.append(line)
+        stripped = line.strip()
+        if in_comment:
+            in_comment = _in_comment(stripped, True)
+        elif not stripped:
+            # A blank line outside of a comment block ends a board
+            chunk += board
+            if has_tags:
+                context, nboards = board[:-1], nboards + 1
+            board, has_tags = [], False
+            if nboards == chunksize:
+                yield chunk_context, chunk, start
+                chunk_context, chunk, start, nboards = context, [], lineno + 1, 0
+        elif stripped[0] == "[":
+            has_tags = True
+            # Only look for comments after the tag, as the value may contain braces
+            m = RE.tagpair.match(stripped)
+            if m and m.group(3):
+                in_comment = _in_comment(m.group(3), False)
+        elif stripped[0] != "%":
+            # Comments can also be opened partway through a line of a data section
+            in_comment = _in_comment(stripped, False)
+    chunk += board
+    if chunk:
+        yield chunk_context, chunk, start
+
+
+def _in_comment(text: str, in_comment: bool) -> bool:
+    """
+    Whether a line ends inside a block comment, given whether it started in one.
+    Braces after a `;` which is not inside a block comment are ignored, as the
+    rest of the line is then a comment
+    """
+    i = 0
+    while True:
+        if in_comment:
+            i = text.find("}", i)
+            if i < 0:
+                return True
+        else:
+            j, k = text.find("{", i), text.find(";", i)
+            if j < 0 or 0 <= k < j:
+                return False
+            i = j
+        in_comment, i = not in_comment, i + 1
+
+
+def _decode_chunk(
+    args: tuple[list[str], list[str], int],
+    decode_only: Optional[list[str]] = None,
+) -> list[Board]:
+    "Decode a chunk of a PBN file produced by `_split_boards`"
+    context, lines, start = args
+    decoder = PBNDecoder(decode_only)
+    if start > 1:
+        # Parse the tags of the preceding board so that they can be inherited
+        # with `#`, without decoding it into a board
+        decoder.state = PBNDecoder.State.NONE
+        for line in context:
+            decoder.parse_line(line)
+        decoder.prevtags, decoder.curtags = decoder.curtags, {}
+        decoder.notes = {}
+        decoder.state = PBNDecoder.State.NONE
+    decoder.lineno = start - 1
+    return list(decoder._iter_lines(lines))
+
+
+def loads(s: str, decode_only: Optional[Iterable[str]] = None) -> list[Board]:
+    """
+    Read a PBN string into a list of :class:`Board` objects
+
+    :param decode_only: If provided, only decode these tags. The other tags are
+            left as raw strings in `Board.info`, so e.g. `Board.auction` is empty
+            unless Auction is listed (see :class:`PBNDecoder`)
+    """
+    parser = PBNDecoder(decode_only)
     sp = StringIO(s)
     return parser.parse_file(sp)
 
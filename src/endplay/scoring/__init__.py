@@ -0,0 +1,240 @@
+"""
+Functions for scoring contract results and for comparing scores using IMPs
+and matchpoints, both individually and in bulk using NumPy arrays.
+
+The functions which compare results take a field of scores for each board,
+either as a 1-d array for a single board or as a 2-d array with one row
+per board. Boards which were not played by every pair or team should have
+the missing entries set to NaN.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "contract_score",
+    "score_array",
+    "imps",
+    "imp_array",
+    "matchpoints",
+    "cross_imps",
+    "butler_datum",
+    "butler",
+]
+
+import numpy as np
+import numpy.typing as npt
+
+from endplay.types import Denom, Penalty
+from endplay.types.contract import _lookup_score, _score_table
+
+# Lowest score difference which gains 1, 2, ..., 24 IMPs
+_imp_thresholds = np.array(
+    [20, 50, 90, 130, 170, 220, 270, 320, 370, 430, 500, 600]
+    + [750, 900, 1100, 1300, 1500, 1750, 2000, 2250, 2500, 3000, 3500, 4000]
+)
+
+# The contract score table as an array of shape (8, 5, 3, 2, 20), indexed
+# in the same way as `_score_table`
+_scores = np.array(_score_table, dtype=np.int32)
+_scores.flags.writeable = False
+
+
+def contract_score(
+    level: int, denom: Denom, penalty: Penalty, vulnerable: bool, result: int
+) -> int:
+    """
+    Return the score of a contract for the declaring side
+
+    :param level: The level of the contract, or 0 for a passout
+    :param denom: The denomination of the contract
+    :param penalty: The penalty of the contract
+    :param vulnerable: Whether the declaring side is vulnerable
+    :param result: The number of overtricks (positive) or undertricks (negative) made
+    """
+    return _lookup_score(level, denom, penalty, vulnerable, result)
+
+
+def score_array(
+    levels: npt.ArrayLike,
+    denoms: npt.ArrayLike,
+    penalties: npt.ArrayLike,
+    vul: npt.ArrayLike,
+    results: npt.ArrayLike,
+) -> np.ndarray:
+    """
+    Return the scores of many contracts for the declaring side as an array. The
+    arguments are broadcast against each other, so for example the score of
+    every result of a single contract can be found by passing scalars for all
+    but `results`.
+
+    :param levels: The levels of the contracts, with 0 for a passout
+    :param denoms: The denominations of the contracts, as `Denom` values
+    :param penalties: The penalties of the contracts, as `Penalty` values
+    :param vul: Whether the declaring side of each contract is vulnerable
+    :param results: The number of overtricks (positive) or undertricks (negative) made
+    """
+    level = np.asarray(levels, dtype=np.intp)
+    denom = np.asarray(denoms, dtype=np.intp)
+    penalty = np.asarray(penalties, dtype=np.intp)
+    is_vul = np.asarray(vul, dtype=np.intp)
+    result = np.asarray(results, dtype=np.intp)
+    if np.any((level < 0) | (level > 7)):
+        raise ValueError("Contract levels must be between 0 and 7")
+    if np.any((denom < 0) | (denom > 4)):
+        raise ValueError("Invalid denomination in denoms")
+    if not np.all(np.isin(penalty, list(Penalty))):
+        raise ValueError("Invalid penalty in penalties")
+    if np.any((is_vul < 0) | (is_vul > 1)):
+        raise ValueError("Vulnerability must be given as booleans")
+    if np.any((result < -13) | (result > 6)):
+        raise ValueError("Results must be between -13 and 6")
+    return _scores[level, denom, penalty >> 1, is_vul, result + 13]
+
+
+def imps(diff: float) -> int:
+    """
+    Convert a score difference into IMPs, with the same sign as the difference
+
+    :param diff: The score difference
+    """
+    n = int(np.searchsorted(_imp_thresholds, abs(diff), side="right"))
+    return n if diff >= 0 else -n
+
+
+def imp_array(diffs: npt.ArrayLike) -> np.ndarray:
+    """
+    Convert an array of score differences into IMPs, with the same sign as
+    each difference. NaN differences are converted to zero.
+
+    :param diffs: The score differences
+    """
+    diff = np.nan_to_num(np.asarray(diffs, dtype=float))
+    n = np.searchsorted(_imp_thresholds, np.abs(diff), side="right")
+    return np.where(diff < 0, -n, n)
+
+
+def matchpoints(
+    scores: npt.ArrayLike, neuberg: bool = True, percentage: bool = False
+) -> np.ndarray:
+    """
+    Matchpoint a field of scores, awarding 2 matchpoints for each score beaten
+    and 1 for each score tied. The result has the same shape as `scores`, with
+    NaN for the missing results.
+
+    :param scores: The scores of each pair on each board
+    :param neuberg: If True, boards with missing results are scaled up to the
+            full field using the Neuberg formula
+    :param percentage: If True, return the matchpoints as a percentage of the
+            top on each board
+    """
+    field, squeeze = _as_field(scores)
+    nboards, npairs = field.shape
+    present = ~np.isnan(field)
+    counts = present.sum(axis=1)
+
+    # Offset each board's scores by a multiple of the score range so that a
+    # single sort of the flattened array sorts each board independently
+    if present.any():
+        lo, hi = np.min(field[present]), np.max(field[present])
+    else:
+        lo, hi = 0.0, 0.0
+    offset = (field - lo) + np.arange(nboards)[:, None] * (hi - lo + 1)
+    flat = np.sort(offset, axis=None)
+    below = np.searchsorted(flat, offset, side="left")
+    upto = np.searchsorted(flat, offset, side="right")
+    # Entries sorted before each board's scores belong to earlier boards
+    start = np.concatenate(([0], np.cumsum(counts)[:-1]))[:, None]
+    mps = 2.0 * (below - start) + (upto - below - 1)
+
+    top = np.full(nboards, 2.0 * (npairs - 1))
+    if neuberg:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mps = (mps + 1) * (npairs / counts)[:, None] - 1
+    else:
+        top = 2.0 * (counts - 1)
+    if percentage:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mps = np.where(top[:, None] > 0, 100 * mps / top[:, None], 50.0)
+    mps[~present] = np.nan
+    return mps[0] if squeeze else mps
+
+
+def cross_imps(scores: npt.ArrayLike, average: bool = True) -> np.ndarray:
+    """
+    Score a field using cross-IMPs, comparing each score with every other score
+    on the same board. The result has the same shape as `scores`, with NaN for
+    the missing results.
+
+    :param scores: The scores of each pair or team on each board
+    :param average: If True, divide the total IMPs by the number of comparisons
+    """
+    field, squeeze = _as_field(scores)
+    nboards, npairs = field.shape
+    present = ~np.isnan(field)
+    res = np.empty(field.shape)
+    # Compare the scores in chunks of boards to bound the size of the
+    # (boards, pairs, pairs) array of differences
+    chunk = max(1, _CROSS_IMPS_CHUNK // max(1, npairs * npairs))
+    for i in range(0, nboards, chunk):
+        rows = field[i : i + chunk]
+        res[i : i + chunk] = imp_array(rows[:, :, None] - rows[:, None, :]).sum(axis=2)
+    if average:
+        res /= np.maximum(present.sum(axis=1) - 1, 1)[:, None]
+
+    res[~present] = np.nan
+    return res[0] if squeeze else res
+
+
+def butler_datum(scores: npt.ArrayLike, discard: int = 1) -> np.ndarray:
+    """
+    Calculate the Butler datum of each board, which is the average score after
+    discarding the highest and lowest scores and rounding to the nearest 10.
+    If too few scores are present to discard any, all are averaged.
+
+    :param scores: The scores of each pair or team on each board
+    :param discard: The number of highest and lowest scores to discard
+    """
+    field, squeeze = _as_field(scores)
+    counts = (~np.isnan(field)).sum(axis=1)
+    ordered = np.sort(field, axis=1)  # NaN is sorted to the end
+    cumsum = np.concatenate(
+        (np.zeros((field.shape[0], 1)), np.cumsum(np.nan_to_num(ordered), axis=1)),
+        axis=1,
+    )
+    trim = np.where(counts > 2 * discard, discard, 0)
+    rows = np.arange(field.shape[0])
+    total = cumsum[rows, counts - trim] - cumsum[rows, trim]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        datum = 10 * np.round(total / (counts - 2 * trim) / 10)
+    return datum[0] if squeeze else datum
+
+
+def butler(scores: npt.ArrayLike, discard: int = 1) -> np.ndarray:
+    """
+    Score a field using Butler scoring, comparing each score with the Butler
+    datum of the board (see :func:`butler_datum`). The result has the same
+    shape as `scores`, with NaN for the missing results.
+
+    :param scores: The scores of each pair or team on each board
+    :param discard: The number of highest and lowest scores to discard when
+            calculating the datum
+    """
+    field, squeeze = _as_field(scores)
+    datum = butler_datum(field, discard)
+    res = imp_array(field - datum[:, None]).astype(float)
+    res[np.isnan(field)] = np.nan
+    return res[0] if squeeze else res
+
+
+# Maximum number of score differences to hold in memory in cross_imps
+_CROSS_IMPS_CHUNK = 1 << 22
+
+
+def _as_field(scores: npt.ArrayLike) -> tuple[np.ndarray, bool]:
+    "Convert scores to a 2-d float array, and whether the input was 1-d"
+    field = np.asarray(scores, dtype=float)
+    if field.ndim == 1:
+        return field[None, :], True
+    if field.ndim != 2:
+        raise ValueError("scores must be a 1-d or 2-d array")
+    return field, False
@@ -0,0 +1,9 @@
+"""
+Simulations which combine the dealer and the double dummy solver, generating
+deals consistent with what is known at the table and solving each of them to
+estimate the best course of action.
+"""
+
+__all__ = ["LeadStats", "LeadSimulation", "simulate_lead"]
+
+from endplay.simulate.lead import LeadSimulation, LeadStats, simulate_lead
@@ -0,0 +1,215 @@
+"""
+Simulation of opening leads, which finds the double dummy results of each card
+in a known hand over many deals consistent with what is known about the others.
+"""
+
+from __future__ import annotations
+
+__all__ = ["LeadStats", "LeadSimulation", "simulate_lead"]
+
+import sys
+from collections.abc import Iterator
+from itertools import islice
+from typing import Optional, TextIO, Union
+
+import numpy as np
+
+import endplay._dds as _dds
+from endplay.dds.solve import solve_all_boards
+from endplay.dealer.constraint import Expr
+from endplay.dealer.generate import generate_deals
+from endplay.stats import Summary
+from endplay.types import Card, Contract, Deal, Hand, Player
+
+
+class LeadStats:
+    """
+    The results of leading one card, from the point of view of the defence
+
+    :ivar card: The card led
+    :ivar count: The number of deals the lead was tried on
+    :ivar tricks: The average number of tricks taken by the defence
+    :ivar tricks_stderr: The standard error of `tricks`
+    :ivar set: The proportion of deals on which the contract was defeated
+    :ivar set_stderr: The standard error of `set`
+    """
+
+    def __init__(self, card: Card, tricks: Summary, sets: Summary):
+        self.card = card
+        self.count = tricks.count
+        self.tricks = tricks.mean
+        self.tricks_stderr = tricks.stderr
+        self.set = sets.mean
+        self.set_stderr = sets.stderr
+
+    def __repr__(self) -> str:
+        return (
+            f"<LeadStats card={self.card} tricks={self.tricks:.3f} "
+            f"set={100*self.set:.1f}%>"
+        )
+
+
+class LeadSimulation:
+    """
+    The result of :func:`simulate_lead`
+
+    :ivar contract: The contract being defended
+    :ivar leader: The player on lead
+    :ivar deals: The number of deals which were solved
+    :ivar leads: The statistics for each card in the leader's hand, best first
+    :ivar settled: Whether the simulation stopped because the ranking of the best
+            leads was known at the requested confidence level
+    """
+
+    def __init__(
+        self,
+        contract: Contract,
+        leader: Player,
+        deals: int,
+        leads: list[LeadStats],
+        settled: bool,
+    ):
+        self.contract = contract
+        self.leader = leader
+        self.deals = deals
+        self.leads = leads
+        self.settled = settled
+
+    def pprint(self, stream: TextIO = sys.stdout) -> None:
+        "Print a table of the results of each lead, best first"
+        print(
+            f"Leads by {self.leader.name} against",
+            f"{self.contract.level}{self.contract.denom.abbr}{self.contract.declarer.abbr}",
+            f"({self.deals} deals{', settled' if self.settled else ''})",
+            file=stream,
+        )
+        print("Lead  Tricks  ±Error   Set %  ±Error", file=stream)
+        for lead in self.leads:
+            print(
+                f"{str(lead.card):<4} {lead.tricks:7.3f} {lead.tricks_stderr:7.3f}",
+                f"{100*lead.set:7.2f} {100*lead.set_stderr:7.2f}",
+                file=stream,
+            )
+
+    def __repr__(self) -> str:
+        best = self.leads[0].card if self.leads else None
+        return f"<LeadSimulation deals={self.deals} best={best} settled={self.settled}>"
+
+
+def simulate_lead(
+    hand: Union[Hand, str],
+    contract: Union[Contract, str],
+    *constraints: Union[Expr, str],
+    produce: int = 1000,
+    by: str = "tricks",
+    top: int = 1,
+    level: float = 0.95,
+    min_deals: int = 100,
+    batch_size: int = _dds.MAXNOOFBOARDS,
+    seed: Optional[int] = None,
+    max_attempts: int = 1000000,
+    env: dict = {},
+) -> LeadSimulation:
+    """
+    Find the best opening lead from a hand by generating deals consistent with
+    constraints on the other hands and solving each lead double dummy. Deals are
+    solved in batches with :func:`solve_all_boards`, which uses the DDS threads.
+    After each batch the leads are compared on the same deals, and the simulation
+    stops early once the order of the `top` best leads is known: each of them is
+    either better than every lead below it at the confidence level `level`, or
+    gives the same result on every deal.
+
+    :param hand: The hand of the player on lead, i.e. declarer's left hand opponent
+    :param contract: The contract, including the declarer
+    :param constraints: Constraints on the other hands, as for :func:`generate_deals`
+    :param produce: The maximum number of deals to solve
+    :param by: The measure leads are ranked by, either "tricks" for the average
+            number of tricks taken by the defence, or "set" for the proportion of
+            deals on which the contract is defeated
+    :param top: The number of best leads whose order must be known before stopping
+            early, 0 to always solve `produce` deals
+    :param level: The confidence level used to decide if one lead is better
+    :param min_deals: The minimum number of deals to solve before stopping early
+    :param batch_size: The number of deals to solve at once, at most `MAXNOOFBOARDS`
+    :param seed: The seed for the random number generator
+    :param max_attempts: The maximum number of shuffles to perform
+    :param env: A dictionary of the environment used when evaluating constraints
+    :return: The results of each lead, best first
+    """
+    if by not in ("tricks", "set"):
+        raise ValueError(f"by must be 'tricks' or 'set', not {by!r}")
+    if not 0 < batch_size <= _dds.MAXNOOFBOARDS:
+        raise ValueError(f"batch_size must be between 1 and {_dds.MAXNOOFBOARDS}")
+    if isinstance(hand, str):
+        hand = Hand(hand)
+    if isinstance(contract, str):
+        contract = Contract(contract)
+    leader = contract.declarer.lho
+    cards = sorted(hand, key=lambda card: (card.suit, -card.rank))
+    column = {card: i for i, card in enumerate(cards)}
+    # The defence needs this many tricks to defeat the contract
+    needed = 8 - contract.level
+
+    predeal = Deal(first=leader, trump=contract.denom)
+    predeal[leader] = hand
+    deals: Iterator[Deal] = generate_deals(
+        *constraints,
+        predeal=predeal,
+        produce=produce,
+        seed=seed,
+        max_attempts=max_attempts,
+        env=env,
+    )
+
+    # The tricks taken by the defence after each lead on each deal
+    results = np.empty((0, len(cards)), dtype=np.int8)
+    settled = False
+    while not settled:
+        batch = list(islice(deals, batch_size))
+        if not batch:
+            break
+        tricks = np.empty((len(batch), len(cards)), dtype=np.int8)
+        for row, solved in zip(tricks, solve_all_boards(batch)):
+            for card, score in solved:
+                row[column[card]] = score
+        results = np.concatenate([results, tricks])
+        if top > 0 and len(results) >= min_deals:
+            if by == "tricks":
+                values = results
+            else:
+                values = (results >= needed).astype(np.int8)
+            settled = _settled(values, top, level)
+
+    leads = [
+        LeadStats(
+            card,
+            Summary().update(results[:, i].astype(float)),
+            Summary().update((results[:, i] >= needed).astype(float)),
+        )
+        for i, card in enumerate(cards)
+    ]
+    if by == "tricks":
+        leads.sort(key=lambda lead: lead.tricks, reverse=True)
+    else:
+        leads.sort(key=lambda lead: lead.set, reverse=True)
+    return LeadSimulation(contract, leader, len(results), leads, settled)
+
+
+def _settled(values: np.ndarray, top: int, level: float) -> bool:
+    """
+    Whether the order of the `top` best columns of `values` is known. As every lead
+    is solved on the same deals, they are compared by the differences on each deal,
+    which is much more precise than comparing their averages
+    """
+    order = np.argsort(-values.mean(axis=0), kind="stable")
+    for i, best in enumerate(order[:top]):
+        for other in order[i + 1 :]:
+            diff = Summary().update((values[:, best] - values[:, other]).astype(float))
+            if diff.max == diff.min == 0:
+                # The leads are equivalent on every deal, e.g. touching honours
+                continue
+            # Differences are whole numbers, which floors the variance when every
+            # difference seen so far is the same
+            if not diff.mean - diff.halfwidth(level, resolution=1) > 0:
+                return False
+    return True
@@ -4,13 +4,31 @@ Functions for statistical analysis of deals.
 
 from __future__ import annotations
 
-__all__ = ["average", "frequency", "cofrequency"]
+__all__ = [
+    "average",
+    "frequency",
+    "cofrequency",
+    "accumulate",
+    "stopping_rule",
+    "Accumulator",
+    "Summary",
+    "Histogram",
+    "Histogram2D",
+    "QuantileSketch",
+]
 
-from collections.abc import Iterable
-from math import ceil, floor
+from collections.abc import Callable, Iterable
 from statistics import fmean
+from typing import Union
 
 from endplay.dealer.constraint import Expr
+from endplay.stats.accumulators import (
+    Accumulator,
+    Histogram,
+    Histogram2D,
+    QuantileSketch,
+    Summary,
+)
 from endplay.types import Deal
 
 
@@ -35,14 +53,26 @@ def frequency(
     :param ub: Value above which values are ignored
     :return: An array of bins, and a tuple containing the left and right boundaries
     """
-    lb, ub = floor(lb), ceil(ub)
-    bins = list(range(lb, ub + 1))
-    hist = [0] * len(bins)
+    hist = Histogram(lb, ub)
+    hist.update(func(deal) for deal in deals)
+    return hist.counts
+
+
+def accumulate(
+    deals: Iterable[Deal], *stats: tuple[Expr, Accumulator]
+) -> list[Accumulator]:
+    """
+    Evaluate several functions in a single pass over a sequence of deals, adding
+    the value of each function to its accumulator
+
+    :param deals: The input sequence of deals
+    :param stats: Pairs of a function and the accumulator to add its values to
+    :return: The accumulators, in the order they were given
+    """
     for deal in deals:
-        val = round(func(deal))
-        if bins[0] <= val <= bins[-1]:
-            hist[val - bins[0]] += 1
-    return hist
+        for func, acc in stats:
+            acc.add(func(deal))
+    return [acc for _, acc in stats]
 
 
 def cofrequency(
@@ -61,25 +91,53 @@ def cofrequency(
     :param deals: The input sequence of deals
     :param func1: The first function to evaluate over `deals`
     :param func2: The second function to evaluate over `deals`
-    :param lower_bound1: Value below which values returned from func1 are ignored
-    :param upper_bound1: Value above which values returned from func1 are ignored
-    :param lower_bound2: Value below which values returned from func2 are ignored
-    :param upper_bound2: Value above which values returned from func2 are ignored
+    :param lb1: Value below which values returned from func1 are ignored
+    :param ub1: Value above which values returned from func1 are ignored
+    :param lb2: Value below which values returned from func2 are ignored
+    :param ub2: Value above which values returned from func2 are ignored
+    :return: A matrix of counts, indexed by the bin of func1 then the bin of func2
     """
-    lb1, ub1 = floor(lb1), ceil(ub1)
-    lb2, ub2 = floor(lb2), ceil(ub2)
-    data1, data2 = [], []
-    for deal in deals:
-        data1.append(round(func1(deal)))
-        data2.append(round(func2(deal)))
-    bins1 = list(range(lb1, ub1 + 1))
-    bins2 = list(range(lb2, ub2 + 1))
-    hist = [[0 for _ in bins2] for _ in bins1]
-    for val1 in data1:
-        if not (lb1 <= val1 <= ub1):
-            continue
-        for val2 in data2:
-            if not (lb2 <= val2 <= ub2):
-                continue
-            hist[val1 - bins1[0]][val2 - bins2[0]] += 1
-    return hist
+    hist = Histogram2D(lb1, ub1, lb2, ub2)
+    hist.update((func1(deal), func2(deal)) for deal in deals)
+    return hist.counts
+
+
+def stopping_rule(
+    *stats: tuple[Expr, Union[Summary, Histogram]],
+    precision: float,
+    level: float = 0.95,
+    min_count: int = 100,
+    resolution: float = 1.0,
+) -> Callable[[Deal], bool]:
+    """
+    Create a function which adds the values of each deal to a set of accumulators and
+    returns True once every estimate is known to the desired precision. This can be
+    passed as the `until` argument of :func:`endplay.dealer.generate_deals` to produce
+    deals only until the estimates have converged.
+
+    :param stats: Pairs of a function and the accumulator to add its values to. The
+            precision of a :class:`Summary` is that of its mean, and the precision of
+            a :class:`Histogram` is that of the proportion in its least precise bin
+    :param precision: The target half-width of the confidence intervals
+    :param level: The confidence level of the intervals
+    :param min_count: The minimum number of deals before stopping, so that the
+            normal approximation used for the intervals is reasonable
+    :param resolution: The smallest difference between two values of the functions
+            with a :class:`Summary`, see :meth:`Summary.halfwidth`. This stops an
+            average of a rare event from converging before the event has occurred
+    """
+
+    def precise(acc: Union[Summary, Histogram]) -> bool:
+        if isinstance(acc, Summary):
+            return acc.halfwidth(level, resolution) <= precision
+        return acc.halfwidth(level) <= precision
+
+    def rule(deal: Deal) -> bool:
+        for func, acc in stats:
+            acc.add(func(deal))
+        count = stats[0][1].count if stats else 0
+        if count < min_count:
+            return False
+        return all(precise(acc) for _, acc in stats)
+
+    return rule
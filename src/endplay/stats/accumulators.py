@@ -0,0 +1,428 @@
+"""
+Accumulators which collect statistics from a stream of values one at a time.
+Accumulators for the same statistic can be merged, so a simulation can be
+split between several workers and the results of each combined at the end.
+"""
+
+from __future__ import annotations
+
+__all__ = ["Accumulator", "Summary", "Histogram", "Histogram2D", "QuantileSketch"]
+
+import math
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Iterable
+from statistics import NormalDist
+from typing import Union
+
+import numpy as np
+
+
+def _z(level: float) -> float:
+    "The two-sided critical value of the normal distribution for a confidence level"
+    if not 0 < level < 1:
+        raise ValueError("level must be between 0 and 1")
+    return NormalDist().inv_cdf(0.5 + level / 2)
+
+
+class Accumulator(ABC):
+    "Base class for objects which accumulate statistics from a stream of values"
+
+    @abstractmethod
+    def add(self, value: float) -> None:
+        "Add a single value"
+
+    def update(self, values: Union[Iterable[float], np.ndarray]) -> Accumulator:
+        "Add every value in an iterable or array, returning the accumulator"
+        for value in values:
+            self.add(value)
+        return self
+
+    @abstractmethod
+    def merge(self, other: Accumulator) -> Accumulator:
+        """
+        Combine the values added to another accumulator into this one, returning
+        this accumulator
+        """
+
+    def _check_mergeable(self, other: Accumulator) -> None:
+        if type(other) is not type(self):
+            raise TypeError(
+                f"Cannot merge {type(other).__name__} into {type(self).__name__}"
+            )
+
+
+class Summary(Accumulator):
+    """
+    Accumulator for the count, mean, variance, minimum and maximum of a stream of
+    values. The mean and variance are updated with Welford's algorithm, which is
+    numerically stable for long streams.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = math.nan
+        self.min = math.inf
+        self.max = -math.inf
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if self.count == 1:
+            self.mean = float(value)
+        else:
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def update(self, values: Union[Iterable[float], np.ndarray]) -> Summary:
+        if isinstance(values, np.ndarray):
+            # Summarise the whole array at once and merge it in
+            batch = Summary()
+            batch.count = values.size
+            if batch.count > 0:
+                batch.mean = float(np.mean(values))
+                batch.min, batch.max = values.min().item(), values.max().item()
+                batch._m2 = float(np.sum((values - batch.mean) ** 2))
+            return self.merge(batch)
+        super().update(values)
+        return self
+
+    def merge(self, other: Accumulator) -> Summary:
+        self._check_mergeable(other)
+        assert isinstance(other, Summary)
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+        else:
+            count = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / count
+            self._m2 += other._m2 + delta**2 * self.count * other.count / count
+            self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        "The sample variance of the values, or NaN if fewer than two were added"
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        "The sample standard deviation of the values"
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self) -> float:
+        "The standard error of the mean"
+        return math.sqrt(self.variance / self.count) if self.count > 1 else math.nan
+
+    def confidence_interval(self, level: float = 0.95) -> tuple[float, float]:
+        """
+        A confidence interval for the mean, using the normal approximation
+
+        :param level: The confidence level of the interval
+        """
+        h = self.halfwidth(level)
+        return (self.mean - h, self.mean + h)
+
+    def halfwidth(self, level: float = 0.95, resolution: float = 0.0) -> float:
+        """
+        Half the width of the confidence interval for the mean, i.e. the precision
+        to which the mean is known
+
+        :param level: The confidence level of the interval
+        :param resolution: The smallest difference there can be between two values.
+                If given, the variance is taken to be at least what it would be if one
+                of the values had differed by this much, so that a run of identical
+                values (e.g. of a rare event) is not treated as known exactly
+        """
+        if self.count < 2:
+            return math.nan
+        variance = max(self.variance, resolution**2 / self.count)
+        return _z(level) * math.sqrt(variance / self.count)
+
+    def __repr__(self) -> str:
+        return f"<Summary count={self.count} mean={self.mean} stderr={self.stderr}>"
+
+
+class Histogram(Accumulator):
+    """
+    Accumulator which rounds values to the nearest integer and counts them in
+    unit-sized bins from `lb` to `ub` inclusive. Values outside this range are
+    counted in `underflow` and `overflow`.
+
+    :param lb: The value of the lowest bin
+    :param ub: The value of the highest bin
+    """
+
+    def __init__(self, lb: int, ub: int):
+        self.lb, self.ub = math.floor(lb), math.ceil(ub)
+        if self.ub < self.lb:
+            raise ValueError("ub must not be less than lb")
+        self._counts = np.zeros(self.ub - self.lb + 1, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def add(self, value: float) -> None:
+        val = round(value)
+        if val < self.lb:
+            self.underflow += 1
+        elif val > self.ub:
+            self.overflow += 1
+        else:
+            self._counts[val - self.lb] += 1
+
+    def update(self, values: Union[Iterable[float], np.ndarray]) -> Histogram:
+        if isinstance(values, np.ndarray):
+            # np.rint rounds halves to even in the same way as round
+            vals = np.rint(values).astype(np.int64).ravel() - self.lb
+            inside = (vals >= 0) & (vals < len(self._counts))
+            self.underflow += int(np.count_nonzero(vals < 0))
+            self.overflow += int(np.count_nonzero(vals >= len(self._counts)))
+            self._counts += np.bincount(vals[inside], minlength=len(self._counts))
+            return self
+        super().update(values)
+        return self
+
+    def merge(self, other: Accumulator) -> Histogram:
+        self._check_mergeable(other)
+        assert isinstance(other, Histogram)
+        if (other.lb, other.ub) != (self.lb, self.ub):
+            raise ValueError("Cannot merge histograms with different bins")
+        self._counts += other._counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    @property
+    def count(self) -> int:
+        "The total number of values added, including those outside the bins"
+        return int(self._counts.sum()) + self.underflow + self.overflow
+
+    @property
+    def counts(self) -> list[int]:
+        "The number of values in each bin"
+        return self._counts.tolist()
+
+    @property
+    def proportions(self) -> list[float]:
+        "The proportion of all the values added which fell in each bin"
+        n = self.count
+        return [c / n if n else math.nan for c in self.counts]
+
+    @property
+    def stderr(self) -> list[float]:
+        "The standard error of the proportion in each bin"
+        n = self.count
+        return [math.sqrt(p * (1 - p) / n) if n else math.nan for p in self.proportions]
+
+    def confidence_interval(self, level: float = 0.95) -> list[tuple[float, float]]:
+        """
+        A Wilson score interval for the proportion in each bin. Unlike the normal
+        approximation these stay inside [0, 1], and have a non-zero width for a bin
+        which is empty or holds every value
+
+        :param level: The confidence level of the intervals
+        """
+        n = self.count
+        if n == 0:
+            return [(math.nan, math.nan)] * len(self._counts)
+        z = _z(level)
+        scale = 1 + z**2 / n
+        intervals = []
+        for p in self.proportions:
+            centre = (p + z**2 / (2 * n)) / scale
+            h = z * math.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / scale
+            intervals.append((centre - h, centre + h))
+        return intervals
+
+    def halfwidth(self, level: float = 0.95) -> float:
+        """
+        Half the width of the widest confidence interval for the proportion in a bin,
+        i.e. the precision to which every proportion is known
+
+        :param level: The confidence level of the intervals
+        """
+        if self.count == 0:
+            return math.nan
+        return max((hi - lo) / 2 for lo, hi in self.confidence_interval(level))
+
+    def __repr__(self) -> str:
+        return f"<Histogram lb={self.lb} ub={self.ub} count={self.count}>"
+
+
+class Histogram2D(Accumulator):
+    """
+    Accumulator for the joint distribution of pairs of values. Each value is
+    rounded to the nearest integer and the pairs are counted in unit-sized bins
+    from `lb1` to `ub1` in the first value and from `lb2` to `ub2` in the second.
+    Pairs where either value lies outside its range are counted in `outside`.
+
+    :param lb1: The value of the lowest bin of the first value
+    :param ub1: The value of the highest bin of the first value
+    :param lb2: The value of the lowest bin of the second value
+    :param ub2: The value of the highest bin of the second value
+    """
+
+    def __init__(self, lb1: int, ub1: int, lb2: int, ub2: int):
+        self.lb1, self.ub1 = math.floor(lb1), math.ceil(ub1)
+        self.lb2, self.ub2 = math.floor(lb2), math.ceil(ub2)
+        if self.ub1 < self.lb1 or self.ub2 < self.lb2:
+            raise ValueError("upper bounds must not be less than lower bounds")
+        self._counts = np.zeros(
+            (self.ub1 - self.lb1 + 1, self.ub2 - self.lb2 + 1), dtype=np.int64
+        )
+        self.outside = 0
+
+    def add(self, value: tuple[float, float]) -> None:  # type: ignore[override]
+        val1, val2 = round(value[0]), round(value[1])
+        if self.lb1 <= val1 <= self.ub1 and self.lb2 <= val2 <= self.ub2:
+            self._counts[val1 - self.lb1, val2 - self.lb2] += 1
+        else:
+            self.outside += 1
+
+    def update(  # type: ignore[override]
+        self, values: Union[Iterable[tuple[float, float]], np.ndarray]
+    ) -> Histogram2D:
+        """
+        Add every pair in an iterable, or in an array with shape (n, 2), returning
+        the accumulator
+        """
+        if isinstance(values, np.ndarray):
+            vals = np.rint(values).astype(np.int64).reshape(-1, 2)
+            i, j = vals[:, 0] - self.lb1, vals[:, 1] - self.lb2
+            n1, n2 = self._counts.shape
+            inside = (i >= 0) & (i < n1) & (j >= 0) & (j < n2)
+            self.outside += int(np.count_nonzero(~inside))
+            flat = np.bincount(i[inside] * n2 + j[inside], minlength=n1 * n2)
+            self._counts += flat.reshape(n1, n2)
+            return self
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: Accumulator) -> Histogram2D:
+        self._check_mergeable(other)
+        assert isinstance(other, Histogram2D)
+        if (other.lb1, other.ub1, other.lb2, other.ub2) != (
+            self.lb1,
+            self.ub1,
+            self.lb2,
+            self.ub2,
+        ):
+            raise ValueError("Cannot merge histograms with different bins")
+        self._counts += other._counts
+        self.outside += other.outside
+        return self
+
+    @property
+    def count(self) -> int:
+        "The total number of pairs added, including those outside the bins"
+        return int(self._counts.sum()) + self.outside
+
+    @property
+    def counts(self) -> list[list[int]]:
+        "The number of pairs in each bin, indexed by the first value then the second"
+        return self._counts.tolist()
+
+    def __repr__(self) -> str:
+        return (
+            f"<Histogram2D lb1={self.lb1} ub1={self.ub1} lb2={self.lb2} "
+            f"ub2={self.ub2} count={self.count}>"
+        )
+
+
+class QuantileSketch(Accumulator):
+    """
+    Accumulator for estimating quantiles. Values are rounded to a multiple of
+    `resolution` and counted, so the memory used depends on the range of the
+    values rather than how many there are. Quantiles of values which are all
+    multiples of `resolution` (such as point counts or tricks with the default
+    resolution) are exact, and otherwise are accurate to half the resolution.
+
+    :param resolution: The precision to which values are recorded
+    """
+
+    def __init__(self, resolution: float = 1.0):
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        self.resolution = resolution
+        self._counts: Counter[int] = Counter()
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self._counts[round(value / self.resolution)] += 1
+        self.count += 1
+
+    def update(self, values: Union[Iterable[float], np.ndarray]) -> QuantileSketch:
+        if isinstance(values, np.ndarray):
+            keys, counts = np.unique(
+                np.rint(values / self.resolution).astype(np.int64), return_counts=True
+            )
+            self._counts.update(dict(zip(keys.tolist(), counts.tolist())))
+            self.count += int(counts.sum())
+            return self
+        super().update(values)
+        return self
+
+    def merge(self, other: Accumulator) -> QuantileSketch:
+        self._check_mergeable(other)
+        assert isinstance(other, QuantileSketch)
+        if other.resolution != self.resolution:
+            raise ValueError("Cannot merge sketches with different resolutions")
+        self._counts.update(other._counts)
+        self.count += other.count
+        return self
+
+    def _value_at_rank(self, rank: int) -> float:
+        "The value with the given 0-based rank in the sorted values"
+        cum = 0
+        for key in sorted(self._counts):
+            cum += self._counts[key]
+            if cum > rank:
+                return key * self.resolution
+        raise IndexError("rank out of range")
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile of the values, using the lower of the two values when
+        the quantile falls between them
+
+        :param q: The quantile to estimate, between 0 and 1
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return math.nan
+        rank = math.ceil(q * self.count) - 1
+        return self._value_at_rank(min(self.count - 1, max(0, rank)))
+
+    @property
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def confidence_interval(self, q: float, level: float = 0.95) -> tuple[float, float]:
+        """
+        A distribution-free confidence interval for a quantile, found from the
+        normal approximation to the binomial distribution of its rank
+
+        :param q: The quantile, between 0 and 1
+        :param level: The confidence level of the interval
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return (math.nan, math.nan)
+        h = _z(level) * math.sqrt(self.count * q * (1 - q))
+        lo = max(0, math.floor(self.count * q - h) - 1)
+        hi = min(self.count - 1, math.ceil(self.count * q + h) - 1)
+        return (self._value_at_rank(lo), self._value_at_rank(hi))
+
+    def __repr__(self) -> str:
+        return f"<QuantileSketch resolution={self.resolution} count={self.count}>"
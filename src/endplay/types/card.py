@@ -3,6 +3,7 @@ __all__ = ["Card"]
 from dataclasses import dataclass
 from typing import Optional
 
+import endplay.config as config
 from endplay.types.denom import Denom
 from endplay.types.rank import Rank
 
@@ -10,7 +11,11 @@ from endplay.types.rank import Rank
 @dataclass(frozen=True)
 class Card:
     """
-    Immutabale class representing a card with `suit` and `rank` read-only attributes
+    Immutabale class representing a card with `suit` and `rank` read-only attributes.
+
+    Cards are flyweights: there is exactly one instance of each card, which is
+    created when the module is loaded, and constructing a card returns that
+    instance rather than allocating a new object.
 
     :ivar suit: The suit of the card
     :vartype suit: Denom
@@ -21,6 +26,30 @@ class Card:
     rank: Rank
     suit: Denom
 
+    def __new__(
+        cls,
+        name: Optional[str] = None,
+        *,
+        suit: Optional[Denom] = None,
+        rank: Optional[Rank] = None,
+    ) -> "Card":
+        if name is None:
+            if suit is None or rank is None:
+                raise ValueError("either name or both suit and rank must be defined")
+        else:
+            card = _card_names.get(name[:2])
+            if card is not None:
+                return card
+            # Not a known name, use the slow path to get a good error message
+            suit = Denom.find(name[0:1])
+            rank = Rank.find(name[1:2])
+
+        if not isinstance(suit, Denom):
+            raise ValueError("suit must be of type Denom")
+        if not isinstance(rank, Rank):
+            raise ValueError("rank must be of type Rank")
+        return _cards[13 * suit + _rank_index[rank]]
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -35,22 +64,85 @@ class Card:
         :param suit: The suit of the card
         :param rank: The rank of the card
         """
-        if name is None:
-            if suit is None or rank is None:
-                raise ValueError("either name or both suit and rank must be defined")
-            object.__setattr__(self, "suit", suit)
-            object.__setattr__(self, "rank", rank)
-        else:
-            suit = Denom.find(name[0])
-            rank = Rank.find(name[1])
+        # The returned instance is fully initialised by __new__
+        pass
 
-        if not isinstance(suit, Denom):
-            raise ValueError("suit must be of type Denom")
-        object.__setattr__(self, "suit", suit)
+    @staticmethod
+    def from_index(index: int) -> "Card":
+        """
+        Return the card with the given index, where the cards are numbered from 0 to 51
+        in the order S2, S3, ..., SA, H2, ..., CA
 
-        if not isinstance(rank, Rank):
-            raise ValueError("rank must be of type Rank")
-        object.__setattr__(self, "rank", rank)
+        :param index: The index of the card
+        """
+        if not 0 <= index < 52:
+            raise ValueError(
+                f"card index must be in range 0 <= index < 52, got {index}"
+            )
+        return _cards[index]
+
+    @staticmethod
+    def from_bits(suit: int, bits: int) -> "Card":
+        """
+        Return the card with the given suit and rank, where the rank is given as a
+        bitmask with a single bit set using the same encoding as :class:`Rank` (and
+        the `remainCards` holdings of a `_dds.deal`)
+
+        :param suit: The suit of the card, as a Denom or its integer value
+        :param bits: The rank of the card, e.g. 0x4000 or Rank.RA for the ace
+        """
+        try:
+            return _cards[13 * suit + _rank_index[bits]]
+        except (KeyError, IndexError):
+            raise ValueError(f"could not convert suit {suit} and bits {bits} to Card")
+
+    @property
+    def index(self) -> int:
+        "The index of the card as used by :meth:`from_index`"
+        return self._index  # type: ignore[attr-defined]
+
+    def __copy__(self) -> "Card":
+        return self
+
+    def __deepcopy__(self, memo) -> "Card":
+        return self
+
+    def __reduce__(self):
+        return (_card_from_index, (self.index,))
 
     def __str__(self) -> str:
-        return f"{self.suit.abbr}{self.rank.abbr}"
+        return _card_strs[config.use_unicode][self.index]
+
+
+def _card_from_index(index: int) -> Card:
+    # Used to unpickle cards so that they stay interned; unlike `Card.from_index`
+    # this also accepts the cards with the `Denom.nt` suit used as placeholders
+    # in play histories
+    return _cards[index]
+
+
+# Build the interned cards. The cards of the four suits take the indices 0-51,
+# and these are followed by the placeholder cards with a notrumps suit
+_rank_index = {rank.value: i for i, rank in enumerate(Rank)}
+_cards: list[Card] = []
+for _suit in Denom:
+    for _rank in Rank:
+        _card = object.__new__(Card)
+        object.__setattr__(_card, "suit", _suit)
+        object.__setattr__(_card, "rank", _rank)
+        object.__setattr__(_card, "_index", len(_cards))
+        _cards.append(_card)
+
+_card_names: dict[str, Card] = {}
+for _card in _cards:
+    for _s in (_card.suit.name[0], "♠♥♦♣N"[_card.suit], "♤♡♢♧N"[_card.suit]):
+        for _r in (_card.rank.abbr, _card.rank.abbr.lower()):
+            _card_names[_s.upper() + _r] = _card
+            _card_names[_s.lower() + _r] = _card
+
+# String representations of each card, indexed first by `config.use_unicode`
+_card_strs = (
+    [("S", "H", "D", "C", "NT")[c.suit] + c.rank.abbr for c in _cards],
+    [("♠", "♥", "♦", "♣", "NT")[c.suit] + c.rank.abbr for c in _cards],
+)
+del _suit, _rank, _card, _s, _r
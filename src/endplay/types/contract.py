@@ -170,88 +170,13 @@ class Contract:
         "The number of points the contract would score for the declarer"
         if self.is_passout():
             return 0
-        if vul == Vul.none:
-            is_vul = False
-        elif vul == Vul.ns:
-            is_vul = self.declarer in (Player.north, Player.south)
-        elif vul == Vul.ew:
-            is_vul = self.declarer in (Player.east, Player.west)
-        else:
-            is_vul = True
-        res = self.result
-        if res < 0:
-            if self.penalty == Penalty.passed:
-                if is_vul:
-                    return 100 * res
-                else:
-                    return 50 * res
-            elif self.penalty == Penalty.doubled:
-                if is_vul:
-                    s = [-200] + [-300] * 12
-                    return sum(s[:-res])
-                else:
-                    s = [-100] + [-200] * 2 + [-300] * 10
-                    return sum(s[:-res])
-            elif self.penalty == Penalty.redoubled:
-                if is_vul:
-                    s = [-400] + [-600] * 12
-                    return sum(s[:-res])
-                else:
-                    s = [-200] + [-400] * 2 + [-600] * 10
-                    return sum(s[:-res])
-            else:
-                raise ValueError(f"Unknown penalty {self.penalty}")
-        else:
-            d, l = self.denom, self.level
-            # Contract score
-            if d == Denom.clubs or d == Denom.diamonds:
-                score = 20 * l
-            else:
-                score = 30 * l
-            if d == Denom.nt:
-                score += 10
-            score *= self.penalty
-            # Game/part-score bonus
-            if score >= 100:
-                if is_vul:
-                    score += 500
-                else:
-                    score += 300
-            else:
-                score += 50
-            # Slam bonuses
-            if l == 6:
-                if is_vul:
-                    score += 750
-                else:
-                    score += 500
-            elif l == 7:
-                if is_vul:
-                    score += 1500
-                else:
-                    score += 1000
-            # Insult bonus
-            if self.penalty == Penalty.doubled:
-                score += 50
-            elif self.penalty == Penalty.redoubled:
-                score += 100
-            # Overtrick bonus
-            if self.penalty == Penalty.passed:
-                if self.denom == Denom.clubs or self.denom == Denom.diamonds:
-                    score += 20 * res
-                else:
-                    score += 30 * res
-            elif self.penalty == Penalty.doubled:
-                if is_vul:
-                    score += 200 * res
-                else:
-                    score += 100 * res
-            else:
-                if is_vul:
-                    score += 400 * res
-                else:
-                    score += 200 * res
-            return score
+        return _lookup_score(
+            self.level,
+            self.denom,
+            self.penalty,
+            self.declarer.is_vul(vul),
+            self.result,
+        )
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Contract):
@@ -272,3 +197,115 @@ class Contract:
             return "Pass"
         s = f"{self.level}{self.denom.abbr}{self.declarer.abbr}{self.penalty.abbr}"
         return s + ("=" if self.result == 0 else f"{self.result:+d}")
+
+
+def _compute_score(
+    level: int, denom: Denom, penalty: Penalty, is_vul: bool, res: int
+) -> int:
+    "Calculate the score of a contract, used to fill `_score_table`"
+    if res < 0:
+        if penalty == Penalty.passed:
+            if is_vul:
+                return 100 * res
+            else:
+                return 50 * res
+        elif penalty == Penalty.doubled:
+            if is_vul:
+                s = [-200] + [-300] * 12
+                return sum(s[:-res])
+            else:
+                s = [-100] + [-200] * 2 + [-300] * 10
+                return sum(s[:-res])
+        elif penalty == Penalty.redoubled:
+            if is_vul:
+                s = [-400] + [-600] * 12
+                return sum(s[:-res])
+            else:
+                s = [-200] + [-400] * 2 + [-600] * 10
+                return sum(s[:-res])
+        else:
+            raise ValueError(f"Unknown penalty {penalty}")
+    else:
+        d, l = denom, level
+        # Contract score
+        if d == Denom.clubs or d == Denom.diamonds:
+            score = 20 * l
+        else:
+            score = 30 * l
+        if d == Denom.nt:
+            score += 10
+        score *= penalty
+        # Game/part-score bonus
+        if score >= 100:
+            if is_vul:
+                score += 500
+            else:
+                score += 300
+        else:
+            score += 50
+        # Slam bonuses
+        if l == 6:
+            if is_vul:
+                score += 750
+            else:
+                score += 500
+        elif l == 7:
+            if is_vul:
+                score += 1500
+            else:
+                score += 1000
+        # Insult bonus
+        if penalty == Penalty.doubled:
+            score += 50
+        elif penalty == Penalty.redoubled:
+            score += 100
+        # Overtrick bonus
+        if penalty == Penalty.passed:
+            if denom == Denom.clubs or denom == Denom.diamonds:
+                score += 20 * res
+            else:
+                score += 30 * res
+        elif penalty == Penalty.doubled:
+            if is_vul:
+                score += 200 * res
+            else:
+                score += 100 * res
+        else:
+            if is_vul:
+                score += 400 * res
+            else:
+                score += 200 * res
+        return score
+
+
+# The score of every contract outcome for the declaring side, indexed by
+# [level][denom][penalty >> 1][is_vul][result + 13]. Level 0 is the passout
+# and scores zero, and impossible results (e.g. 1NT+7) are filled with the
+# score the formula would give
+_score_table: list[list[list[list[list[int]]]]] = [
+    [
+        [
+            [
+                [
+                    _compute_score(level, denom, penalty, is_vul, res) if level else 0
+                    for res in range(-13, 7)
+                ]
+                for is_vul in (False, True)
+            ]
+            for penalty in Penalty
+        ]
+        for denom in Denom
+    ]
+    for level in range(8)
+]
+
+
+def _lookup_score(
+    level: int, denom: Denom, penalty: Penalty, is_vul: bool, res: int
+) -> int:
+    "Look up the score of a contract in `_score_table`"
+    if not 0 <= level <= 7:
+        raise ValueError(f"Invalid contract level {level}")
+    if not -13 <= res <= 6:
+        raise ValueError(f"Invalid result {res} for contract")
+    return _score_table[level][denom][penalty >> 1][is_vul][res + 13]
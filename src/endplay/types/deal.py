@@ -11,9 +11,10 @@ from typing import Optional, Union
 import endplay._dds as _dds
 from endplay.types.card import Card
 from endplay.types.denom import Denom
-from endplay.types.hand import Hand
+from endplay.types.hand import _FULL_HAND, Hand, _card_bits, _lin_mask
 from endplay.types.player import Player
-from endplay.types.rank import AlternateRank, Rank
+from endplay.types.rank import Rank
+from endplay.types.suitholding import _popcount
 from endplay.types.vul import Vul
 
 SIZEOF_TRICK = ctypes.sizeof(ctypes.c_int) * 3
@@ -147,24 +148,66 @@ class Deal:
             suit, rank = self._data.currentTrickSuit[i], self._data.currentTrickRank[i]
             if rank == 0:
                 break
-            trick.append(Card(suit=Denom(suit), rank=AlternateRank(rank).to_standard()))
+            trick.append(Card.from_bits(suit, 1 << rank))
         return trick
 
-    def legal_moves(self) -> list[Card]:
+    def legal_moves(
+        self, collapse_equals: bool = False, optimal: bool = False
+    ) -> list[Card]:
         """
-        Returns the cards in the player on lead's hand which are legal to play
+        Returns the cards in the player on lead's hand which are legal to play,
+        ordered by suit (starting with spades) and then by increasing rank
+
+        :param collapse_equals: If True, only return the highest card of each
+                sequence of cards which are equivalent because all the cards
+                ranked between them have already been played
+        :param optimal: If True, use the double dummy solver to order the cards
+                from best to worst. This is much slower than the default
         """
         if len(self.curhand) == 0:
             return []
+        if optimal:
+            return self._solved_moves(collapse_equals)
 
+        holdings = self.curhand._data
+        if self._data.currentTrickRank[0] != 0:
+            led = self._data.currentTrickSuit[0]
+            suits: Iterable[int] = (led,) if holdings[led] else range(4)
+        else:
+            suits = range(4)
+        rc = self._data.remainCards
+        # Cards on the table have left the hands but can still win this trick,
+        # so they separate sequences in the same way as cards in the hands do
+        table = [0, 0, 0, 0]
+        for i in range(3):
+            if self._data.currentTrickRank[i] == 0:
+                break
+            table[self._data.currentTrickSuit[i]] |= 1 << self._data.currentTrickRank[i]
+        res: list[Card] = []
+        for suit in suits:
+            holding = holdings[suit]
+            if collapse_equals:
+                remaining = rc[0][suit] | rc[1][suit] | rc[2][suit] | rc[3][suit]
+                holding = _top_of_sequences(holding, remaining | table[suit])
+            while holding:
+                bit = holding & -holding
+                res.append(Card.from_bits(suit, bit))
+                holding ^= bit
+        return res
+
+    def _solved_moves(self, collapse_equals: bool) -> list[Card]:
+        "Legal moves ordered by the double dummy solver, best first"
         fut = _dds.futureTricks()
         _dds.SolveBoard(self._data, 0, 2, 1, fut, 0)
         res: list[Card] = []
         for i in range(fut.cards):
+            if collapse_equals:
+                res.append(Card.from_bits(fut.suit[i], 1 << fut.rank[i]))
+                continue
             holding = (1 << fut.rank[i]) | fut.equals[i]
             for rank in Rank:
                 if holding & rank.value:
-                    res += [Card(suit=Denom(fut.suit[i]), rank=rank)]
+                    res.append(Card.from_bits(fut.suit[i], rank))
         return res
 
     def play(self, card: Union[Card, str], from_hand: bool = True) -> None:
@@ -213,19 +256,50 @@ class Deal:
             if rank != 0:
                 self._data.currentTrickRank[i] = 0
                 self._data.currentTrickSuit[i] = 0
-                card = Card(suit=Denom(suit), rank=AlternateRank(rank).to_standard())
+                card = Card.from_bits(suit, 1 << rank)
                 if to_hand:
                     self[self.first.next(i)].add(card)
                 return card
         else:
             raise RuntimeError("No cards to unplay")
 
+    @property
+    def mask(self) -> int:
+        """
+        A bitmask of all the cards held in the four hands, encoded as in
+        :attr:`Hand.mask`
+        """
+        rc, mask = self._data.remainCards, 0
+        for suit in range(4):
+            holding = rc[0][suit] | rc[1][suit] | rc[2][suit] | rc[3][suit]
+            mask |= holding << (16 * suit)
+        return mask
+
+    def add_mask(self, player: Player, mask: int) -> int:
+        """
+        Add all the cards in a bitmask to the hand of a player
+
+        :param player: The player to add the cards to
+        :param mask: A bitmask of the cards to add, encoded as in :attr:`Hand.mask`
+        :return: The number of cards which were not already in the hand
+        """
+        return self[player].add_mask(mask)
+
+    def remove_mask(self, player: Player, mask: int) -> int:
+        """
+        Remove all the cards in a bitmask from the hand of a player
+
+        :param player: The player to remove the cards from
+        :param mask: A bitmask of the cards to remove, encoded as in :attr:`Hand.mask`
+        :return: The number of cards which were in the hand
+        """
+        return self[player].remove_mask(mask)
+
     def complete_deal(self) -> None:
         """
         If there is a player with no cards, deal any cards which do not appear
         in anyone else's hand to that player
         """
-        remaining = Hand("AKQJT98765432.AKQJT98765432.AKQJT98765432.AKQJT98765432")
         missing_hand = None
         for player, hand in self:
             if len(hand) == 0:
@@ -234,15 +308,16 @@ class Deal:
                         "Cannot complete a deal with more than one missing hand"
                     )
                 missing_hand = player
-            else:
-                for card in hand:
-                    remaining.remove(card)
         if missing_hand is not None:
-            if len(remaining) != 13:
+            remaining = _FULL_HAND & ~self.mask
+            n_remaining = sum(
+                _popcount((remaining >> shift) & 0xFFFF) for shift in (0, 16, 32, 48)
+            )
+            if n_remaining != 13:
                 raise ValueError(
                     "Cannot complete a deal with more than 13 undealt cards"
                 )
-            self[missing_hand] = remaining
+            self.add_mask(missing_hand, remaining)
 
     @staticmethod
     def from_pbn(pbn: str) -> "Deal":
@@ -303,7 +378,7 @@ class Deal:
             hands = lin.split(",")
         deal = Deal()
         for player, hand in zip(Player.iter_from(Player.south), hands):
-            deal[player] = Hand.from_lin(hand)
+            deal.add_mask(player, _lin_mask(hand))
         if complete_deal:
             deal.complete_deal()
         return deal
@@ -368,10 +443,7 @@ class Deal:
 
     def to_hand(self) -> Hand:
         "Return a new hand containing the contents of all four hands in the deal"
-        res = Hand()
-        for _, hand in self:
-            res.extend(hand)
-        return res
+        return Hand.from_mask(self.mask)
 
     def rotate(self, n: int) -> None:
         "Rotate clockwise by n quarter-turns, e.g. with n=1 NESW -> WNES"
@@ -407,7 +479,20 @@ class Deal:
 
     def clear(self) -> None:
         "Clear all hands and the cards in the current trick"
-        self._data = _dds.deal()
+        self._set_data(_dds.deal())
+
+    def _set_data(self, data: _dds.deal) -> None:
+        self._data = data
+        # Persistent views over each row of remainCards, returned by __getitem__.
+        # Everything else which modifies the hands (including rotate and swap)
+        # does so in place, so these only need rebuilding when _data is replaced
+        self._hands = tuple(Hand(self._data.remainCards[player]) for player in Player)
+
+    def __getstate__(self) -> bytes:
+        return bytes(self._data)
+
+    def __setstate__(self, state: bytes) -> None:
+        self._set_data(_dds.deal.from_buffer_copy(state))
 
     def pprint(
         self,
@@ -469,15 +554,15 @@ class Deal:
 
     def __contains__(self, card: Union[Card, str]) -> bool:
         ":return: True if card is in the current deal"
-        return any(card in hand for _, hand in self)
+        return bool(self.mask & _card_bits(card))
 
     def __iter__(self) -> Iterator[tuple[Player, Hand]]:
         ":return: An iterator over the north, east, south and west hands respectively"
-        yield from ((player, self[player]) for player in Player)
+        return zip(Player, self._hands)
 
     def __getitem__(self, player: Player) -> Hand:
         ":return: The specified hand"
-        return Hand(self._data.remainCards[player])
+        return self._hands[player]
 
     def __setitem__(self, player: Player, hand: Union[Hand, str]) -> None:
         "Set the hand to the specified hand, which may be in the format of a PBN string"
@@ -487,9 +572,7 @@ class Deal:
 
     def compare(self, other: Deal, hands_only: bool = False) -> bool:
         cmp = _dds._libc.memcmp
-        if cmp(
-            self._data.remainCards, other._data.remainCards, len(self._data.remainCards)
-        ):
+        if any(self[player].mask != other[player].mask for player in Player):
             return False
         if hands_only:
             return True
@@ -523,3 +606,18 @@ class Deal:
     def __str__(self) -> str:
         ":return: A PBN string representation of the deal"
         return self.to_pbn()
+
+
+def _top_of_sequences(holding: int, remaining: int) -> int:
+    """
+    Remove the cards from `holding` which are equivalent to the next higher card
+    in `remaining`, i.e. keep only the top card of each sequence
+    """
+    res, bits = 0, holding
+    while bits:
+        bit = bits & -bits
+        bits ^= bit
+        higher = remaining & ~((bit << 1) - 1)
+        if not (higher & -higher) & holding:
+            res |= bit
+    return res
@@ -18,10 +18,8 @@ class Denom(IntEnum):
     def find(name: str) -> "Denom":
         "Convert a string value into a Denom object"
         try:
-            if name == "":
-                raise ValueError
-            return Denom("SHDCN♠♥♦♣N♤♡♢♧".index(name[0].upper()) % 5)
-        except ValueError:
+            return _denom_names[name[0]]
+        except (IndexError, KeyError):
             raise ValueError(f"Could not convert {name} into a Denom object")
 
     @staticmethod
@@ -64,3 +62,11 @@ class Denom(IntEnum):
             return "♠♥♦♣"[self]
         else:
             return "SHDC"[self]
+
+
+# Lookup table from the first character of a name to the denomination it refers to
+_denom_names = {
+    c: Denom(i % 5)
+    for i, char in enumerate("SHDCN♠♥♦♣N♤♡♢♧")
+    for c in (char, char.lower())
+}
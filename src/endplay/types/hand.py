@@ -5,14 +5,13 @@ __all__ = ["Hand"]
 import ctypes
 import sys
 from collections.abc import Iterable, Iterator
-from typing import Union
+from typing import Optional, Union
 
-import endplay._dds as _dds
 from endplay.config import suppress_unicode
 from endplay.types.card import Card
 from endplay.types.denom import Denom
 from endplay.types.rank import Rank
-from endplay.types.suitholding import SuitHolding
+from endplay.types.suitholding import _FULL_SUIT, SuitHolding, _popcount
 
 
 class Hand:
@@ -36,6 +35,10 @@ class Hand:
                     self._data[i] |= Rank.find(rank).value
         else:
             self._data = data
+        self._suits: Optional[tuple[SuitHolding, ...]] = None
+
+    def __reduce__(self):
+        return (Hand.from_mask, (self.mask,))
 
     def __copy__(self) -> "Hand":
         return Hand((ctypes.c_uint * 4).from_buffer_copy(self._data))
@@ -43,6 +46,77 @@ class Hand:
     def copy(self) -> "Hand":
         return self.__copy__()
 
+    @property
+    def mask(self) -> int:
+        """
+        The hand as a bitmask, with the holding of each suit (encoded as in
+        :attr:`SuitHolding.mask`) shifted left by 16 bits for hearts, 32 bits for
+        diamonds and 48 bits for clubs
+        """
+        data = self._data
+        return data[0] | (data[1] << 16) | (data[2] << 32) | (data[3] << 48)
+
+    @staticmethod
+    def from_mask(mask: int) -> "Hand":
+        """
+        Construct a Hand from a bitmask as returned by :attr:`mask`
+        """
+        hand = Hand()
+        hand.add_mask(mask)
+        return hand
+
+    def add_mask(self, mask: int) -> int:
+        """
+        Add all the cards in a bitmask to the hand
+
+        :param mask: A bitmask of the cards to add
+        :return: The number of cards which were not already in the hand
+        """
+        if mask & ~_FULL_HAND:
+            raise ValueError(f"invalid hand mask {mask:#x}")
+        data, added = self._data, 0
+        for i in range(4):
+            bits = (mask >> (16 * i)) & 0xFFFF
+            added += _popcount(bits & ~data[i])
+            data[i] |= bits
+        return added
+
+    def remove_mask(self, mask: int) -> int:
+        """
+        Remove all the cards in a bitmask from the hand
+
+        :param mask: A bitmask of the cards to remove
+        :return: The number of cards which were in the hand
+        """
+        data, removed = self._data, 0
+        for i in range(4):
+            bits = (mask >> (16 * i)) & 0xFFFF
+            removed += _popcount(bits & data[i])
+            data[i] &= ~bits
+        return removed
+
+    def union(self, other: Union["Hand", int]) -> "Hand":
+        ":return: A new hand containing the cards in either hand"
+        return Hand.from_mask(self.mask | _as_mask(other))
+
+    def intersection(self, other: Union["Hand", int]) -> "Hand":
+        ":return: A new hand containing the cards in both hands"
+        return Hand.from_mask(self.mask & _as_mask(other))
+
+    def difference(self, other: Union["Hand", int]) -> "Hand":
+        ":return: A new hand containing the cards in this hand but not in `other`"
+        return Hand.from_mask(self.mask & ~_as_mask(other))
+
+    def lengths(self) -> tuple[int, int, int, int]:
+        ":return: The number of cards held in spades, hearts, diamonds and clubs"
+        data = self._data
+        return (
+            _popcount(data[0]),
+            _popcount(data[1]),
+            _popcount(data[2]),
+            _popcount(data[3]),
+        )
+
     def add(self, card: Union[Card, str]) -> bool:
         """
         Adds a card to the hand
@@ -50,13 +124,7 @@ class Hand:
         :param card: The card to be added to the hand
         :return: False if the card was already in the hand, True otherwise
         """
-        if isinstance(card, str):
-            card = Card(name=card)
-
-        if card in self:
-            return False
-        self._data[card.suit.value] |= card.rank.value
-        return True
+        return bool(self.add_mask(_card_bits(card)))
 
     def extend(self, cards: Iterable[Union[Card, str]]) -> int:
         """
@@ -65,7 +133,12 @@ class Hand:
         :param cards: An iterable of the cards to add
         :return: The number of cards successfully added
         """
-        return sum(self.add(card) for card in cards)
+        if isinstance(cards, Hand):
+            return self.add_mask(cards.mask)
+        mask = 0
+        for card in cards:
+            mask |= _card_bits(card)
+        return self.add_mask(mask)
 
     def remove(self, card: Union[Card, str]) -> bool:
         """
@@ -75,13 +148,7 @@ class Hand:
                 representation e.g. "CQ"
         :return: False if the card wasn't in the hand, True otherwise
         """
-        if isinstance(card, str):
-            card = Card(name=card)
-
-        if card in self:
-            self._data[card.suit.value] &= ~card.rank.value
-            return True
-        return False
+        return bool(self.remove_mask(_card_bits(card)))
 
     @staticmethod
     def from_pbn(pbn: str) -> "Hand":
@@ -103,8 +170,7 @@ class Hand:
 
         :param lin: A LIN string for a hand, e.g. "SQT62HDAQT852CQJT"
         """
-        pbn = lin[1:].replace("H", ".").replace("D", ".").replace("C", ".")
-        return Hand.from_pbn(pbn)
+        return Hand.from_mask(_lin_mask(lin))
 
     def to_lin(self) -> str:
         """
@@ -154,8 +220,7 @@ class Hand:
 
     def clear(self) -> None:
         "Remove all cards from the hand"
-        for denom in Denom.suits():
-            self[denom].clear()
+        ctypes.memset(self._data, 0, ctypes.sizeof(self._data))
 
     @property
     def spades(self) -> SuitHolding:
@@ -197,8 +262,7 @@ class Hand:
         ":return: True if card is in this hand"
         if isinstance(card, str):
             card = Card(name=card)
-
-        return bool(self._data[card.suit.value] & card.rank.value)
+        return bool(self._data[card.suit] & card.rank)
 
     def __str__(self) -> str:
         ":return: A PBN string representation of the hand"
@@ -211,25 +275,64 @@ class Hand:
         ":return: An iterator over the suit holdings in the order spades, hearts, diamonds and clubs"
         for suit in Denom.suits():
             for rank in self[suit]:
-                yield Card(suit=suit, rank=rank)
+                yield Card.from_bits(suit, rank)
 
     def __getitem__(self, suit: Denom) -> SuitHolding:
         ":return: The specified suit holding of the hand"
-        return SuitHolding(self._data, suit.value)
+        if self._suits is None:
+            # Create views over each suit the first time one is requested
+            self._suits = tuple(SuitHolding(self._data, i) for i in range(4))
+        return self._suits[suit]
 
     def __setitem__(self, suit: Denom, holding: Union[SuitHolding, str]) -> None:
         if isinstance(holding, str):
-            self[suit].clear()
-            for rank in holding:
-                self[suit].add(rank)
+            self._data[suit] = SuitHolding(holding).mask
         else:
             self._data[suit] = holding._data[holding._idx]
 
     def __len__(self) -> int:
         ":return: The number of cards in the hand"
-        return sum(bin(suit).count("1") for suit in self._data)
+        return sum(self.lengths())
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Hand):
             return NotImplemented
-        return not _dds._libc.memcmp(self._data, other._data, len(self._data))
+        return self.mask == other.mask
+
+    def __or__(self, other: Union["Hand", int]) -> "Hand":
+        return self.union(other)
+
+    def __and__(self, other: Union["Hand", int]) -> "Hand":
+        return self.intersection(other)
+
+    def __sub__(self, other: Union["Hand", int]) -> "Hand":
+        return self.difference(other)
+
+
+# Bitmask of all the cards in a deck
+_FULL_HAND = _FULL_SUIT * 0x0001_0001_0001_0001
+
+
+def _card_bits(card: Union[Card, str]) -> int:
+    "Convert a card or card name to a hand bitmask"
+    if isinstance(card, str):
+        card = Card(name=card)
+    return card.rank << (16 * card.suit)
+
+
+_lin_shifts = {c: 16 * i for i, s in enumerate("SHDC") for c in (s, s.lower())}
+
+
+def _lin_mask(lin: str) -> int:
+    "Convert a LIN string for a hand, e.g. 'SQT62HDAQT852CQJT', to a hand bitmask"
+    mask, shift = 0, 0
+    for c in lin:
+        if c in _lin_shifts:
+            shift = _lin_shifts[c]
+        else:
+            mask |= Rank.find(c) << shift
+    return mask
+
+
+def _as_mask(other: Union[Hand, int]) -> int:
+    return other.mask if isinstance(other, Hand) else other
@@ -32,19 +32,12 @@ class Rank(IntEnum):
     @staticmethod
     def find(value: str) -> "Rank":
         try:
-            return Rank[f"R{value.upper()}"]
+            return _rank_names[value]
         except KeyError:
             raise ValueError(f"could not convert '{value}' to Rank")
 
     def to_alternate(self) -> "AlternateRank":
-        # Calculate integer log2
-        x, y = self.value, 0
-        while True:
-            x >>= 1
-            if x == 0:
-                break
-            y += 1
-        return AlternateRank(y)
+        return _to_alternate[self]
 
 
 class AlternateRank(IntEnum):
@@ -74,10 +67,19 @@ class AlternateRank(IntEnum):
     @staticmethod
     def find(value: str) -> "AlternateRank":
         try:
-            return AlternateRank[f"R{value.upper()}"]
+            return _alternate_rank_names[value]
         except KeyError:
             raise ValueError(f"could not convert '{value}' to AlternateRank")
 
     def to_standard(self) -> Rank:
-        # Calculate integer power of 2
-        return Rank(2 << (self.value - 1))
+        return _to_standard[self]
+
+
+# Lookup tables for the conversions above. The rank conversions are used in the
+# innermost loops of the play and analysis functions, so rather than computing
+# the integer log2/power of 2 (and constructing a new enum) on each call we
+# precompute every value once
+_to_alternate = {rank: AlternateRank(rank.value.bit_length() - 1) for rank in Rank}
+_to_standard = {alt: rank for rank, alt in _to_alternate.items()}
+_rank_names = {c: rank for rank in Rank for c in (rank.abbr, rank.abbr.lower())}
+_alternate_rank_names = {c: _to_alternate[rank] for c, rank in _rank_names.items()}
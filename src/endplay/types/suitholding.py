@@ -23,20 +23,75 @@ class SuitHolding:
         if isinstance(data, str):
             self._data = (ctypes.c_uint * 4)(0, 0, 0, 0)
             self._idx = 0
-            for rank in data:
-                self.add(rank)
+            self.extend(data)
         else:
             if idx is None:
                 raise ValueError("No index given to SuitHolding")
             self._idx = idx
             self._data = data
 
+    def __reduce__(self):
+        return (SuitHolding.from_mask, (self.mask,))
+
     def __copy__(self) -> "SuitHolding":
         return SuitHolding((ctypes.c_uint * 4).from_buffer_copy(self._data), self._idx)
 
     def copy(self) -> "SuitHolding":
         return self.__copy__()
 
+    @property
+    def mask(self) -> int:
+        """
+        The holding as a bitmask, using the same encoding as :class:`Rank` (so
+        the ace is 0x4000 and the two is 0x4)
+        """
+        return self._data[self._idx]
+
+    @staticmethod
+    def from_mask(mask: int) -> "SuitHolding":
+        """
+        Construct a SuitHolding from a bitmask as returned by :attr:`mask`
+        """
+        holding = SuitHolding()
+        holding.add_mask(mask)
+        return holding
+
+    def add_mask(self, mask: int) -> int:
+        """
+        Add all the ranks in a bitmask to the suit holding
+
+        :param mask: A bitmask of the ranks to add
+        :return: The number of ranks which were not already in the holding
+        """
+        if mask & ~_FULL_SUIT:
+            raise ValueError(f"invalid suit holding mask {mask:#x}")
+        old = self._data[self._idx]
+        self._data[self._idx] = old | mask
+        return _popcount(mask & ~old)
+
+    def remove_mask(self, mask: int) -> int:
+        """
+        Remove all the ranks in a bitmask from the suit holding
+
+        :param mask: A bitmask of the ranks to remove
+        :return: The number of ranks which were in the holding
+        """
+        old = self._data[self._idx]
+        self._data[self._idx] = old & ~mask
+        return _popcount(old & mask)
+
+    def union(self, other: Union["SuitHolding", int]) -> "SuitHolding":
+        ":return: A new holding containing the ranks in either holding"
+        return SuitHolding.from_mask(self.mask | _as_mask(other))
+
+    def intersection(self, other: Union["SuitHolding", int]) -> "SuitHolding":
+        ":return: A new holding containing the ranks in both holdings"
+        return SuitHolding.from_mask(self.mask & _as_mask(other))
+
+    def difference(self, other: Union["SuitHolding", int]) -> "SuitHolding":
+        ":return: A new holding containing the ranks in this holding but not in `other`"
+        return SuitHolding.from_mask(self.mask & ~_as_mask(other))
+
     def add(self, rank: Union[Rank, AlternateRank, str]) -> bool:
         """
         Add a rank to the suit holding
@@ -44,15 +99,7 @@ class SuitHolding:
         :param rank: The rank to add
         :return: False if the rank was already in the holding, True otherwise
         """
-        if isinstance(rank, str):
-            rank = Rank.find(rank)
-        if isinstance(rank, AlternateRank):
-            rank = rank.to_standard()
-
-        if rank in self:
-            return False
-        self._data[self._idx] |= rank.value
-        return True
+        return bool(self.add_mask(_rank_bits(rank)))
 
     def extend(self, ranks: Iterable[Union[Rank, AlternateRank, str]]) -> int:
         """
@@ -61,7 +108,12 @@ class SuitHolding:
         :parm ranks: An iterable of the ranks to add
         :return: The number of ranks successfully added
         """
-        return sum(self.add(rank) for rank in ranks)
+        if isinstance(ranks, SuitHolding):
+            return self.add_mask(ranks.mask)
+        mask = 0
+        for rank in ranks:
+            mask |= _rank_bits(rank)
+        return self.add_mask(mask)
 
     def remove(self, rank: Union[Rank, AlternateRank, str]) -> bool:
         """
@@ -70,15 +122,7 @@ class SuitHolding:
         :param rank: The rank to remove
         :return: False if the rank wasn't in the holding, True otherwise
         """
-        if isinstance(rank, str):
-            rank = Rank.find(rank)
-        if isinstance(rank, AlternateRank):
-            rank = rank.to_standard()
-
-        if not rank in self:
-            return False
-        self._data[self._idx] &= ~rank.value
-        return True
+        return bool(self.remove_mask(_rank_bits(rank)))
 
     def clear(self) -> None:
         """
@@ -103,12 +147,7 @@ class SuitHolding:
         return self._data[self._idx] == other._data[other._idx]
 
     def __contains__(self, rank: Union[Rank, AlternateRank, str]) -> bool:
-        if isinstance(rank, str):
-            rank = Rank.find(rank)
-        if isinstance(rank, AlternateRank):
-            rank = rank.to_standard()
-
-        return bool(self._data[self._idx] & rank.value)
+        return bool(self._data[self._idx] & _rank_bits(rank))
 
     def __iter__(self) -> Iterator[Rank]:
         for rank in reversed(Rank):
@@ -121,12 +160,45 @@ class SuitHolding:
                 yield rank
 
     def __len__(self) -> int:
-        n = self._data[self._idx]
-        b = bin(n)
-        return b.count("1")
+        return _popcount(self._data[self._idx])
+
+    def __or__(self, other: Union["SuitHolding", int]) -> "SuitHolding":
+        return self.union(other)
+
+    def __and__(self, other: Union["SuitHolding", int]) -> "SuitHolding":
+        return self.intersection(other)
+
+    def __sub__(self, other: Union["SuitHolding", int]) -> "SuitHolding":
+        return self.difference(other)
 
     def __str__(self) -> str:
         return self.to_pbn()
 
     def __repr__(self) -> str:
         return f'SuitHolding("{self!s}")'
+
+
+# Bitmask of all the ranks in a suit
+_FULL_SUIT = 0x7FFC
+
+# Number of ranks in each possible holding, indexed by the holding shifted
+# right by two so that the two is the least significant bit
+_popcounts = bytes(bin(i).count("1") for i in range(1 << 13))
+
+
+def _popcount(mask: int) -> int:
+    "Count the ranks in a suit holding bitmask"
+    return _popcounts[(mask >> 2) & 0x1FFF]
+
+
+def _rank_bits(rank: Union[Rank, AlternateRank, str]) -> int:
+    "Convert a rank in any of its accepted representations to a bitmask"
+    if isinstance(rank, str):
+        rank = Rank.find(rank)
+    elif isinstance(rank, AlternateRank):
+        rank = rank.to_standard()
+    return rank.value
+
+
+def _as_mask(other: Union[SuitHolding, int]) -> int:
+    return other.mask if isinstance(other, SuitHolding) else other
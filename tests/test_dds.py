@@ -1,8 +1,13 @@
+import time
 import unittest
+from pathlib import Path
 
 from endplay import config
+from endplay._dds import DDSError
 from endplay.dds import *
+from endplay.dds.audit import audit_boards, audit_file
 from endplay.dds.solve import SolveMode
+from endplay.parsers import lin
 from endplay.types import *
 
 config.use_unicode = False
@@ -107,6 +112,77 @@ class TestSolve(unittest.TestCase):
             )
 
 
+class TestSession(unittest.TestCase):
+    def test_play_through(self):
+        play = ["s9", "sk", "sq", "s7", "h3", "hq", "h4", "h9"]
+        deal = Deal(pbn)
+        expected = []
+        for card in play:
+            expected.append(dict(solve_board(deal)))
+            deal.play(card)
+        table_expected = calc_dd_table(Deal(pbn)).to_list()
+
+        with AnalysisSession(Deal(pbn), prefetch=2) as session:
+            solved = []
+            for card, exp in zip(play, expected):
+                solved.append(session.solve())
+                self.assertEqual(dict(solved[-1]), exp)
+                session.play(card)
+            # Positions which have already been analysed are not solved again
+            for card in reversed(play):
+                self.assertEqual(session.unplay(), Card(card))
+                self.assertIs(session.solve(), solved.pop())
+            table = session.dd_table()
+            self.assertIs(session.dd_table(Deal(pbn)), table)
+            self.assertEqual(table.to_list(), table_expected)
+
+    def test_prefetch(self):
+        def solves():
+            return stats()["functions"].get("SolveBoard", {}).get("dds_calls", 0)
+
+        enable_stats()
+        reset_stats()
+        try:
+            with AnalysisSession(Deal(pbn), prefetch=1) as session:
+                best, _ = max(session.solve(), key=lambda sol: sol[1])
+                # The position after the best card is solved in the background
+                for _ in range(600):
+                    if solves() == 2:
+                        break
+                    time.sleep(0.1)
+                session.play(best)
+                session.solve()
+                self.assertEqual(solves(), 2)
+        finally:
+            disable_stats()
+            reset_stats()
+
+
+class TestAudit(unittest.TestCase):
+    def test_audit(self):
+        fname = Path(__file__).parent / "lin" / "example1.lin"
+        audits = list(audit_file(str(fname)))
+        self.assertEqual([a.index for a in audits], list(range(8)))
+        for audit in audits:
+            self.assertIsNone(audit.error)
+            self.assertEqual(len(audit.tricks), len(audit.board.play) + 1)
+            self.assertTrue((audit.cost >= 0).all())
+        self.assertEqual(audits[0].errors(), [(0, Player.west, Card("C9"), 1)])
+        self.assertEqual(list(audits[1].seat_totals()), [1, 1, 1, 0])
+
+        # Batches are split up, and bad boards are reported without
+        # affecting the rest of their batch
+        with open(fname) as f:
+            boards = lin.load(f)
+        boards[2].play = []
+        boards[3].play[5] = boards[3].play[0]
+        split = list(audit_boards(boards, batch_size=3))
+        self.assertEqual(split[2].error, "no play record")
+        self.assertIsNotNone(split[3].error)
+        for i in [0, 1, 4, 5, 6, 7]:
+            self.assertEqual(split[i].cost.tolist(), audits[i].cost.tolist())
+
+
 class TestDDTable(unittest.TestCase):
     def test_single(self):
         deal = Deal(pbn)
@@ -131,5 +207,44 @@ class TestDDTable(unittest.TestCase):
         self.assertEqual(t2[Denom.diamonds, Player.north], 0)
 
 
+class TestStats(unittest.TestCase):
+    def tearDown(self):
+        disable_stats()
+        reset_stats()
+
+    def test_stats(self):
+        records: list[CallRecord] = []
+        reset_stats()
+        enable_stats(records.append)
+        calc_all_tables([Deal(pbn2), Deal(pbn3)])
+        par(Deal(pbn), Vul.none, Player.north)
+        deal = Deal(pbn, first=Player.east)
+        deal.play("CT")
+        with self.assertRaises(DDSError):
+            calc_dd_table(deal)
+        disable_stats()
+        calc_dd_table(Deal(pbn))
+
+        snapshot = stats()
+        self.assertFalse(snapshot["enabled"])
+        functions = snapshot["functions"]
+        self.assertEqual(set(functions), {"calc_all_tables", "par", "calc_dd_table"})
+        self.assertEqual(functions["calc_all_tables"]["batch_size"], 2)
+        self.assertEqual(functions["par"]["calls"], 1)
+        self.assertEqual(functions["par"]["dds_calls"], 2)
+        self.assertEqual(functions["calc_dd_table"]["calls"], 1)
+        self.assertEqual(functions["calc_dd_table"]["failures"], 1)
+
+        self.assertEqual([r.name for r in records], list(functions))
+        record = records[0]
+        self.assertEqual(record.calls[0][0], "CalcAllTables")
+        self.assertGreater(record.solve_time, 0)
+        self.assertGreaterEqual(record.pack_time, 0)
+        self.assertGreaterEqual(record.unpack_time, 0)
+
+        reset_stats()
+        self.assertEqual(stats()["functions"], {})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,15 +1,22 @@
 import io
 import os
+import pstats
 import re
+import sys
 import unittest
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+from typing import Any
 from unittest.mock import patch
 
 from endplay import config
 from endplay.dealer import *
+from endplay.dealer.actions import TerminalActions
 from endplay.dealer.constraint import ConstraintInterpreter
 from endplay.evaluate import *
 from endplay.parsers.dealer import DealerParser
+from endplay.stats import Summary, stopping_rule
 from endplay.types import *
 
 config.use_unicode = False
@@ -81,6 +88,11 @@ class TestConstraints(unittest.TestCase):
         self.assertEvalsTo("losers(east, hearts)", 1)
         self.assertEvalsTrue("hascard(north, AD)")
         self.assertEvalsFalse("hascard(south, AD)")
+        self.assertEvalsTo("score(none, x3N, 9)", 400)
+        self.assertEvalsTo("score(all, x4S, 9)", -100)
+        self.assertEvalsTo("score(ew, x3S, x - 1)", 140)
+        self.assertEvalsTo("imps(score(none, x3N, 9) - score(none, x2N, 9))", 6)
+        self.assertEvalsTo("imps(-10 * x)", -3)
 
     def test_operators(self):
         self.assertEvalsTrue("x && y")
@@ -110,6 +122,28 @@ class TestConstraints(unittest.TestCase):
     def test_expressions(self):
         self.assertEvalsFalse("(1 + 7 == 9) || controls(west, hearts) == 1")
 
+    def test_cache(self):
+        p1, p2 = DealerParser(), DealerParser()
+        self.assertIs(p1.grammar, p2.grammar)
+        self.assertIs(
+            p1.parse_expr("hcp(north) > 15"), p2.parse_expr("hcp(north) > 15")
+        )
+        self.assertIs(self.interp.lambdify("x + y"), self.interp.lambdify("x + y"))
+        # Compiled constraints are evaluated in the current environment
+        f = self.interp.lambdify("x + 1")
+        self.interp.set_env("x", 20)
+        self.assertEqual(f(self.deal), 21)
+        self.interp.set_env("x", 10)
+
+    def test_cache_threads(self):
+        interp = ConstraintInterpreter()
+        interp._cache_size = 8
+        exprs = [f"{i} + 1" for i in range(20)] * 20
+        with ThreadPoolExecutor(8) as pool:
+            fns = list(pool.map(interp.lambdify, exprs))
+        self.assertLessEqual(len(interp._compiled), 8)
+        self.assertEqual([f(self.deal) for f in fns[:20]], list(range(1, 21)))
+
 
 class TestDealerMain(unittest.TestCase):
     """
@@ -169,6 +203,128 @@ class TestGenerator(unittest.TestCase):
         deal2 = generate_deal("hcp(north) == 10")
         self.assertEqual(hcp(deal2[Player.north]), 10)
 
+    def test_until(self):
+        deals = list(generate_deals(produce=100, seed=1, until=lambda d: True))
+        self.assertEqual(len(deals), 1)
+
+    def test_stopping_rule(self):
+        summary = Summary()
+        rule = stopping_rule((lambda d: hcp(d.north), summary), precision=0.5)
+        deals = list(generate_deals(produce=100000, seed=1, until=rule))
+        self.assertEqual(summary.count, len(deals))
+        self.assertLess(len(deals), 100000)
+        self.assertLessEqual(summary.halfwidth(), 0.5)
+        self.assertAlmostEqual(summary.mean, 10, delta=0.5)
+
+    def test_precision(self):
+        with patch("sys.stdout", new=io.StringIO()) as out:
+            deals = run_script(
+                None,
+                produce=100000,
+                seed=1,
+                actions=['average "hcp " hcp(north)'],
+                precision=0.5,
+            )
+        self.assertLess(len(deals), 100000)
+        self.assertIn("(95% confidence)", out.getvalue())
+
+    def test_precision_rare_event(self):
+        # Neither estimate may converge just because the event has not happened yet
+        for action in [
+            "average hcp(north) >= 20",
+            "frequency (hcp(north) >= 20, 0, 1)",
+        ]:
+            with patch("sys.stdout", new=io.StringIO()):
+                deals = run_script(
+                    None, produce=100000, seed=7, actions=[action], precision=0.01
+                )
+            self.assertGreater(len(deals), 150)
+            self.assertLess(len(deals), 100000)
+
+    def test_profile(self):
+        with TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "dealer.prof")
+            with patch("sys.stdout", new=io.StringIO()) as out:
+                run_script(
+                    None,
+                    produce=5,
+                    seed=1,
+                    swapping=2,
+                    constraints=["hcp(north) >= 15"],
+                    actions=["printoneline"],
+                    profile_output=fname,
+                )
+            pstats.Stats(fname)
+        report = out.getvalue()
+        for line in [
+            "parse",
+            "generate",
+            "shuffle",
+            "swap",
+            "condition 1: hcp(north) >= 15",
+            "action 1 (printoneline)",
+            "of which DDS calls",
+        ]:
+            self.assertIn("  " + line, report)
+        self.assertRegex(report, r"condition 1: .* rejected")
+
+    def test_profile_error(self):
+        # The global profiling hooks are removed when the script fails
+        import endplay.dds as dds
+
+        with TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "dealer.prof")
+            failures: list[dict[str, Any]] = [
+                dict(produce=10, generate=5),
+                dict(actions=["average"]),
+                dict(actions=["printall"], precision=0.1),
+            ]
+            for kwargs in failures:
+                with self.assertRaises(Exception):
+                    run_script(None, profile_output=fname, **kwargs)
+                self.assertFalse(dds.stats()["enabled"])
+                self.assertIsNone(sys.getprofile())
+
+    def test_streaming(self):
+        with patch("sys.stdout", new=io.StringIO()) as out:
+            deals = run_script(
+                None,
+                produce=3,
+                seed=1,
+                actions=["printpbn", 'average "hcp " hcp(north)'],
+                collect=False,
+            )
+        self.assertEqual(deals, [])
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[-1].startswith("hcp "))
+
+        # Each deal is written before the next one is produced
+        written = []
+        with patch("sys.stdout", new=io.StringIO()) as out:
+            with TerminalActions(False, None, None, ConstraintInterpreter()).open(
+                None
+            ) as writer:
+                parser = DealerParser()
+                actions = parser.parse_string("action printpbn").first_child.children
+
+                def deals_():
+                    for deal in generate_deals(produce=3, seed=1):
+                        written.append(out.getvalue().count("\n"))
+                        yield deal
+
+                self.assertEqual(writer.run(actions, deals_()), 3)
+        self.assertEqual(written, [0, 1, 2])
+
+        # Single actions are run over a list of deals through the same code
+        deals = list(generate_deals(produce=3, seed=1))
+        with patch("sys.stdout", new=io.StringIO()) as out:
+            with TerminalActions(False, None, None, ConstraintInterpreter()).open(
+                None, deals
+            ) as writer:
+                writer.run_action(actions[0])
+        self.assertEqual(out.getvalue().splitlines(), [str(deal) for deal in deals])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,47 @@
+import importlib
+import subprocess
+import sys
+import unittest
+
+import endplay
+import endplay.dealer
+import endplay.dealer.actions
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_no_heavy_dependencies(self):
+        # Run in a fresh interpreter as the test suite has already imported everything
+        heavy = ["numpy", "pyparsing", "matplotlib", "tqdm", "endplay._dds"]
+        code = (
+            "import sys, endplay\n"
+            f"print(','.join(m for m in {heavy!r} if m in sys.modules))\n"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(proc.stdout.strip(), "")
+
+    def test_lazy_names(self):
+        for module, names in endplay._lazy_names.items():
+            for name in names:
+                self.assertIs(
+                    getattr(endplay, name),
+                    getattr(importlib.import_module(module), name),
+                )
+            self.assertTrue(set(names) <= set(dir(endplay)))
+        for module in endplay._submodules:
+            self.assertIs(
+                getattr(endplay, module), importlib.import_module(f"endplay.{module}")
+            )
+        for package in [endplay.dealer, endplay.dealer.actions]:
+            for name, module in package._lazy_attrs.items():
+                self.assertIs(
+                    getattr(package, name),
+                    getattr(importlib.import_module(module), name),
+                )
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            endplay.not_an_attribute
+        with self.assertRaises(AttributeError):
+            endplay.dealer.not_an_attribute
@@ -1,6 +1,11 @@
+import json
+import threading
+import time
 import unittest
+from urllib.request import urlopen
 
 from endplay.interact.commandobject import CommandObject
+from endplay.interact.frontends.html import AnalysisCache, EndplayHTTPServer
 from endplay.types import Card, Denom, Player
 from endplay.types.deal import Deal
 
@@ -40,5 +45,51 @@ class TestInteractiveDeal(unittest.TestCase):
         self.assertSequenceEqual(c.deal.curtrick, [Card("S3"), Card("S2"), Card("S5")])
 
 
+class TestHTMLFrontend(unittest.TestCase):
+    pbn = "N:AKQ.AKQ.AKQ.AKQJ T98.T98.T98.T987 765.765.765.6543 J432.J432.J432.2"
+
+    def test_cache(self):
+        cache = AnalysisCache(maxsize=3)
+        c = CommandObject(Deal(self.pbn))
+        solutions = cache.solutions(c.deal)
+        table = cache.ddtable(c.deal)
+        c.cmd_play("SA")
+        self.assertIsNot(cache.solutions(c.deal), solutions)
+        # Returning to a state reuses the analysis already calculated
+        c.cmd_undo()
+        self.assertIs(cache.solutions(c.deal), solutions)
+        self.assertEqual(solutions.result(timeout=60)[0]["tricks"], 13)
+        self.assertEqual(table.result(timeout=60)["north"]["nt"], 13)
+        # The least recently used result is discarded
+        c.cmd_redo()
+        cache.ddtable(c.deal)
+        c.cmd_undo()
+        self.assertIsNot(cache.ddtable(c.deal), table)
+        cache.shutdown()
+
+    def test_server(self):
+        c = CommandObject(Deal(self.pbn, first=Player.west))
+        server = EndplayHTTPServer(("localhost", 0), c)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        addr = f"http://localhost:{server.server_address[1]}"
+        try:
+            with urlopen(addr + "/command", data=b"play SJ") as response:
+                data = json.load(response)
+            self.assertEqual(data["deal"]["onlead"], "north")
+            for _ in range(600):
+                if not data["pending"]:
+                    break
+                time.sleep(0.1)
+                with urlopen(addr + "/analysis", data=b"") as response:
+                    data = json.load(response)
+            self.assertNotIn("output", data)
+            self.assertEqual({s["tricks"] for s in data["solutions"]}, {13})
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,19 @@
 import unittest
+from io import StringIO
 from pathlib import Path
-from tempfile import TemporaryFile
+from tempfile import TemporaryDirectory, TemporaryFile
+from typing import cast
+
+import numpy as np
 
 from endplay import config
-from endplay.parsers import dealer, json, lin, pbn
+from endplay.parsers import columnar, dealer, json, lin, pbn
 from endplay.types.bid import Bid
+from endplay.types.board import Board
 from endplay.types.card import Card
 from endplay.types.contract import Contract
+from endplay.types.deal import Deal
+from endplay.types.denom import Denom
 from endplay.types.player import Player
 from endplay.types.vul import Vul
 
@@ -49,6 +56,94 @@ class TestPBN(unittest.TestCase):
         with open(file) as f:
             boards = pbn.load(f)
 
+    def test_iterload(self):
+        def summary(b):
+            return (b.board_num, str(b.deal), str(b.contract), b.info)
+
+        for name in ["example1.pbn", "example2.pbn", "example4.pbn"]:
+            with open(basedir / "pbn" / name) as f:
+                boards = pbn.load(f)
+            with open(basedir / "pbn" / name) as f:
+                it = pbn.iterload(f)
+                first = next(it)
+                self.assertEqual(
+                    [summary(b) for b in [first, *it]], [summary(b) for b in boards]
+                )
+
+    def test_load_parallel(self):
+        def summary(b):
+            return (b.board_num, str(b.deal), str(b.contract), b.info)
+
+        for name in ["example1.pbn", "example2.pbn", "example4.pbn"]:
+            with open(basedir / "pbn" / name) as f:
+                boards = pbn.load(f)
+            with open(basedir / "pbn" / name) as f:
+                pboards = pbn.load_parallel(f, processes=2, chunksize=7)
+            self.assertEqual(
+                [summary(b) for b in pboards], [summary(b) for b in boards]
+            )
+
+    def test_load_parallel_inherit(self):
+        from io import StringIO
+
+        deal = "N:974.AJ3.63.AK963 K83.K9752.7.8752 AQJ5.T864.KJ94.4 T62.Q.AQT852.QJT"
+        s = "% PBN 2.1\n\n"
+        s += f'[Event "Club night"]\n[Board "1"]\n[Deal "{deal}"]\n\n'
+        s += f'[Event "#"]\n{{ a comment\n\nspanning lines }}\n[Board "2"]\n[Deal "#"]\n\n'
+        s += f'[Event "Other"]\n[Board "3"]\n[Deal "{deal}"]\n'
+        boards = pbn.load_parallel(StringIO(s), processes=2, chunksize=1)
+        self.assertEqual([b.board_num for b in boards], [1, 2, 3])
+        self.assertEqual(boards[1].info.event, "Club night")
+        self.assertEqual(str(boards[1].deal), deal)
+        self.assertEqual(boards[2].info.event, "Other")
+
+    def test_split_boards(self):
+        lines = [
+            '[Board "1"]',
+            '[Auction "N"]',
+            "1S Pass { a comment [Board opened",
+            "",
+            "partway through a line } 2S Pass",
+            "Pass Pass ; {",
+            "",
+            '[Board "2"] { closed } { opened',
+            "",
+            "}",
+            "",
+            '[Board "3"]',
+        ]
+        chunks = list(pbn._split_boards(lines, 1))
+        self.assertEqual([start for _, _, start in chunks], [1, 8, 12])
+        self.assertEqual(chunks[1][0], lines[:6])
+
+    def test_tags(self):
+        def summary(b):
+            return (b.board_num, str(b.deal), str(b.contract), b.vul)
+
+        file = basedir / "pbn" / "example2.pbn"
+        with open(file) as f:
+            boards = pbn.load(f)
+        with open(file) as f:
+            fast = pbn.load(f, decode_only=["Deal", "Vulnerable", "Contract", "Result"])
+        self.assertEqual([summary(b) for b in fast], [summary(b) for b in boards])
+        self.assertEqual(fast[0].info.event, boards[0].info.event)
+        self.assertEqual(fast[0].auction, [])
+        self.assertEqual(fast[0].info.auction.value, "S")
+        self.assertEqual(
+            [b for row in fast[0].info.auction.data for b in row][:2], ["Pass", "Pass"]
+        )
+
+    def test_tags_comments(self):
+        deal = "N:974.AJ3.63.AK963 K83.K9752.7.8752 AQJ5.T864.KJ94.4 T62.Q.AQT852.QJT"
+        s = "% PBN 2.1\n\n"
+        s += f'[Board "1"] {{ a comment\n\n[Board "3"] }}\n[Deal "{deal}"]\n'
+        s += '{ opened\n[Contract "7NT"]\n}\n[Contract "3NT"]\n'
+        for decode_only in [None, ["Deal", "Contract"]]:
+            (board,) = pbn.loads(s, decode_only=decode_only)
+            self.assertEqual(board.board_num, 1)
+            self.assertEqual(str(board.deal), deal)
+            self.assertEqual(board.contract, Contract("3NTN"))
+
     def test_04(self):
         file = basedir / "pbn" / "example4.pbn"
         with open(file) as f:
@@ -155,6 +250,25 @@ class TestLIN(unittest.TestCase):
         self.assertLoadsDumpsEqual(file)
         self.assertLoadDumpEqual(file)
 
+    def test_iterload(self):
+        file = basedir / "lin" / "example1.lin"
+        with open(file) as f:
+            boards = lin.load(f)
+        with open(file) as f:
+            lazy = lin.iterload(f)
+            self.assertEqual(lin.dumps([next(lazy)]), lin.dumps(boards[:1]))
+            self.assertEqual(lin.dumps(list(lazy)), lin.dumps(boards[1:]))
+
+    def test_skip(self):
+        file = basedir / "lin" / "example1.lin"
+        summary = lambda b: (str(b.deal), str(b.contract), b.contract.result)
+        with open(file) as f:
+            boards = lin.load(f)
+        with open(file) as f:
+            fast = lin.load(f, auction=False, play=False)
+        self.assertEqual([summary(b) for b in fast], [summary(b) for b in boards])
+        self.assertTrue(all(b.auction == [] and b.play == [] for b in fast))
+
 
 class TestJSON(unittest.TestCase):
     def assertPBNLoadsDumps(self, file: Path):
@@ -179,6 +293,86 @@ class TestJSON(unittest.TestCase):
         file = basedir / "pbn" / "example2.pbn"
         self.assertPBNLoadsDumps(file)
 
+    def test_jsonl(self):
+        with open(basedir / "pbn" / "example2.pbn") as f:
+            boards = pbn.load(f)
+        with TemporaryFile("w+") as f:
+            json.iterdump(boards, f)
+            f.seek(0)
+            self.assertEqual(len(f.readlines()), len(boards))
+            f.seek(0)
+            items = list(json.iterload(f))
+        self.assertEqual([type(item) for item in items], [Board] * len(boards))
+        boards2 = cast(list[Board], items)
+        self.assertEqual(pbn.dumps(boards2), pbn.dumps(boards))
+
+    def test_jsonl_deal(self):
+        deal = Deal("N:974.AJ3.63.AK963 K83.K9752.7.8752 AQJ5.T864.KJ94.4 -")
+        deal.complete_deal()
+        deal.trump = Denom.hearts
+        deal.first = Player.east
+        deal.play("H2")
+        f = StringIO()
+        json.iterdump([deal], f)
+        f.seek(0)
+        (item,) = json.iterload(f)
+        self.assertIsInstance(item, Deal)
+        deal2 = cast(Deal, item)
+        self.assertEqual(deal2, deal)
+        self.assertEqual(deal2.first, deal.first)
+        self.assertEqual(deal2.trump, deal.trump)
+        self.assertEqual(deal2.curtrick, deal.curtrick)
+
+
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        with open(basedir / "pbn" / "example2.pbn") as f:
+            self.boards = pbn.load(f)
+
+    def assertBoardsEqual(self, boards):
+        def summary(b):
+            return (b.board_num, str(b.deal), str(b.contract), b.vul)
+
+        self.assertEqual(
+            [summary(b) for b in boards], [summary(b) for b in self.boards]
+        )
+
+    def test_npz(self):
+        with TemporaryDirectory() as tmpdir:
+            columnar.dump(self.boards, Path(tmpdir) / "boards.npz", compressed=True)
+            data = columnar.load(Path(tmpdir) / "boards.npz")
+        self.assertEqual(data["deal"].shape, (len(self.boards), 4))
+        self.assertBoardsEqual(columnar.iterboards(data))
+
+    def test_directory(self):
+        with TemporaryDirectory() as tmpdir:
+            columnar.dump(self.boards, tmpdir, par=range(len(self.boards)))
+            data = columnar.load(tmpdir, ["deal", "level", "par"])
+            self.assertEqual(set(data), {"deal", "level", "par"})
+            self.assertIsInstance(data["deal"], np.memmap)
+            self.assertEqual(list(data["par"]), list(range(len(self.boards))))
+            del data
+            data = columnar.load(tmpdir, mmap=False)
+        self.assertBoardsEqual(columnar.iterboards(data))
+
+    def test_missing_contract(self):
+        boards = [
+            Board(self.boards[0].deal, contract=Contract(c)) for c in ["Pass", "3NS-1"]
+        ]
+        boards.append(Board(self.boards[0].deal))
+        with TemporaryDirectory() as tmpdir:
+            columnar.dump(boards, Path(tmpdir) / "boards.npz")
+            data = columnar.load(Path(tmpdir) / "boards.npz")
+        self.assertEqual(list(data["level"]), [0, 3, -1])
+        self.assertEqual(list(data["result"]), [0, -1, -128])
+        contracts = [board.contract for board in columnar.iterboards(data)]
+        self.assertEqual(contracts, [Contract("Pass"), Contract("3NS-1"), None])
+
+    def test_length_mismatch(self):
+        with TemporaryDirectory() as tmpdir:
+            with self.assertRaises(ValueError):
+                columnar.dump(self.boards, Path(tmpdir) / "boards.npz", par=[0])
+
 
 if __name__ == "__main__":
     unittest.main()
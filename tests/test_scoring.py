@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+
+from endplay.scoring import *
+from endplay.types import *
+
+
+class TestScoreArray(unittest.TestCase):
+    def test_matches_contract(self):
+        contracts = ["4HN+1", "3DS+1", "2SNx+1", "3DWx-1", "7NTExx=", "1CWxx-13"]
+        for vul in Vul:
+            cs = [Contract(c) for c in contracts]
+            scores = score_array(
+                [c.level for c in cs],
+                [c.denom for c in cs],
+                [c.penalty for c in cs],
+                [c.declarer.is_vul(vul) for c in cs],
+                [c.result for c in cs],
+            )
+            self.assertEqual(scores.tolist(), [c.score(vul) for c in cs])
+
+    def test_broadcast(self):
+        scores = score_array(3, Denom.nt, Penalty.passed, False, np.arange(-9, 5))
+        self.assertEqual(scores.shape, (14,))
+        self.assertEqual(scores[9], 400)
+        self.assertEqual(scores[0], -450)
+        self.assertEqual(score_array(0, Denom.nt, Penalty.passed, True, 0), 0)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, score_array, 8, 0, 1, False, 0)
+        self.assertRaises(ValueError, score_array, 1, 0, 3, False, 0)
+        self.assertRaises(ValueError, score_array, 1, 0, 1, False, 7)
+        self.assertRaises(
+            ValueError, contract_score, 1, Denom.nt, Penalty.passed, False, -14
+        )
+
+
+class TestImps(unittest.TestCase):
+    def test_imps(self):
+        self.assertEqual(imps(0), 0)
+        self.assertEqual(imps(10), 0)
+        self.assertEqual(imps(20), 1)
+        self.assertEqual(imps(-420), -9)
+        self.assertEqual(imps(430), 10)
+        self.assertEqual(imps(5000), 24)
+        diffs = np.arange(-5000, 5010, 10)
+        self.assertEqual(imp_array(diffs).tolist(), [imps(int(d)) for d in diffs])
+
+    def test_cross_imps(self):
+        scores: list[list[float]] = [[420, 420, -50, np.nan], [100, 100, 100, 100]]
+        res = cross_imps(scores, average=False)
+        self.assertEqual(res[0, :3].tolist(), [10, 10, -20])
+        self.assertTrue(np.isnan(res[0, 3]))
+        self.assertEqual(res[1].tolist(), [0, 0, 0, 0])
+        self.assertEqual(cross_imps([420, 420, -50]).tolist(), [5, 5, -10])
+
+    def test_butler(self):
+        scores: list[list[float]] = [
+            [620, 170, 650, 140, -100],
+            [110, 140, np.nan, np.nan, np.nan],
+        ]
+        self.assertEqual(butler_datum(scores).tolist(), [310, 120])
+        res = butler(scores)
+        self.assertEqual(res[0].tolist(), [7, -4, 8, -5, -9])
+        self.assertEqual(res[1, :2].tolist(), [0, 1])
+
+
+class TestMatchpoints(unittest.TestCase):
+    def test_matchpoints(self):
+        mps = matchpoints([420, 450, 420, -50])
+        self.assertEqual(mps.tolist(), [3, 6, 3, 0])
+        mps = matchpoints([[420, 450, 420, -50], [100, 200, 300, 400]])
+        self.assertEqual(mps.tolist(), [[3, 6, 3, 0], [0, 2, 4, 6]])
+        pct = matchpoints([420, 450, 420, -50], percentage=True)
+        self.assertEqual(pct.tolist(), [50, 100, 50, 0])
+
+    def test_neuberg(self):
+        scores: list[list[float]] = [[420, 450, np.nan, -50], [100, 200, 300, 400]]
+        mps = matchpoints(scores)
+        self.assertTrue(np.isnan(mps[0, 2]))
+        np.testing.assert_allclose(mps[0, [0, 1, 3]], [3, 17 / 3, 1 / 3])
+        mps = matchpoints(scores, neuberg=False)
+        self.assertEqual(mps[0, [0, 1, 3]].tolist(), [2, 4, 0])
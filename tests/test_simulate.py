@@ -0,0 +1,59 @@
+import io
+import unittest
+
+from endplay.simulate import simulate_lead
+from endplay.types import Contract, Hand, Player
+
+
+class TestSimulateLead(unittest.TestCase):
+    hand = Hand("KQJT.832.954.A72")
+
+    def test_simulate_lead(self):
+        sim = simulate_lead(self.hand, "3NTS", "hcp(north) >= 10", produce=20, top=0)
+        self.assertEqual(sim.leader, Player.west)
+        self.assertEqual(sim.deals, 20)
+        self.assertFalse(sim.settled)
+        self.assertEqual({lead.card for lead in sim.leads}, set(self.hand))
+        tricks = [lead.tricks for lead in sim.leads]
+        self.assertEqual(tricks, sorted(tricks, reverse=True))
+        for lead in sim.leads:
+            self.assertEqual(lead.count, 20)
+            self.assertTrue(0 <= lead.tricks <= 13)
+            self.assertTrue(0 <= lead.set <= 1)
+        stream = io.StringIO()
+        sim.pprint(stream=stream)
+        self.assertEqual(len(stream.getvalue().splitlines()), 15)
+
+    def test_by_set(self):
+        sim = simulate_lead(
+            self.hand, Contract("4HN"), produce=20, by="set", top=0, seed=5
+        )
+        self.assertEqual(sim.leader, Player.east)
+        sets = [lead.set for lead in sim.leads]
+        self.assertEqual(sets, sorted(sets, reverse=True))
+        # Early stopping compares the leads by whether they set the contract
+        sim = simulate_lead(
+            self.hand,
+            "4HN",
+            produce=40,
+            by="set",
+            min_deals=10,
+            batch_size=10,
+            seed=5,
+        )
+        self.assertLessEqual(sim.deals, 40)
+        self.assertEqual(sim.leads[0].count, sim.deals)
+        with self.assertRaises(ValueError):
+            simulate_lead(self.hand, "3NTS", by="score")
+
+    def test_early_stopping(self):
+        # Every card in a solid 13 card suit is equivalent, so the ranking is settled
+        sim = simulate_lead(
+            "AKQJT98765432...",
+            "7NTS",
+            produce=200,
+            min_deals=10,
+            batch_size=10,
+        )
+        self.assertTrue(sim.settled)
+        self.assertEqual(sim.deals, 10)
@@ -0,0 +1,128 @@
+import math
+import statistics
+import unittest
+
+import numpy as np
+
+from endplay.evaluate import hcp
+from endplay.stats import *
+from endplay.types import Deal
+
+deals = [
+    Deal("N:974.AJ3.63.AK963 K83.K9752.7.8752 AQJ5.T864.KJ94.4 T62.Q.AQT852.QJT"),
+    Deal("N:AKQJ.AKQ.AKQ.AKQ T987.JT9.JT9.JT9 6543.876.876.876 2.5432.5432.5432"),
+    Deal("N:T62.Q.AQT852.QJT 974.AJ3.63.AK963 K83.K9752.7.8752 AQJ5.T864.KJ94.4"),
+]
+
+
+class TestSummary(unittest.TestCase):
+    def test_summary(self):
+        values = [3.0, 1.5, 4.0, 1.0, 5.5, 9.0, 2.5]
+        s = Summary().update(values)
+        self.assertEqual(s.count, 7)
+        self.assertAlmostEqual(s.mean, statistics.fmean(values))
+        self.assertAlmostEqual(s.variance, statistics.variance(values))
+        self.assertEqual((s.min, s.max), (1.0, 9.0))
+        self.assertAlmostEqual(s.stderr, statistics.stdev(values) / math.sqrt(7))
+        lo, hi = s.confidence_interval(0.95)
+        self.assertAlmostEqual((lo + hi) / 2, s.mean)
+        self.assertAlmostEqual(hi - s.mean, 1.959964 * s.stderr, places=5)
+
+    def test_merge(self):
+        values = np.arange(100) ** 1.5
+        merged = Summary().update(values[:30]).merge(Summary().update(values[30:]))
+        single = Summary().update(list(values))
+        self.assertEqual(merged.count, single.count)
+        self.assertAlmostEqual(merged.mean, single.mean)
+        self.assertAlmostEqual(merged.variance, single.variance)
+        self.assertEqual((merged.min, merged.max), (single.min, single.max))
+        self.assertEqual(Summary().merge(Summary()).count, 0)
+        with self.assertRaises(TypeError):
+            merged.merge(Histogram(0, 1))
+        constant = Summary().update([0.0] * 100)
+        self.assertEqual(constant.halfwidth(), 0)
+        self.assertAlmostEqual(constant.halfwidth(resolution=1), 1.959964 / 100)
+        # The base class only defines the interface
+        self.assertRaises(TypeError, Accumulator)
+
+
+class TestHistogram(unittest.TestCase):
+    def test_histogram(self):
+        values = [0, 1, 1, 2.4, 2.6, 3, -1, 7]
+        h = Histogram(0, 3).update(values)
+        self.assertEqual(h.counts, [1, 2, 1, 2])
+        self.assertEqual((h.underflow, h.overflow, h.count), (1, 1, 8))
+        self.assertEqual(Histogram(0, 3).update(np.array(values)).counts, h.counts)
+        self.assertEqual(h.proportions[1], 0.25)
+        self.assertAlmostEqual(h.stderr[1], math.sqrt(0.25 * 0.75 / 8))
+        # Wilson intervals stay within [0, 1] and never collapse for empty bins
+        lo, hi = Histogram(0, 1).update([0] * 100).confidence_interval()[1]
+        self.assertEqual(lo, 0)
+        self.assertAlmostEqual(hi, 0.037, places=3)
+        h.merge(Histogram(0, 3).update([3]))
+        self.assertEqual(h.counts, [1, 2, 1, 3])
+        with self.assertRaises(ValueError):
+            h.merge(Histogram(0, 4))
+
+    def test_frequency(self):
+        self.assertEqual(frequency(deals, lambda d: hcp(d.north), 9, 11), [0, 0, 1])
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def test_quantile(self):
+        values = list(range(1, 101))
+        q = (
+            QuantileSketch()
+            .update(values[:50])
+            .merge(QuantileSketch().update(np.array(values[50:])))
+        )
+        self.assertEqual(q.count, 100)
+        self.assertEqual(q.median, 50)
+        self.assertEqual(q.quantile(0), 1)
+        self.assertEqual(q.quantile(1), 100)
+        self.assertEqual(q.quantile(0.9), 90)
+        lo, hi = q.confidence_interval(0.5)
+        self.assertTrue(lo < 50 < hi)
+
+    def test_resolution(self):
+        q = QuantileSketch(0.5).update([0.1, 0.6, 1.2, 1.4])
+        self.assertEqual(q.quantile(0.5), 0.5)
+
+
+class TestAccumulate(unittest.TestCase):
+    def test_accumulate(self):
+        summary, hist = Summary(), Histogram(0, 40)
+        s, h = accumulate(
+            deals,
+            (lambda d: hcp(d.north), summary),
+            (lambda d: hcp(d.south), hist),
+        )
+        self.assertIs(s, summary)
+        self.assertIs(h, hist)
+        self.assertEqual(summary.count, 3)
+        self.assertAlmostEqual(summary.mean, average(deals, lambda d: hcp(d.north)))
+        self.assertEqual(hist.count, 3)
+
+
+class TestHistogram2D(unittest.TestCase):
+    def test_histogram2d(self):
+        pairs = [(0, 0), (0, 1), (1, 1), (1, 1), (2, 0), (5, 0), (0, -3)]
+        h = Histogram2D(0, 2, 0, 1).update(pairs)
+        self.assertEqual(h.counts, [[1, 1], [0, 2], [1, 0]])
+        self.assertEqual((h.outside, h.count), (2, 7))
+        self.assertEqual(
+            Histogram2D(0, 2, 0, 1).update(np.array(pairs)).counts, h.counts
+        )
+        h.merge(Histogram2D(0, 2, 0, 1).update([(2, 1)]))
+        self.assertEqual(h.counts, [[1, 1], [0, 2], [1, 1]])
+
+    def test_cofrequency(self):
+        north = lambda d: hcp(d.north)
+        south = lambda d: hcp(d.south)
+        hist = cofrequency(iter(deals), north, south, 10, 12, 0, 12)
+        # The second deal is ignored as north has 37 points
+        expected = [[0] * 13 for _ in range(3)]
+        expected[2][11] = 1
+        expected[1][6] = 1
+
+        self.assertEqual(hist, expected)
@@ -39,6 +39,31 @@ class TestDeal(unittest.TestCase):
         deal.play("S4")
         expected = [Card("S3"), Card("S8"), Card("SK")]
         self.assertEqual(expected, deal.legal_moves())
+        self.assertEqual(set(expected), set(deal.legal_moves(optimal=True)))
+        deal = Deal("N:AKQ5.T.. 32.J.. T.A9.. J.Q8..")
+        deal.play("HT")
+        self.assertEqual(deal.legal_moves(), [Card("HJ")])
+        deal.play("HJ")
+        self.assertEqual(deal.legal_moves(), [Card("H9"), Card("HA")])
+        deal = Deal("N:AKQ5.T.. 32.J.. T.A9.. J.Q8..")
+        self.assertEqual(
+            deal.legal_moves(), [Card(c) for c in ("S5", "SQ", "SK", "SA", "HT")]
+        )
+        self.assertEqual(
+            deal.legal_moves(collapse_equals=True), [Card("S5"), Card("SA"), Card("HT")]
+        )
+        deal.play("S5")
+        self.assertEqual(deal.legal_moves(collapse_equals=True), [Card("S3")])
+        # The queen on the table separates the king and jack
+        deal = Deal("N:KJ.2.. 32.3.. 54.4.. Q6.5..", first=Player.west)
+        deal.play("SQ")
+        self.assertEqual(
+            deal.legal_moves(collapse_equals=True), [Card("SJ"), Card("SK")]
+        )
+        self.assertEqual(
+            set(deal.legal_moves(collapse_equals=True, optimal=True)),
+            {Card("SJ"), Card("SK")},
+        )
 
     def test_eq(self):
         a = Deal(pbn)
@@ -167,6 +192,53 @@ class TestDeal(unittest.TestCase):
         self.assertTrue("DA" in deal)
         self.assertFalse("SK" in deal)
 
+    def test_masks(self):
+        deal = Deal(pbn)
+        self.assertEqual(deal.mask, Hand("AKQJT98765432." * 3 + "AKQJT98765432").mask)
+        self.assertEqual(deal.remove_mask(Player.north, Hand("974.A..").mask), 4)
+        self.assertEqual(deal.add_mask(Player.north, Hand("9.A.A.").mask), 3)
+        self.assertEqual(deal.north, Hand("9.AJ3.A63.AK963"))
+        self.assertEqual(deal.to_hand(), Hand.from_mask(deal.mask))
+
+    def test_views(self):
+        deal = Deal(pbn)
+        north = deal.north
+        self.assertIs(deal[Player.north], north)
+        self.assertIs(north.spades, north[Denom.spades])
+        deal.play("S9")
+        self.assertEqual(north, Hand("74.AJ3.63.AK963"))
+        deal.rotate(1)
+        self.assertIs(deal.north, north)
+        self.assertEqual(north, Hand("T62.Q.AQT852.QJT"))
+        deal.clear()
+        self.assertIsNot(deal.north, north)
+        self.assertEqual(len(deal.north), 0)
+
+    def test_pickle(self):
+        import copy
+        import pickle
+
+        deal = Deal(pbn)
+        deal.play("S9")
+        for other in [pickle.loads(pickle.dumps(deal)), copy.deepcopy(deal)]:
+            self.assertEqual(deal, other)
+            self.assertEqual(other.curtrick, [Card("S9")])
+            # The hands of the copy must still be views over its own struct
+            other.play("SK")
+            other.rotate(2)
+            self.assertEqual(other.west, Hand("83.K9752.7.8752"))
+            self.assertEqual(deal.east, Hand("K83.K9752.7.8752"))
+        north = deal.north
+        self.assertEqual(pickle.loads(pickle.dumps(north)), north)
+        self.assertEqual(copy.deepcopy(north.hearts), north.hearts)
+
+    def test_complete_deal(self):
+        deal = Deal("N:974.AJ3.63.AK963 K83.K9752.7.8752 AQJ5.T864.KJ94.4 -")
+        deal.complete_deal()
+        self.assertEqual(deal, Deal(pbn))
+        deal = Deal("N:974.AJ3.63.AK963 K83.K9752.7.8752 - -")
+        self.assertRaises(ValueError, deal.complete_deal)
+
 
 class TestHand(unittest.TestCase):
     def test_cards(self):
@@ -193,6 +265,22 @@ class TestHand(unittest.TestCase):
         self.assertNotEqual(a, b)
         a.add("S9")
         self.assertEqual(a, b)
+        a.remove("C3")
+        self.assertNotEqual(a, b)
+
+    def test_masks(self):
+        a = Hand("974.AJ3.63.AK963")
+        b = Hand("AK.J.6.AQ")
+        self.assertEqual(Hand.from_mask(a.mask), a)
+        self.assertEqual(a.lengths(), (3, 3, 2, 5))
+        self.assertEqual(a.union(b), Hand("AK974.AJ3.63.AKQ963"))
+        self.assertEqual(a & b, Hand(".J.6.A"))
+        self.assertEqual(a - b.mask, Hand("974.A3.3.K963"))
+        self.assertEqual(a.add_mask(b.mask), 3)
+
+        self.assertEqual(a.remove_mask(b.mask), 6)
+        self.assertEqual(len(a), 10)
+        self.assertRaises(ValueError, a.add_mask, 1)
 
     def test_suits(self):
         hand = Hand(pbn_hands[0])
@@ -254,6 +342,52 @@ class TestSuitHolding(unittest.TestCase):
         b.add(Rank.RQ)
         self.assertEqual(a, b)
 
+    def test_masks(self):
+        a = SuitHolding("QT974")
+        self.assertEqual(a.mask, Rank.RQ | Rank.RT | Rank.R9 | Rank.R7 | Rank.R4)
+        self.assertEqual(SuitHolding.from_mask(a.mask), a)
+        self.assertEqual(a | SuitHolding("AQ"), SuitHolding("AQT974"))
+        self.assertEqual(a & SuitHolding("AQ"), SuitHolding("Q"))
+        self.assertEqual(a.difference(Rank.RQ | Rank.R4), SuitHolding("T97"))
+        self.assertEqual(a.add_mask(Rank.RA | Rank.RQ), 1)
+        self.assertEqual(a.remove_mask(Rank.RA | Rank.RK), 1)
+        self.assertRaises(ValueError, a.add_mask, 0x8000)
+
+
+class TestCard(unittest.TestCase):
+    def test_construct(self):
+        self.assertEqual(Card("S9").suit, Denom.spades)
+        self.assertEqual(Card("ht").rank, Rank.RT)
+        self.assertIs(Card("DQ"), Card(suit=Denom.diamonds, rank=Rank.RQ))
+        self.assertIs(Card("♣4"), Card("C4"))
+        self.assertRaises(ValueError, Card)
+        self.assertRaises(ValueError, Card, "")
+        self.assertRaises(ValueError, Card, "X9")
+        self.assertRaises(ValueError, Card, "S1")
+        self.assertRaises(ValueError, lambda: Card(suit=0, rank=Rank.R2))  # type: ignore
+
+    def test_index(self):
+        self.assertEqual(Card.from_index(0), Card("S2"))
+        self.assertEqual(Card.from_index(51), Card("CA"))
+        for i in range(52):
+            self.assertEqual(Card.from_index(i).index, i)
+        self.assertRaises(ValueError, Card.from_index, 52)
+        self.assertEqual(Card.from_bits(Denom.hearts, Rank.RK), Card("HK"))
+        self.assertEqual(Card.from_bits(3, 0x4), Card("C2"))
+        self.assertRaises(ValueError, Card.from_bits, Denom.hearts, 0x6)
+
+    def test_copy(self):
+        import copy
+        import pickle
+
+        card = Card("SA")
+        self.assertIs(copy.copy(card), card)
+        self.assertIs(copy.deepcopy(card), card)
+        self.assertIs(pickle.loads(pickle.dumps(card)), card)
+        pad = Card(suit=Denom.nt, rank=Rank.R2)
+        self.assertIs(pickle.loads(pickle.dumps(pad)), pad)
+        self.assertEqual(str(pad), "NT2")
+
 
 class TestContract(unittest.TestCase):
     def test_properties(self):